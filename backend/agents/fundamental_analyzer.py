@@ -8,6 +8,41 @@ from backend.utils.ai_helper import generate_content_with_fallback
 
 logger = logging.getLogger(__name__)
 
+# Where both exist, table figures replace LLM values only within this factor of them (same order of magnitude)
+FIGURE_AGREEMENT_FACTOR = 10.0
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def figures_agree(figure, llm_value) -> bool:
+    """True if a non-zero table figure and the LLM's value have the same sign and order of magnitude."""
+    figure, llm_value = _as_float(figure), _as_float(llm_value)
+    if not figure or not llm_value or (figure > 0) != (llm_value > 0):
+        return False
+    ratio = abs(figure / llm_value)
+    return 1 / FIGURE_AGREEMENT_FACTOR < ratio < FIGURE_AGREEMENT_FACTOR
+
+def merge_table_figures(llm_data: dict, figures: dict, company_name: str) -> dict:
+    """
+    Statement figures (crores) read directly from the report's tables fill in what the LLM
+    did not find (0.0 / missing, also the default when the RAG context is empty), and replace
+    its values where the two roughly agree. A disagreement usually means the table parse
+    picked the wrong cell or table, so there the LLM value is kept and the conflict logged.
+    """
+    for key, figure in (figures or {}).items():
+        current = _as_float(llm_data.get(key))
+        if not current:
+            llm_data[key] = figure
+        elif figures_agree(figure, current):
+            llm_data[key] = figure
+        else:
+            print(f"[Fundamental Analyzer] Table figure {key}={figure} disagrees with AI value {current}; keeping AI value")
+            logger.warning(f"Table/LLM disagreement for {company_name} {key}: table={figure}, llm={current}")
+    return llm_data
+
 class FundamentalAnalyzer:
     def __init__(self):
         from backend.utils.rag import get_rag
@@ -15,29 +50,36 @@ class FundamentalAnalyzer:
         self.pdf_parser = PDFParser
         self.table_extractor = FinancialTableExtractor()
 
-    def process_and_store(self, pdf_path: str, company_name: str, report_type: str, job_id: str):
+    def process_and_store(self, pdf_path: str, company_name: str, report_type: str, job_id: str) -> dict:
         import time
         t_start = time.time()
         
-        # Extract Text
-        print(f"[Fundamental Analyzer] Starting PDF Extraction for {pdf_path}...")
+        # Extract -> chunk -> embed as a stream: pages are embedded while later pages are still parsing
+        print(f"[Fundamental Analyzer] Starting streaming PDF ingestion for {pdf_path}...")
         parser = self.pdf_parser(pdf_path)
-        text = parser.extract_text()
-        t_pdf = time.time()
-        print(f"[Fundamental Analyzer] PDF Extraction took {t_pdf - t_start:.2f}s. Length: {len(text)} chars.")
-        
-        # Store in RAG
-        print(f"[Fundamental Analyzer] Starting RAG Ingestion...")
-        self.rag.add_document(text, company_name, report_type, job_id)
+        stats = self.rag.add_pages(parser.iter_pages(), company_name, report_type, job_id)
         t_rag = time.time()
-        print(f"[Fundamental Analyzer] RAG Ingestion took {t_rag - t_pdf:.2f}s.")
-        print(f"[Fundamental Analyzer] Total Process Time: {t_rag - t_start:.2f}s.")
+        stats["ingest_seconds"] = round(t_rag - t_start, 2)
+        print(f"[Fundamental Analyzer] Ingested {stats['chunks']} chunks from {stats['pages_embedded']}/{stats['pages_total']} pages. Total Process Time: {t_rag - t_start:.2f}s.")
         
-        # Tables (optional for now, can add to context later)
-        # tables = parser.extract_tables()
-        # id_tables = self.table_extractor.identify_financial_tables(tables)
+        # Tables: PyMuPDF table finder on the financial pages only, parallel + cached per document
+        try:
+            tables = parser.extract_tables_fast(stats.get("financial_pages"))
+            id_tables = self.table_extractor.identify_financial_tables(tables)
+            figures = self.table_extractor.extract_key_figures(id_tables)
+        except Exception as e:
+            logger.error(f"Table extraction failed: {e}")
+            tables, figures = [], {}
+        t_tables = time.time()
+        stats["tables_found"] = len(tables)
+        stats["table_figures"] = figures
+        stats["tables_seconds"] = round(t_tables - t_rag, 2)
+        print(f"[Fundamental Analyzer] Table extraction took {t_tables - t_rag:.2f}s. {len(tables)} tables, figures: {figures}")
+
+        return stats
 
-    def analyze(self, company_name: str) -> FundamentalMetrics:
+    def analyze(self, company_name: str, table_figures: dict = None) -> FundamentalMetrics:
+        """`table_figures`: the figures process_and_store read from this job's report (stats["table_figures"])."""
         print(f"\n[Fundamental Analyzer] Starting Mixed Analysis for {company_name}...")
         
         # 1. Fetch Reliable CSV Data
@@ -45,14 +87,28 @@ class FundamentalAnalyzer:
         from backend.utils.ticker_db import get_ticker_db
         db = get_ticker_db()
         csv_data = db.get_company_details(company_name) or {}
+        history = db.get_history_features(company_name)
         
-        print(f"[Fundamental Analyzer] CSV Data Found: {bool(csv_data)}")
+        print(f"[Fundamental Analyzer] CSV Data Found: {bool(csv_data)}, history features: {history or 'none'}")
         
         # 2. Retrieve Qualitative Context via RAG
-        context = self.rag.query_context(
-            f"What is the management outlook, future growth plans, strategic direction, and key risks for {company_name}?",
-            company_name
-        )
+        # Several focused questions, embedded and searched in one batched pass
+        questions = [
+            f"What is the management outlook and strategic direction for {company_name}?",
+            f"What are the future growth plans, capex and expansion plans of {company_name}?",
+            f"What are the key risks and concerns for {company_name}?",
+            f"Financial highlights: revenue, net profit and debt to equity of {company_name}",
+        ]
+        chunk_lists = self.rag.retrieve_many(questions, company_name, n_results=3)
+        # Merge, dropping chunks retrieved by more than one question
+        seen = set()
+        merged = []
+        for chunks in chunk_lists:
+            for chunk in chunks:
+                if chunk not in seen:
+                    seen.add(chunk)
+                    merged.append(chunk)
+        context = "\n\n---\n\n".join(merged)
         print(f"[Fundamental Analyzer] Retrieved {len(context)} characters of context.")
 
         # 3. LLM Extraction for Qualitative Fields & Missing Quantitative
@@ -123,6 +179,9 @@ class FundamentalAnalyzer:
             logger.error(f"Qualitative analysis failed: {e}")
             llm_data["strengths"].append(f"AI Extraction Error: {str(e)}")
 
+        # Statement figures read directly from the report's tables are more precise than the LLM's reading of the text
+        merge_table_figures(llm_data, table_figures, company_name)
+
         # --- MATH VERIFICATION ---
         # Calculate Growth if raw numbers exist
         calc_rev_growth = 0.0
@@ -163,6 +222,10 @@ class FundamentalAnalyzer:
             fifty_dma=csv_data.get('50 DMA', 0.0),
             two_hundred_dma=csv_data.get('200 DMA', 0.0),
             rsi=csv_data.get('RSI', 0.0),
+            drawdown_20d=history.get('drawdown_20d'),
+            change_20d=history.get('change_20d'),
+            rsi_change_20d=history.get('rsi_change_20d'),
+            oversold_days=None if history.get('oversold_days') is None else int(history['oversold_days']),
             
             # LLM Qualitative
             health_score=llm_data.get('health_score', 5),
@@ -1,38 +1,73 @@
 import json
 import logging
-from typing import Dict, List
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from backend.config import (
+    NEWS_PROMPT_CHARS, NEWS_LOCAL_CLASSIFIER, NEWS_LOCAL_CLEAR_SHARE, NEWS_LOCAL_MAX_NEGATIVE_SHARE,
+    NEWS_BATCH_COMPANY_CHARS, NEWS_BATCH_PROMPT_CHARS, NEWS_BATCH_MAX_COMPANIES
+)
 from backend.utils.api_clients import NewsAggregator
+from backend.utils.news_clustering import cluster_articles, headline_key
 from backend.models.schemas import NewsSentiment
 from backend.utils.ai_helper import generate_content_with_fallback
 
 logger = logging.getLogger(__name__)
 
+# Prompt fragments shared by the single-company and batch prompts
+STORY_LINES_NOTE = """Stories (one line per distinct story; "[+N similar]" means N more outlets ran the same story,
+        so weigh it more in the score, but label it once):"""
+
+SCORING_TASKS = """Tasks:
+        1. Calculate Sentiment Score (-10 to 10).
+        2. RATE SEVERITY (0-10): How critical is this news to the company's survival/integrity?
+           - 10: Fraud, Raid, Liquidation, Bankruptcy, CEO Arrest. (KILL SWITCH)
+           - 7-9: Major Regulatory Fine, Factory Fire, Massive Strike.
+           - 4-6: Bad Earnings, Product Recall.
+           - 0-3: Routine news, market noise."""
+
+RESULT_SCHEMA = """{
+            "score": <int, -10 to 10>,
+            "positive_count": <int>,
+            "negative_count": <int>,
+            "neutral_count": <int>,
+            "key_themes": [<list of strings>],
+            "headlines": [{ "title": "Example Headline", "sentiment": "positive" }],  # One entry per story line above, title copied exactly, labelled positive/negative/neutral
+            "panic_level": "<low|medium|high>",
+            "severity_score": <int, 0-10>,
+            "severity_reason": "<short explanation>"
+        }"""
+
 class NewsAnalyzer:
     def __init__(self):
         self.aggregator = NewsAggregator()
 
+    @staticmethod
+    def query_for(company_name: str) -> str:
+        return f'"{company_name}" AND (stock OR financial OR earnings OR news)'
+
     def analyze(self, company_name: str) -> NewsSentiment:
+        # 0. Watchlist companies are scored in the background as news arrives
+        from backend.agents.news_watcher import get_news_watcher
+        watcher = get_news_watcher()
+        if watcher is not None:
+            precomputed = watcher.get_sentiment(company_name)
+            if precomputed is not None:
+                print(f"[News Analyzer] Using precomputed watchlist sentiment for {company_name}")
+                return precomputed
+
         # 1. Fetch News
-        custom_query = f'"{company_name}" AND (stock OR financial OR earnings OR news)'
-        articles = self.aggregator.fetch_news(company_name, query_string=custom_query)
-        
-        if not articles:
-            # Return neutral fallback if no news
-            return NewsSentiment(
-                score=0, positive_count=0, negative_count=0, neutral_count=0,
-                key_themes=["No recent news found"], headlines=[], panic_level="low"
-            )
+        articles = self.aggregator.fetch_news(company_name, query_string=self.query_for(company_name))
+        return self.score_articles(company_name, articles)
 
-        # 2. Prepare Prompt
-        print(f"\n[News Analyzer] Fetched {len(articles)} articles. Top headlines:")
-        for a in articles[:3]:
-            print(f" - {a['title']}")
+    def score_articles(self, company_name: str, articles: List[Dict]) -> NewsSentiment:
+        """Sentiment for an already-fetched article list (newest first)."""
+        job = self._prepare(company_name, articles)
+        if isinstance(job, NewsSentiment):
+            return job
 
-        # Prepare all headlines for the UI (not just 15, but maybe limit to 20 for prompt token safety if needed, but return ALL to UI)
-        # Actually logic: We pass top 20 to LLM, but we can return ALL titles in the 'headlines' field for the UI list
-        all_headlines = [a['title'] for a in articles]
-        
-        articles_text = "\n".join([f"- {a['title']} ({a['source']}): {a['description']}" for a in articles[:25]])
+        lines = self._prompt_lines(job['stories'], NEWS_PROMPT_CHARS)
+        articles_text = "\n".join(lines)
         
         prompt = f"""
         Analyze the news sentiment for {company_name}.
@@ -41,29 +76,13 @@ class NewsAnalyzer:
         - IGNORE news about "Sector", "Sensex", "Nifty", or other companies unless {company_name} is explicitly involved.
         - Focus ONLY on {company_name}.
         
-        Articles:
+        {STORY_LINES_NOTE}
         {articles_text}
         
-        Tasks:
-        1. Calculate Sentiment Score (-10 to 10).
-        2. RATE SEVERITY (0-10): How critical is this news to the company's survival/integrity?
-           - 10: Fraud, Raid, Liquidation, Bankruptcy, CEO Arrest. (KILL SWITCH)
-           - 7-9: Major Regulatory Fine, Factory Fire, Massive Strike.
-           - 4-6: Bad Earnings, Product Recall.
-           - 0-3: Routine news, market noise.
+        {SCORING_TASKS}
         
         Return JSON object (no markdown):
-        {{
-            "score": <int, -10 to 10>,
-            "positive_count": <int>,
-            "negative_count": <int>,
-            "neutral_count": <int>,
-            "key_themes": [<list of strings>],
-            "headlines": [{{ "title": "Example Headline", "sentiment": "positive" }}],  # Return ALL analyzed headlines with sentiment labels (positive/negative/neutral)
-            "panic_level": "<low|medium|high>",
-            "severity_score": <int, 0-10>,
-            "severity_reason": "<short explanation>"
-        }}
+        {RESULT_SCHEMA}
         """
 
         # 3. Call Gemini
@@ -72,37 +91,11 @@ class NewsAnalyzer:
             
             # Print top 5 headlines for debugging as requested
             print("\n[DEBUG] Top 5 Headlines Sent to AI:")
-            print(articles_text.split('\n')[:5])
+            print(lines[:5])
             
             response_text = generate_content_with_fallback(prompt)
             print(f"[News Analyzer] AI Response:\n{response_text}")
-            text = response_text.strip()
-            # Clean markdown if present
-            if text.startswith("```json"):
-                text = text[7:-3]
-            
-            data = json.loads(text)
-            
-            # --- Override headlines logic no longer needed, we want LLM to tag them ---
-            # However, if LLM only returns top few, we might miss some. 
-            # Ideally, we want LLM to tag ALL provided articles.
-            # For robustness, we will trust the LLM's returned list if it matches roughly the input count.
-            # If empty, we fallback.
-            
-            if not data.get('headlines'):
-                 data['headlines'] = [{"title": t, "sentiment": "neutral"} for t in all_headlines]
-            
-            # Sort headlines: Prioritize Positive/Negative over Neutral
-            if data.get('headlines'):
-                def sentiment_priority(h):
-                    s = (h.get('sentiment') or 'neutral').lower()
-                    if s == 'positive': return 0
-                    if s == 'negative': return 1
-                    return 2 # Neutral last
-                
-                data['headlines'].sort(key=sentiment_priority)
-
-            return NewsSentiment(**data)
+            return self._finalize(self._parse_json(response_text), job, len(lines))
         except Exception as e:
             print(f"!!! [News Analyzer] ERROR: {e}")
             logger.error(f"News Analysis failed: {e}")
@@ -110,3 +103,255 @@ class NewsAnalyzer:
                 score=0, positive_count=0, negative_count=0, neutral_count=0,
                 key_themes=[f"Error: {str(e)}"], headlines=[], panic_level="low"
             )
+
+    def analyze_many(self, company_names: List[str]) -> Dict[str, NewsSentiment]:
+        """
+        News sentiment for several companies: news is fetched concurrently, then every
+        company that needs the LLM is packed into shared batch prompts (see score_many).
+        """
+        names = list(dict.fromkeys(company_names))
+        results = {}
+        from backend.agents.news_watcher import get_news_watcher
+        watcher = get_news_watcher()
+        if watcher is not None:
+            for name in names:
+                precomputed = watcher.get_sentiment(name)
+                if precomputed is not None:
+                    results[name] = precomputed
+
+        to_fetch = [n for n in names if n not in results]
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers=min(8, len(to_fetch))) as pool:
+                fetched = pool.map(lambda n: self.aggregator.fetch_news(n, query_string=self.query_for(n)), to_fetch)
+                articles = dict(zip(to_fetch, fetched))
+            results.update(self.score_many(articles))
+        return {name: results[name] for name in names}
+
+    def score_many(self, articles_by_company: Dict[str, List[Dict]]) -> Dict[str, NewsSentiment]:
+        """
+        Batched score_articles. Companies with no news or clear-cut news are scored locally;
+        the rest are packed into prompts of up to NEWS_BATCH_MAX_COMPANIES companies and
+        NEWS_BATCH_PROMPT_CHARS of story lines, each asking for one result per company.
+        A company missing from (or malformed in) a batch response is retried on its own.
+        """
+        results = {}
+        jobs = []
+        for company_name, articles in articles_by_company.items():
+            job = self._prepare(company_name, articles)
+            if isinstance(job, NewsSentiment):
+                results[company_name] = job
+            else:
+                job['lines'] = self._prompt_lines(job['stories'], NEWS_BATCH_COMPANY_CHARS)
+                jobs.append(job)
+
+        batches, batch, used = [], [], 0
+        for job in jobs:
+            size = sum(len(line) + 1 for line in job['lines'])
+            if batch and (len(batch) >= NEWS_BATCH_MAX_COMPANIES or used + size > NEWS_BATCH_PROMPT_CHARS):
+                batches.append(batch)
+                batch, used = [], 0
+            batch.append(job)
+            used += size
+        if batch:
+            batches.append(batch)
+
+        for batch in batches:
+            if len(batch) == 1:
+                job = batch[0]
+                results[job['company']] = self.score_articles(job['company'], job['articles'])
+            else:
+                results.update(self._score_batch(batch))
+        return results
+
+    def _score_batch(self, batch: List[Dict]) -> Dict[str, NewsSentiment]:
+        sections = "\n\n".join(
+            f"[C{i}] {job['company']}\n" + "\n".join(job['lines']) for i, job in enumerate(batch, 1)
+        )
+        prompt = f"""
+        Analyze the news sentiment for each of the {len(batch)} companies below, separately.
+        
+        CRITICAL FILTERING: 
+        - For each company, IGNORE news about "Sector", "Sensex", "Nifty", or other companies unless that company is explicitly involved.
+        - Judge each company ONLY on its own section.
+        
+        {STORY_LINES_NOTE}
+        {sections}
+        
+        For EACH company:
+        {SCORING_TASKS}
+        
+        Return one JSON object (no markdown) keyed by company id ("C1", "C2", ...), each value being:
+        {RESULT_SCHEMA}
+        """
+
+        print(f"[News Analyzer] Sending batch prompt for {len(batch)} companies to AI...")
+        try:
+            response = self._parse_json(generate_content_with_fallback(prompt))
+        except Exception as e:
+            logger.error(f"Batch news analysis failed: {e}")
+            response = {}
+
+        results = {}
+        for i, job in enumerate(batch, 1):
+            data = response.get(f"C{i}") if isinstance(response, dict) else None
+            try:
+                if not isinstance(data, dict):
+                    raise ValueError("missing from batch response")
+                results[job['company']] = self._finalize(data, job, len(job['lines']))
+            except Exception as e:
+                print(f"!!! [News Analyzer] Batch result for {job['company']} unusable ({e}); retrying alone")
+                results[job['company']] = self.score_articles(job['company'], job['articles'])
+        return results
+
+    def _prepare(self, company_name: str, articles: List[Dict]):
+        """
+        Clusters and pre-scores the articles. Returns the finished NewsSentiment when no LLM
+        call is needed (no news, or clear-cut news), else the job dict for a prompt.
+        """
+        if not articles:
+            # Return neutral fallback if no news
+            return NewsSentiment(
+                score=0, positive_count=0, negative_count=0, neutral_count=0,
+                key_themes=["No recent news found"], headlines=[], panic_level="low"
+            )
+
+        # 2. Prepare Prompt
+        print(f"\n[News Analyzer] Fetched {len(articles)} articles for {company_name}. Top headlines:")
+        for a in articles[:3]:
+            print(f" - {a['title']}")
+
+        # Syndicated rewrites of one event collapse into a single story line, so the prompt
+        # budget covers more distinct stories and one event is counted once
+        stories = cluster_articles(articles)
+        print(f"[News Analyzer] {len(articles)} articles -> {len(stories)} distinct stories")
+
+        # Local pre-scoring: clear-cut, non-severe news never reaches the LLM
+        local_labels = self._classify_locally(stories)
+        if local_labels and self._is_clear_cut(stories, local_labels):
+            print("[News Analyzer] News is clear-cut; scored locally, skipping the LLM")
+            return self._local_sentiment(articles, stories, local_labels)
+        return {"company": company_name, "articles": articles, "stories": stories, "local_labels": local_labels}
+
+    def _prompt_lines(self, stories: List[Dict], budget: int) -> List[str]:
+        lines, used = [], 0
+        for story in stories:
+            line = self._story_line(story)
+            if lines and used + len(line) > budget:
+                break
+            lines.append(line)
+            used += len(line) + 1
+        return lines
+
+    @staticmethod
+    def _parse_json(response_text: str):
+        text = response_text.strip()
+        # Clean markdown if present
+        if text.startswith("```json"):
+            text = text[7:-3]
+        return json.loads(text)
+
+    def _finalize(self, data: Dict, job: Dict, prompted: int) -> NewsSentiment:
+        # Counts are per distinct story; every article inherits its story's label for the UI list
+        # (local labels cover stories the model did not label or that fell outside the prompt budget)
+        self._apply_story_labels(data, job['articles'], job['stories'], prompted, job['local_labels'])
+        
+        # Sort headlines: Prioritize Positive/Negative over Neutral
+        if data.get('headlines'):
+            def sentiment_priority(h):
+                s = (h.get('sentiment') or 'neutral').lower()
+                if s == 'positive': return 0
+                if s == 'negative': return 1
+                return 2 # Neutral last
+            
+            data['headlines'].sort(key=sentiment_priority)
+
+        return NewsSentiment(**data)
+
+    @staticmethod
+    def _story_line(story: Dict) -> str:
+        similar = f" [+{story['cluster_size'] - 1} similar]" if story['cluster_size'] > 1 else ""
+        description = (story.get('description') or "")[:300]
+        return f"- {story['title']} ({story.get('source')}){similar}: {description}"
+
+    @staticmethod
+    def _apply_story_labels(data: Dict, articles: List[Dict], stories: List[Dict], prompted: int,
+                            local_labels: Optional[List[Dict]] = None):
+        labels = []
+        for h in data.get('headlines') or []:
+            sentiment = (h.get('sentiment') or 'neutral').lower()
+            labels.append((headline_key(h.get('title')), sentiment if sentiment in ('positive', 'negative') else 'neutral'))
+
+        article_labels = ['neutral'] * len(articles)
+        counts = Counter()
+        for i, story in enumerate(stories):
+            # The model sometimes echoes the "(source) [+N similar]" tail; match on the headline start
+            key = headline_key(story['title'])
+            label = next((l for k, l in labels if k and (k == key or k.startswith(key))), None)
+            if label is None and local_labels:
+                label = local_labels[i]['sentiment']
+            if label is None:
+                if i >= prompted:
+                    continue
+                label = 'neutral'
+            counts[label] += 1
+            for j in story['members']:
+                article_labels[j] = label
+
+        data['headlines'] = [{"title": a['title'], "sentiment": label} for a, label in zip(articles, article_labels)]
+        if labels or local_labels:
+            data['positive_count'] = counts['positive']
+            data['negative_count'] = counts['negative']
+            data['neutral_count'] = counts['neutral']
+
+    @staticmethod
+    def _classify_locally(stories: List[Dict]) -> Optional[List[Dict]]:
+        if not NEWS_LOCAL_CLASSIFIER:
+            return None
+        from backend.utils.headline_classifier import get_headline_classifier
+        classifier = get_headline_classifier()
+        if classifier is None:
+            return None
+        try:
+            return classifier.classify([story['title'] for story in stories])
+        except Exception as e:
+            logger.error(f"Local headline classification failed: {e}")
+            return None
+
+    @staticmethod
+    def _label_weights(stories: List[Dict], local_labels: List[Dict]) -> Counter:
+        """Articles per local sentiment label, each story weighted by how many outlets ran it."""
+        weight = Counter()
+        for story, label in zip(stories, local_labels):
+            weight[label['sentiment']] += story['cluster_size']
+        return weight
+
+    @classmethod
+    def _is_clear_cut(cls, stories: List[Dict], local_labels: List[Dict]) -> bool:
+        """
+        Only calm news is scored locally: anything severe, any sizeable share of negative
+        articles (where panic level and severity matter) or unsure labels go to the LLM.
+        """
+        if any(label['severe'] for label in local_labels):
+            return False
+        total = sum(story['cluster_size'] for story in stories)
+        if cls._label_weights(stories, local_labels)['negative'] >= NEWS_LOCAL_MAX_NEGATIVE_SHARE * total:
+            return False
+        clear = sum(story['cluster_size'] for story, label in zip(stories, local_labels) if label['clear'])
+        return clear >= NEWS_LOCAL_CLEAR_SHARE * total
+
+    def _local_sentiment(self, articles: List[Dict], stories: List[Dict], local_labels: List[Dict]) -> NewsSentiment:
+        """Score from the local labels of clear-cut, low-severity news (see _is_clear_cut)."""
+        weight = self._label_weights(stories, local_labels)
+        total = sum(weight.values())
+        score = round(10 * (weight['positive'] - weight['negative']) / total)
+
+        data = {
+            "score": max(-10, min(10, score)),
+            "key_themes": [s['title'] for s in sorted(stories, key=lambda s: -s['cluster_size'])[:3]],
+            "panic_level": "low",
+            "severity_score": 2 if weight['negative'] else 0,
+            "severity_reason": "Classified locally: no high-severity stories",
+        }
+        self._apply_story_labels(data, articles, stories, len(stories), local_labels)
+        data['headlines'].sort(key=lambda h: {'positive': 0, 'negative': 1}.get(h['sentiment'], 2))
+        return NewsSentiment(**data)
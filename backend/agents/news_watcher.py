@@ -0,0 +1,220 @@
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from backend.config import (
+    NEWS_WATCHLIST, NEWS_WATCH_INTERVAL, NEWS_WATCH_WINDOW_DAYS, NEWS_ALERT_SEVERITY, NEWS_ALERT_WEBHOOK
+)
+from backend.models.schemas import NewsSentiment
+from backend.utils.api_clients import merge_articles, published_datetime
+
+logger = logging.getLogger(__name__)
+
+# Re-ask sources for this much before the last poll, for articles indexed late
+POLL_OVERLAP = timedelta(minutes=15)
+# Most recent articles kept per company for scoring
+MAX_ARTICLES = 100
+ALERT_HISTORY = 100
+
+def _key(company_name: str) -> str:
+    """State key: the canonical listed name when the ticker DB knows the name or alias ("TCS")."""
+    try:
+        from backend.utils.ticker_db import get_ticker_db
+        resolved = get_ticker_db().resolve_name(company_name)
+    except Exception:
+        resolved = None
+    return " ".join((resolved or company_name).lower().split())
+
+def _article_key(article: Dict) -> Optional[str]:
+    return article.get('url') or article.get('title')
+
+class NewsWatcher:
+    """
+    Keeps a rolling news sentiment per watchlist company, off the request path.
+
+    Each poll asks the sources only for articles since the previous poll (plus a small
+    overlap), merges the new ones into the company's rolling NEWS_WATCH_WINDOW_DAYS window
+    and re-scores the window only when something new arrived (or old articles aged out).
+    Jobs for a watched company then take the precomputed NewsSentiment. A severity
+    score crossing NEWS_ALERT_SEVERITY raises an alert.
+    """
+    def __init__(self, companies: List[str], interval: float = NEWS_WATCH_INTERVAL,
+                 window_days: int = NEWS_WATCH_WINDOW_DAYS, analyzer=None):
+        self.companies = list(dict.fromkeys(c.strip() for c in companies if c.strip()))
+        self.interval = interval
+        self.window = timedelta(days=window_days)
+        self._analyzer = analyzer
+        self._states: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.alerts = deque(maxlen=ALERT_HISTORY)
+
+    @property
+    def analyzer(self):
+        if self._analyzer is None:
+            from backend.agents.news_analyzer import NewsAnalyzer
+            self._analyzer = NewsAnalyzer()
+        return self._analyzer
+
+    # --- Polling ---
+
+    def _fetch(self, company_name: str) -> Dict:
+        """Merges articles published since the last poll into the company's rolling window."""
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            previous = self._states.get(_key(company_name))
+        state = dict(previous) if previous else {
+            "company": company_name, "articles": [], "seen": set(), "last_polled": None,
+            "sentiment": None, "updated_at": None,
+        }
+        since = state["last_polled"] - POLL_OVERLAP if state["last_polled"] else now - self.window
+        fetched = self.analyzer.aggregator.fetch_since(
+            company_name, since, query_string=self.analyzer.query_for(company_name))
+
+        fresh = [a for a in fetched if _article_key(a) and _article_key(a) not in state["seen"]]
+        cutoff = now - self.window
+        kept = [a for a in state["articles"] if (published_datetime(a) or now) >= cutoff]
+        expired = len(kept) < len(state["articles"])
+
+        state["articles"] = merge_articles([fresh, kept])[:MAX_ARTICLES]
+        # Only what is still in the window; anything older cannot come back from a since-last-poll fetch
+        state["seen"] = {_article_key(a) for a in state["articles"]}
+        state["last_polled"] = now
+        state["new"] = len(fresh)
+        state["stale"] = bool(fresh or expired or state["sentiment"] is None)
+        return state
+
+    def _publish(self, state: Dict, sentiment: Optional[NewsSentiment] = None):
+        if sentiment is not None:
+            previous = state["sentiment"]
+            state["sentiment"] = sentiment
+            state["updated_at"] = state["last_polled"]
+            self._check_alert(state["company"], previous, sentiment)
+            print(f"[News Watcher] {state['company']}: {state['new']} new articles, score {sentiment.score}, severity {sentiment.severity_score}")
+        with self._lock:
+            self._states[_key(state["company"])] = state
+
+    def poll(self, company_name: str) -> int:
+        """Fetches and scores new articles for one company. Returns how many were new."""
+        state = self._fetch(company_name)
+        sentiment = self.analyzer.score_articles(company_name, state["articles"]) if state["stale"] else None
+        self._publish(state, sentiment)
+        return state["new"]
+
+    def poll_all(self):
+        """One cycle: fetch every company, then re-score those with news in shared batch prompts."""
+        states = []
+        for company in self.companies:
+            if self._stop.is_set():
+                return
+            try:
+                states.append(self._fetch(company))
+            except Exception as e:
+                logger.error(f"News watcher poll failed for {company}: {e}")
+
+        stale = {state["company"]: state["articles"] for state in states if state["stale"]}
+        try:
+            sentiments = self.analyzer.score_many(stale) if stale else {}
+        except Exception as e:
+            logger.error(f"News watcher scoring failed: {e}")
+            # Leave the stale companies unpublished so the next cycle re-fetches and re-scores them
+            states = [state for state in states if not state["stale"]]
+            sentiments = {}
+        for state in states:
+            self._publish(state, sentiments.get(state["company"]))
+
+    def start(self):
+        if self._thread is not None or not self.companies:
+            return
+        self._stop.clear()
+
+        def run():
+            print(f"[News Watcher] Watching {len(self.companies)} companies every {self.interval:g}s")
+            while not self._stop.is_set():
+                self.poll_all()
+                self._stop.wait(self.interval)
+
+        self._thread = threading.Thread(target=run, name="news-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread = None
+
+    # --- Alerts ---
+
+    def _check_alert(self, company_name: str, previous: Optional[NewsSentiment], current: NewsSentiment):
+        before = previous.severity_score if previous else 0
+        if current.severity_score < NEWS_ALERT_SEVERITY or before >= NEWS_ALERT_SEVERITY:
+            return
+        alert = {
+            "company": company_name,
+            "severity_score": current.severity_score,
+            "previous_severity": before,
+            "reason": current.severity_reason,
+            "panic_level": current.panic_level,
+            "score": current.score,
+            "at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.alerts.append(alert)
+        print(f"!!! [News Watcher] ALERT {company_name}: severity {before} -> {current.severity_score} ({current.severity_reason})")
+        logger.warning(f"News severity alert for {company_name}: {alert}")
+        if NEWS_ALERT_WEBHOOK:
+            try:
+                import requests
+                requests.post(NEWS_ALERT_WEBHOOK, json=alert, timeout=5)
+            except Exception as e:
+                logger.error(f"Alert webhook failed: {e}")
+
+    # --- Reads ---
+
+    def get_sentiment(self, company_name: str) -> Optional[NewsSentiment]:
+        """
+        Precomputed sentiment if the company (by listed name or alias) is watched and was
+        polled recently, else None.
+        """
+        with self._lock:
+            state = self._states.get(_key(company_name))
+        if state is None or state["sentiment"] is None:
+            return None
+        # A poll cycle can run late (slow sources, LLM calls); beyond two intervals the state is stale
+        if datetime.now(timezone.utc) - state["last_polled"] > timedelta(seconds=2 * self.interval):
+            return None
+        return state["sentiment"].model_copy(deep=True)
+
+    def status(self) -> Dict:
+        with self._lock:
+            states = list(self._states.values())
+        companies = {}
+        for state in states:
+            sentiment = state["sentiment"]
+            companies[state["company"]] = {
+                "articles": len(state["articles"]),
+                "last_polled": state["last_polled"].isoformat() if state["last_polled"] else None,
+                "updated_at": state["updated_at"].isoformat() if state["updated_at"] else None,
+                "score": sentiment.score if sentiment else None,
+                "severity_score": sentiment.severity_score if sentiment else None,
+                "panic_level": sentiment.panic_level if sentiment else None,
+            }
+        return {
+            "watchlist": self.companies,
+            "interval_seconds": self.interval,
+            "companies": companies,
+            "alerts": list(self.alerts),
+        }
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+def get_news_watcher() -> Optional[NewsWatcher]:
+    """The process-wide watcher over NEWS_WATCHLIST, or None if the watchlist is empty."""
+    global _watcher
+    if _watcher is None and NEWS_WATCHLIST:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = NewsWatcher(NEWS_WATCHLIST)
+    return _watcher
@@ -32,6 +32,7 @@ class PeerComparator:
                 'current_price': 0.0 # Placeholder
             }
             target_metrics.normalized_scores = calculate_normalized_scores_v2(target_raw)
+            target_metrics.industry_percentiles = db.get_industry_percentiles(company_name)
             print(f"[Peer Comparator] Calculated Target Scores: {target_metrics.normalized_scores}")
         except Exception as e:
             print(f"Error calculating target scores: {e}")
@@ -57,14 +58,21 @@ class PeerComparator:
         needed = 5 - len(peer_data_list)
         if needed > 0:
             print(f"\n[Peer Comparator] Finding additional peers for {company_name} (Ind. PE: {target_metrics.industry_pe})...")
-            auto_peers = db.get_peers_by_industry(
-                industry_pe=target_metrics.industry_pe,
-                exclude_name=company_name,
-                limit=needed * 2  # Fetch extra to filter
-            )
-            
             # Filter out already added manual competitors
             current_names = [p.get('Name') for p in peer_data_list]
+
+            auto_peers = []
+            if not manual_competitors:
+                # Nearest neighbours on standardized metrics from the same Industry PE group,
+                # topped up from other industries only when the group is too small
+                auto_peers = db.get_similar_peers(company_name, limit=needed)
+            if not auto_peers:
+                auto_peers = db.get_peers_by_industry(
+                    industry_pe=target_metrics.industry_pe,
+                    exclude_name=company_name,
+                    limit=needed,
+                    exclude=current_names + list(manual_competitors)
+                )
             
             for p in auto_peers:
                 if len(peer_data_list) >= 5: break
@@ -104,23 +112,26 @@ class PeerComparator:
                 concerns=[]
             )
             
-            # Calculate Normalized Scores for Peer
-            try:
-                # Map CSV keys to expected format for calc
-                peer_raw = {
-                    'roe': sf('ROE'),
-                    'roce': sf('ROCE'),
-                    'pe_ratio': sf('PE Ratio'),
-                    'industry_pe': sf('Industry PE'),
-                    'dividend': sf('Dividend'),
-                    'current_price': sf('LTP'),
-                    'returns_1y': sf('1 Yr Returns'),
-                    'returns_5y': sf('5 Yr Returns')
-                }
-                p_metrics.normalized_scores = calculate_normalized_scores_v2(peer_raw)
-            except Exception as e:
-                print(f"Error calculating scores for {p_name}: {e}")
-            
+            # Normalized Scores for Peer: precomputed for the whole universe at load time
+            p_metrics.normalized_scores = db.get_normalized_scores(p_name)
+            p_metrics.industry_percentiles = db.get_industry_percentiles(p_name)
+            if p_metrics.normalized_scores is None:
+                try:
+                    # Not in the snapshot (shouldn't happen for CSV peers): score this row directly
+                    peer_raw = {
+                        'roe': sf('ROE'),
+                        'roce': sf('ROCE'),
+                        'pe_ratio': sf('PE Ratio'),
+                        'industry_pe': sf('Industry PE'),
+                        'dividend': sf('Dividend'),
+                        'current_price': sf('LTP'),
+                        'returns_1y': sf('1 Yr Returns'),
+                        'returns_5y': sf('5 Yr Returns')
+                    }
+                    p_metrics.normalized_scores = calculate_normalized_scores_v2(peer_raw)
+                except Exception as e:
+                    print(f"Error calculating scores for {p_name}: {e}")
+
             peer_metrics_map[p_name] = p_metrics
 
         print(f"[Peer Comparator] Found peers: {peer_names}")
@@ -8,6 +8,9 @@ UPLOAD_DIR = os.path.join(BASE_DIR, "uploads")
 STATIC_DIR = os.path.join(BASE_DIR, "frontend", "static")
 TEMPLATES_DIR = os.path.join(BASE_DIR, "frontend", "templates")
 
+# Derived per-document artifacts (extracted tables, page text) keyed by document hash
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(BASE_DIR, "cache"))
+
 # Creates upload dir if not exists
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
@@ -24,3 +27,80 @@ if not OPENROUTER_API_KEY:
     print("WARNING: OPENROUTER_API_KEY not found in .env")
 if not HF_TOKEN:
     print("WARNING: HF_TOKEN not found in .env, downloading public models anonymously.")
+
+# --- News ---
+# RSS/Atom feeds queried alongside NewsAPI (comma-separated). URLs containing {query} are search
+# feeds; fixed feeds are filtered to items that name the company
+NEWS_RSS_FEEDS = [u.strip() for u in os.getenv(
+    "NEWS_RSS_FEEDS",
+    "https://news.google.com/rss/search?q={query}&hl=en-IN&gl=IN&ceid=IN:en,"
+    "https://economictimes.indiatimes.com/markets/stocks/rssfeeds/2146842.cms,"
+    "https://www.moneycontrol.com/rss/business.xml"
+).split(",") if u.strip()]
+# Per-source HTTP timeout, and the overall deadline after which whatever has arrived is used
+NEWS_SOURCE_TIMEOUT = float(os.getenv("NEWS_SOURCE_TIMEOUT", "5"))
+NEWS_DEADLINE_SECONDS = float(os.getenv("NEWS_DEADLINE_SECONDS", "8"))
+# Stop waiting for slower sources once this many unique articles are in
+NEWS_MIN_ARTICLES = int(os.getenv("NEWS_MIN_ARTICLES", "25"))
+
+# News lists are cached per (company, query, window) for this long (seconds; 0 disables),
+# then served stale for up to NEWS_CACHE_STALE more while one background refresh runs
+NEWS_CACHE_TTL = float(os.getenv("NEWS_CACHE_TTL", "900"))
+NEWS_CACHE_STALE = float(os.getenv("NEWS_CACHE_STALE", "21600"))
+# Character budget for the article lines in the news sentiment prompt (about what 25 raw
+# articles used to take); near-duplicate stories are collapsed first so it covers more of them
+NEWS_PROMPT_CHARS = int(os.getenv("NEWS_PROMPT_CHARS", "6000"))
+# Local headline sentiment on the resident embedding model (off by default: the thresholds below
+# have not been validated against LLM labels on the production model). When on, news whose stories
+# are clear-cut (best-vs-second class margin >= NEWS_LOCAL_MIN_MARGIN for at least NEWS_LOCAL_CLEAR_SHARE
+# of articles), not high-severity and mostly not negative is scored without the LLM
+NEWS_LOCAL_CLASSIFIER = os.getenv("NEWS_LOCAL_CLASSIFIER", "0") == "1"
+NEWS_LOCAL_MIN_MARGIN = float(os.getenv("NEWS_LOCAL_MIN_MARGIN", "0.05"))
+NEWS_LOCAL_CLEAR_SHARE = float(os.getenv("NEWS_LOCAL_CLEAR_SHARE", "0.8"))
+# Share of articles labelled negative at or above which the news always goes to the LLM
+NEWS_LOCAL_MAX_NEGATIVE_SHARE = float(os.getenv("NEWS_LOCAL_MAX_NEGATIVE_SHARE", "0.3"))
+# Similarity to the fraud/raid/default prototypes above which a headline always goes to the LLM
+NEWS_LOCAL_SEVERE_SIMILARITY = float(os.getenv("NEWS_LOCAL_SEVERE_SIMILARITY", "0.55"))
+# Multi-company sentiment (NewsAnalyzer.analyze_many): story lines per company, total story
+# characters per batch prompt, and companies per batch (each needs its own JSON result)
+NEWS_BATCH_COMPANY_CHARS = int(os.getenv("NEWS_BATCH_COMPANY_CHARS", "2500"))
+NEWS_BATCH_PROMPT_CHARS = int(os.getenv("NEWS_BATCH_PROMPT_CHARS", "15000"))
+NEWS_BATCH_MAX_COMPANIES = int(os.getenv("NEWS_BATCH_MAX_COMPANIES", "8"))
+
+# Background news watcher: companies (comma-separated) polled every NEWS_WATCH_INTERVAL seconds
+# and re-scored as new articles arrive; jobs for them reuse the precomputed sentiment. Empty = off
+NEWS_WATCHLIST = [c.strip() for c in os.getenv("NEWS_WATCHLIST", "").split(",") if c.strip()]
+NEWS_WATCH_INTERVAL = float(os.getenv("NEWS_WATCH_INTERVAL", "600"))
+NEWS_WATCH_WINDOW_DAYS = int(os.getenv("NEWS_WATCH_WINDOW_DAYS", "7"))
+# Alert when a watched company's severity score crosses this; optionally POSTed to NEWS_ALERT_WEBHOOK
+NEWS_ALERT_SEVERITY = int(os.getenv("NEWS_ALERT_SEVERITY", "7"))
+NEWS_ALERT_WEBHOOK = os.getenv("NEWS_ALERT_WEBHOOK")
+
+# --- Ticker Universe ---
+# Seconds between checks of stocks.csv for changes; a changed file is rebuilt into a new
+# snapshot and swapped in without a restart. 0 disables the watcher (POST /api/admin/reload-tickers still works)
+TICKER_RELOAD_INTERVAL = float(os.getenv("TICKER_RELOAD_INTERVAL", "0"))
+# Every newly loaded stocks.csv is recorded as one day (the date it was loaded) in an append-only
+# columnar history used for drawdown / RSI-trajectory features; "0" disables recording
+TICKER_HISTORY = os.getenv("TICKER_HISTORY", "1") != "0"
+TICKER_HISTORY_DIR = os.getenv("TICKER_HISTORY_DIR", os.path.join(BASE_DIR, "history"))
+# Admin endpoints require this value in the X-Admin-Token header; unset disables them
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+# --- RAG Storage ---
+# "chroma" = ChromaDB PersistentClient, "flat" = memory-mapped NumPy index (backend/utils/vector_index.py)
+RAG_BACKEND = os.getenv("RAG_BACKEND", "chroma").strip().lower()
+RAG_PERSIST_DIR = os.getenv("RAG_PERSIST_DIR", "chroma_db")
+# Storage precision for the flat index: "float16" halves disk/RSS, "float32" is exact
+RAG_FLAT_DTYPE = os.getenv("RAG_FLAT_DTYPE", "float16")
+# Local pre-serialized copy of the embedding model; written on first boot (or at Docker build) so
+# later starts never hit the HuggingFace hub
+EMBEDDING_MODEL_DIR = os.getenv("EMBEDDING_MODEL_DIR", os.path.join(BASE_DIR, "model_cache", "all-MiniLM-L6-v2"))
+
+# --- PDF Processing ---
+# Worker processes for page-range text extraction (0 = one per CPU, 1 = serial)
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "0"))
+# Classify pages before embedding and skip boilerplate (AGM notices, CSR, bios, photo pages); "0" disables
+PAGE_PREFILTER = os.getenv("PAGE_PREFILTER", "1") != "0"
+# Cache per-page text + layout blocks by document hash so re-ingestion skips PDF parsing; "0" disables
+PAGE_CACHE = os.getenv("PAGE_CACHE", "1") != "0"
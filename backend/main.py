@@ -5,13 +5,13 @@ import asyncio
 from datetime import datetime
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, UploadFile, File, Form, BackgroundTasks, HTTPException, Request
+from fastapi import FastAPI, UploadFile, File, Form, BackgroundTasks, HTTPException, Request, Header
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from backend.config import UPLOAD_DIR, STATIC_DIR, TEMPLATES_DIR
+from backend.config import UPLOAD_DIR, STATIC_DIR, TEMPLATES_DIR, TICKER_RELOAD_INTERVAL, ADMIN_TOKEN
 from backend.models.schemas import (
     AnalysisRequest, JobStatus, AnalysisResult, 
     NewsSentiment, FundamentalMetrics, PeerComparison, ContrarianSignal,
@@ -93,23 +93,40 @@ async def lifespan(app: FastAPI):
         else:
             logger.error(f"CRITICAL: stocks.csv NOT FOUND at {csv_path}")
 
+        # Pick up a replaced stocks.csv without restarting (jobs keep their pinned snapshot)
+        db.start_watcher(TICKER_RELOAD_INTERVAL)
+
     except Exception as e:
         logger.error(f"Failed to load ticker database: {e}")
 
     logger.info("Server starting... Agents will be loaded lazily on first use.")
     
-    # Asynchronously preload RAG model so it doesn't block port 8000
+    # Asynchronously preload RAG model so it doesn't block port 8000.
+    # get_rag() is lock-protected, so a job arriving mid-load waits for this instance
+    # instead of building a second one; /api/ready reports 503 until it finishes.
     def preload_rag():
         from backend.utils.rag import get_rag
         logger.info("Pre-loading RAG embedding model in background...")
-        get_rag()
-        logger.info("RAG embedding model loaded successfully.")
+        try:
+            get_rag()
+            logger.info("RAG embedding model loaded successfully.")
+        except Exception as e:
+            logger.error(f"RAG embedding model failed to load: {e}")
     
     asyncio.create_task(asyncio.to_thread(preload_rag))
+
+    # Score watchlist news in the background so jobs for those companies skip the news round trip
+    from backend.agents.news_watcher import get_news_watcher
+    news_watcher = get_news_watcher()
+    if news_watcher is not None:
+        news_watcher.start()
     
     yield
     # Shutdown
     logger.info("Shutting down...")
+    get_ticker_db().stop_watcher()
+    if news_watcher is not None:
+        news_watcher.stop()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -130,6 +147,14 @@ templates = Jinja2Templates(directory=TEMPLATES_DIR)
 # --- Background Task ---
 from typing import List
 def process_analysis(job_id: str, company_name: str, report_type: str, file_path: str, manual_competitors: List[str] = []):
+    # Pin the ticker universe for the whole job so a hot reload mid-run can't mix snapshots
+    from backend.utils.ticker_db import get_ticker_db
+    with get_ticker_db().pin() as snapshot:
+        run_analysis(job_id, company_name, report_type, file_path, manual_competitors,
+                     snapshot.version if snapshot else None)
+
+def run_analysis(job_id: str, company_name: str, report_type: str, file_path: str,
+                 manual_competitors: List[str] = [], ticker_snapshot_version: str = None):
     try:
         job = jobs[job_id]
         job.status = "running"
@@ -157,9 +182,9 @@ def process_analysis(job_id: str, company_name: str, report_type: str, file_path
         fund_agent = get_agent('fundamental')
         # Inject CSV Data here if needed, but for now just process PDF
         # We might need to pass the ticker DB for verification later, but keeping it simple for now
-        fund_agent.process_and_store(file_path, company_name, report_type, job_id)
+        job.metrics["ingestion"] = fund_agent.process_and_store(file_path, company_name, report_type, job_id)
         # Analyze
-        fund_result = fund_agent.analyze(company_name)
+        fund_result = fund_agent.analyze(company_name, job.metrics["ingestion"].get("table_figures"))
         job.progress = 60
 
         if job.status == "cancelled": return
@@ -195,7 +220,8 @@ def process_analysis(job_id: str, company_name: str, report_type: str, file_path
             news=news_result,
             fundamentals=fund_result,
             peers=peer_result,
-            signal=signal_result
+            signal=signal_result,
+            ticker_snapshot_version=ticker_snapshot_version
         )
 
         job.result = final_result
@@ -241,6 +267,55 @@ async def results_page(request: Request, job_id: str):
         pass
     return templates.TemplateResponse(request=request, name="results.html")
 
+@app.get("/api/ready")
+async def readiness():
+    """
+    Readiness probe for the load balancer: 200 only once the embedding model
+    and ticker database are loaded, 503 (with the same body) while warming up.
+    """
+    from backend.utils.rag import get_rag_status
+    from backend.utils.ticker_db import get_ticker_db
+    model = get_rag_status()
+    ticker_db = get_ticker_db().status()
+    ready = model["state"] == "ready" and ticker_db["loaded"]
+    body = {"ready": ready, "embedding_model": model, "ticker_db": ticker_db}
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+def require_admin(x_admin_token: str):
+    """Admin endpoints fail closed: disabled (404) unless ADMIN_TOKEN is set, 403 on a wrong token."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not found")
+    if x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.post("/api/admin/reload-tickers")
+async def reload_tickers(force: bool = False, x_admin_token: str = Header(None)):
+    """
+    Rebuilds the ticker universe from stocks.csv in a worker thread and swaps it in
+    atomically. Running jobs finish on the snapshot they started with.
+    """
+    require_admin(x_admin_token)
+
+    from backend.utils.ticker_db import get_ticker_db
+    return await asyncio.to_thread(get_ticker_db().reload, force)
+
+@app.get("/api/news/watchlist")
+async def news_watchlist():
+    """Rolling sentiment per watched company and recent severity alerts."""
+    from backend.agents.news_watcher import get_news_watcher
+    watcher = get_news_watcher()
+    if watcher is None:
+        return {"watchlist": [], "companies": {}, "alerts": []}
+    return watcher.status()
+
+@app.get("/api/admin/news-cache")
+async def news_cache_stats(x_admin_token: str = Header(None)):
+    """Hit/miss/refresh counters for the shared news cache."""
+    require_admin(x_admin_token)
+
+    from backend.utils.api_clients import get_news_cache
+    return get_news_cache().stats()
+
 @app.get("/api/search")
 async def search_companies(q: str):
     """
@@ -254,6 +329,39 @@ async def search_companies(q: str):
     results = db.search_names(q)
     return results
 
+@app.get("/api/screen")
+async def screen_universe(filters: str = "", preset: str = None, sort: str = "-score", limit: int = 25):
+    """
+    Screens the full ticker universe before any LLM work, e.g.
+    /api/screen?filters=returns_1m<-10,rsi<30,roe>15&sort=-score
+    `preset` names a filter set from screener.PRESETS; extra `filters` are ANDed with it.
+    """
+    from backend.utils.screener import PRESETS
+    from backend.utils.ticker_db import get_ticker_db
+
+    if preset:
+        if preset not in PRESETS:
+            raise HTTPException(status_code=400, detail=f"Unknown preset '{preset}'. Available: {', '.join(PRESETS)}")
+        filters = ",".join(f for f in (PRESETS[preset], filters) if f)
+
+    try:
+        return get_ticker_db().screen(filters, sort, min(max(limit, 1), 200))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@app.get("/api/screen/fields")
+async def screen_fields():
+    """Fields usable in /api/screen filters and sort, plus the named presets."""
+    from backend.utils.screener import PRESETS
+    from backend.utils.ticker_db import get_ticker_db
+
+    snapshot = get_ticker_db().snapshot()
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Ticker database not loaded")
+    return {"fields": snapshot.screener().describe(), "presets": PRESETS}
+
 @app.post("/api/analyze")
 @app.post("/api/analyze")
 async def start_analysis(
@@ -319,7 +427,7 @@ async def ask_question(job_id: str, request: QuestionRequest):
     job = jobs[job_id]
     
     # Simple context usage
-    context = rag.query_context(request.question, job.result.company_name) if job.result else ""
+    context, sources = rag.query_with_sources(request.question, job.result.company_name) if job.result else ("", [])
     
     # Simple direct generation for Q&A
     from backend.utils.ai_helper import generate_content_with_fallback
@@ -335,7 +443,7 @@ async def ask_question(job_id: str, request: QuestionRequest):
     
     try:
         resp_text = generate_content_with_fallback(prompt)
-        return QuestionResponse(answer=resp_text)
+        return QuestionResponse(answer=resp_text, sources=sources or None)
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Literal
+from typing import List, Optional, Dict, Literal, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -44,6 +44,11 @@ class FundamentalMetrics(BaseModel):
     fifty_dma: float = 0.0
     two_hundred_dma: float = 0.0
     rsi: float = 0.0
+    # Trajectory (daily ticker history; None until two or more days are recorded)
+    drawdown_20d: Optional[float] = None
+    change_20d: Optional[float] = None
+    rsi_change_20d: Optional[float] = None
+    oversold_days: Optional[int] = None
     
     # Qualitative (from RAG/LLM)
     health_score: int = Field(..., ge=0, le=10)
@@ -58,6 +63,8 @@ class FundamentalMetrics(BaseModel):
     
     # Normalized Scores for Radar Chart (Growth, Profitability, Efficiency, Valuation, Dividend, Momentum)
     normalized_scores: Optional[Dict[str, float]] = None
+    # Percentile of each normalized score among tickers with the same Industry PE (0-100)
+    industry_percentiles: Optional[Dict[str, float]] = None
 
     # Raw math fields (Hidden)
     revenue_current: float = 0.0
@@ -95,6 +102,8 @@ class AnalysisResult(BaseModel):
     fundamentals: FundamentalMetrics
     peers: PeerComparison
     signal: ContrarianSignal
+    # Ticker universe snapshot (stocks.csv content hash prefix) the analysis ran against
+    ticker_snapshot_version: Optional[str] = None
 
 # --- Job Status ---
 class JobStatus(BaseModel):
@@ -104,6 +113,8 @@ class JobStatus(BaseModel):
     current_step: str
     error: Optional[str] = None
     result: Optional[AnalysisResult] = None
+    # Per-stage timings/counters, e.g. metrics["ingestion"]["page_categories"]
+    metrics: Dict[str, Any] = Field(default_factory=dict)
 
 class QuestionResponse(BaseModel):
     answer: str
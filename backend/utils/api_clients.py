@@ -1,8 +1,19 @@
+import os
+import re
+import json
+import asyncio
+import hashlib
 import requests
 import logging
-from typing import List, Dict
+import threading
+from typing import List, Dict, Optional
 import time
-from backend.config import NEWS_API_KEY
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote_plus, urlsplit, urlunsplit
+from backend.config import (
+    NEWS_API_KEY, NEWS_RSS_FEEDS, NEWS_SOURCE_TIMEOUT, NEWS_DEADLINE_SECONDS, NEWS_MIN_ARTICLES,
+    NEWS_CACHE_TTL, NEWS_CACHE_STALE, CACHE_DIR
+)
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +21,7 @@ class NewsAPIClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.base_url = "https://newsapi.org/v2/everything"
+        self.session = requests.Session()
 
     def fetch_news(self, company_name: str, query_string: str = None, days: int = 7) -> List[Dict]:
         """
@@ -17,42 +29,411 @@ class NewsAPIClient:
         """
         search_q = query_string if query_string else f'"{company_name}"'
         try:
-            response = requests.get(
+            response = self.session.get(
                 self.base_url,
-                params={
-                    'q': search_q,
-                    'apiKey': self.api_key,
-                    'language': 'en',
-                    'sortBy': 'publishedAt', # Ensure latest news comes first
-                    'pageSize': 20
-                }
+                params=NewsAPISource.params(search_q, self.api_key, days),
+                timeout=NEWS_SOURCE_TIMEOUT
             )
             response.raise_for_status()
-            
-            data = response.json()
-            articles = data.get('articles', [])
-            
-            # Normalize format
-            clean_articles = []
-            for art in articles:
-                clean_articles.append({
-                    'title': art.get('title'),
-                    'description': art.get('description'),
-                    'url': art.get('url'),
-                    'published_at': art.get('publishedAt'),
-                    'source': art.get('source', {}).get('name')
-                })
-            return clean_articles
+            return NewsAPISource.normalize(response.json())
 
         except Exception as e:
             print(f"!!! [NewsAPI] ERROR: {e}")
             logger.error(f"NewsAPI error: {str(e)}")
             return []
 
-class NewsAggregator:
+# --- Async multi-source aggregation ---
+
+class NewsAPISource:
+    """NewsAPI /v2/everything over a shared async HTTP client."""
+    name = "newsapi"
+    base_url = "https://newsapi.org/v2/everything"
+
+    def __init__(self, api_key: str, timeout: float = NEWS_SOURCE_TIMEOUT):
+        self.api_key = api_key
+        self.timeout = timeout
+
+    @staticmethod
+    def params(query: str, api_key: str, days: int) -> Dict:
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%S")
+        return {
+            'q': query,
+            'apiKey': api_key,
+            'language': 'en',
+            'sortBy': 'publishedAt', # Ensure latest news comes first
+            'pageSize': 20,
+            'from': since
+        }
+
+    @staticmethod
+    def normalize(data: Dict) -> List[Dict]:
+        clean_articles = []
+        for art in data.get('articles', []):
+            clean_articles.append({
+                'title': art.get('title'),
+                'description': art.get('description'),
+                'url': art.get('url'),
+                'published_at': art.get('publishedAt'),
+                'source': (art.get('source') or {}).get('name')
+            })
+        return clean_articles
+
+    async def fetch(self, client, company_name: str, query: str, days: int) -> List[Dict]:
+        response = await client.get(self.base_url, params=self.params(query, self.api_key, days), timeout=self.timeout)
+        response.raise_for_status()
+        return self.normalize(response.json())
+
+class RSSSource:
+    """
+    An RSS/Atom feed. Templates containing {query} are search feeds (e.g. Google News);
+    fixed feeds (a publisher's markets section) are filtered to items naming the company.
+    """
+    def __init__(self, url_template: str, timeout: float = NEWS_SOURCE_TIMEOUT):
+        self.url_template = url_template
+        self.timeout = timeout
+        self.name = urlsplit(url_template).netloc or url_template
+
+    async def fetch(self, client, company_name: str, query: str, days: int) -> List[Dict]:
+        import feedparser
+
+        is_search = "{query}" in self.url_template
+        url = self.url_template.format(query=quote_plus(f'"{company_name}"')) if is_search else self.url_template
+        response = await client.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        # Parsing is CPU work on a small document; keep it off the event loop anyway
+        feed = await asyncio.to_thread(feedparser.parse, response.content)
+
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        needle = company_name.lower()
+        articles = []
+        for entry in feed.entries:
+            title = entry.get('title')
+            description = _strip_html(entry.get('summary') or "")
+            if not is_search and needle not in f"{title} {description}".lower():
+                continue
+            published = entry.get('published_parsed') or entry.get('updated_parsed')
+            published_at = None
+            if published:
+                published_dt = datetime(*published[:6], tzinfo=timezone.utc)
+                if published_dt < cutoff:
+                    continue
+                published_at = published_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+            source = entry.get('source', {}).get('title') if isinstance(entry.get('source'), dict) else None
+            articles.append({
+                'title': title,
+                'description': description or None,
+                'url': entry.get('link'),
+                'published_at': published_at,
+                'source': source or feed.feed.get('title') or self.name
+            })
+        return articles
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+def _strip_html(text: str) -> str:
+    return " ".join(_TAG_RE.sub(" ", text).split())
+
+def _url_key(url: Optional[str]) -> Optional[str]:
+    """Scheme-, query- and fragment-free URL, so tracking parameters don't defeat dedupe."""
+    if not url:
+        return None
+    parts = urlsplit(url)
+    return urlunsplit(("", parts.netloc.lower().removeprefix("www."), parts.path.rstrip("/"), "", ""))
+
+def _title_key(title: Optional[str]) -> Optional[str]:
+    if not title:
+        return None
+    # Aggregators append " - Publisher" to headlines
+    words = _WORD_RE.findall(title.lower().rsplit(" - ", 1)[0])
+    return " ".join(words) or None
+
+def published_datetime(article: Dict) -> Optional[datetime]:
+    """The article's published_at as a tz-aware datetime, or None if missing/unparseable."""
+    value = article.get('published_at')
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def merge_articles(batches: List[List[Dict]]) -> List[Dict]:
+    """
+    Merges source results, dropping repeats by URL or by normalized headline
+    (keeping the copy with a description), newest first.
+    """
+    merged: List[Dict] = []
+    by_key: Dict[str, int] = {}
+    for batch in batches:
+        for art in batch:
+            if not art.get('title'):
+                continue
+            keys = [k for k in (_url_key(art.get('url')), _title_key(art.get('title'))) if k]
+            existing = next((by_key[k] for k in keys if k in by_key), None)
+            if existing is None:
+                by_key.update({k: len(merged) for k in keys})
+                merged.append(art)
+            elif not merged[existing].get('description') and art.get('description'):
+                merged[existing] = art
+                by_key.update({k: existing for k in keys})
+    merged.sort(key=lambda a: a.get('published_at') or "", reverse=True)
+    return merged
+
+class _AsyncHTTP:
+    """
+    One event loop on a daemon thread owning a pooled httpx.AsyncClient, so sync callers
+    (analysis jobs run in worker threads) share keep-alive connections across jobs.
+    """
     def __init__(self):
-        self.client = NewsAPIClient(api_key=NEWS_API_KEY)
+        self._loop = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _start(self):
+        import httpx
+        loop = asyncio.new_event_loop()
+        threading.Thread(target=loop.run_forever, name="news-http", daemon=True).start()
+
+        async def make_client():
+            return httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                headers={"User-Agent": "Mozilla/5.0 (compatible; ContraSignal/1.0)"},
+                follow_redirects=True,
+            )
+        self._client = asyncio.run_coroutine_threadsafe(make_client(), loop).result()
+        self._loop = loop
+
+    def submit(self, coro_fn, *args):
+        """Runs coro_fn(client, *args) on the shared loop; returns a concurrent Future."""
+        if self._loop is None:
+            with self._lock:
+                if self._loop is None:
+                    self._start()
+        return asyncio.run_coroutine_threadsafe(coro_fn(self._client, *args), self._loop)
+
+_http = _AsyncHTTP()
+
+class NewsCache:
+    """
+    TTL cache of normalized article lists, shared by every job in the process and persisted
+    as one JSON file per key under CACHE_DIR/news so restarts keep it warm.
+
+    - fresh (age < ttl): served from cache.
+    - stale (ttl <= age < ttl + stale): served from cache immediately while one background
+      refresh runs (stale-while-revalidate); the next caller sees the new list.
+    - expired or missing: fetched synchronously. Concurrent misses for the same key wait
+      on one fetch instead of each spending NewsAPI quota.
+    Empty results are never cached (they are usually a failed or rate-limited fetch).
+    """
+    def __init__(self, cache_dir: str = os.path.join(CACHE_DIR, "news"),
+                 ttl: float = NEWS_CACHE_TTL, stale: float = NEWS_CACHE_STALE):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.stale = stale
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._refreshing = set()
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "errors": 0}
+
+    @staticmethod
+    def make_key(company_name: str, query: str, days: int) -> str:
+        raw = json.dumps([company_name.strip().lower(), query, days])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), encoding="utf-8") as f:
+                    entry = json.load(f)
+                self._entries[key] = entry
+            except (OSError, ValueError):
+                entry = None
+        return entry
+
+    def _store(self, key: str, articles: List[Dict], meta: Dict):
+        entry = {"fetched_at": time.time(), "articles": articles, **meta}
+        self._entries[key] = entry
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = f"{self._path(key)}.tmp{os.getpid()}.{threading.get_ident()}"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not persist news cache entry: {e}")
 
-    def fetch_news(self, company_name: str, query_string: str = None) -> List[Dict]:
-        # In a full production app, this would try multiple clients
-        return self.client.fetch_news(company_name, query_string=query_string)
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _fetch_and_store(self, key: str, fetch, meta: Dict) -> List[Dict]:
+        try:
+            articles = fetch()
+        except Exception as e:
+            self._count("errors")
+            logger.error(f"News fetch failed: {e}")
+            return []
+        if articles:
+            self._store(key, articles, meta)
+        return articles
+
+    def _refresh_in_background(self, key: str, fetch, meta: Dict):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self._count("refreshes")
+                self._fetch_and_store(key, fetch, meta)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name="news-refresh", daemon=True).start()
+
+    def get_or_fetch(self, key: str, fetch, meta: Dict = None) -> List[Dict]:
+        """Returns cached articles for `key`, calling fetch() (no args) when needed."""
+        meta = meta or {}
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            entry = self._load(key)
+            age = None if entry is None else time.time() - entry["fetched_at"]
+            if age is not None and age < self.ttl:
+                self._count("hits")
+                return entry["articles"]
+            if age is not None and age < self.ttl + self.stale:
+                self._count("stale_hits")
+                self._refresh_in_background(key, fetch, meta)
+                return entry["articles"]
+
+            self._count("misses")
+            return self._fetch_and_store(key, fetch, meta)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+        served = counters["hits"] + counters["stale_hits"]
+        return {
+            **counters,
+            "lookups": lookups,
+            "hit_rate": round(served / lookups, 3) if lookups else None,
+            "entries_in_memory": len(self._entries),
+            "ttl_seconds": self.ttl,
+            "stale_seconds": self.stale,
+        }
+
+_news_cache = None
+_news_cache_lock = threading.Lock()
+
+def get_news_cache() -> NewsCache:
+    global _news_cache
+    if _news_cache is None:
+        with _news_cache_lock:
+            if _news_cache is None:
+                _news_cache = NewsCache()
+    return _news_cache
+
+class NewsAggregator:
+    """
+    Fans a company query out to NewsAPI and RSS feeds concurrently and returns merged,
+    de-duplicated articles as soon as `min_articles` unique ones have arrived or the
+    overall deadline passes, whichever is first. A failing or slow source only loses
+    its own results.
+    """
+    def __init__(self, sources: list = None, min_articles: int = NEWS_MIN_ARTICLES,
+                 deadline: float = NEWS_DEADLINE_SECONDS, cache: Optional[NewsCache] = None):
+        if sources is None:
+            sources = [RSSSource(url) for url in NEWS_RSS_FEEDS]
+            if NEWS_API_KEY:
+                sources.insert(0, NewsAPISource(NEWS_API_KEY))
+            # The configured sources share one cache across jobs; NEWS_CACHE_TTL=0 turns it off
+            if cache is None and NEWS_CACHE_TTL > 0:
+                cache = get_news_cache()
+        self.sources = sources
+        self.min_articles = min_articles
+        self.deadline = deadline
+        self.cache = cache
+
+    async def _gather(self, client, company_name: str, query: str, days: int) -> List[Dict]:
+        started = time.time()
+        tasks = {
+            asyncio.create_task(source.fetch(client, company_name, query, days)): source.name
+            for source in self.sources
+        }
+        batches = []
+        merged = []
+        pending = set(tasks)
+        while pending:
+            remaining = self.deadline - (time.time() - started)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                try:
+                    batch = task.result()
+                    batches.append(batch)
+                    print(f"[News] {name}: {len(batch)} articles in {time.time() - started:.2f}s")
+                except Exception as e:
+                    logger.warning(f"News source {name} failed: {e}")
+            merged = merge_articles(batches)
+            if len(merged) >= self.min_articles:
+                break
+
+        for task in pending:
+            task.cancel()
+        if pending:
+            print(f"[News] Returning without {len(pending)} slow source(s): {[tasks[t] for t in pending]}")
+        return merged
+
+    async def fetch_news_async(self, company_name: str, query_string: str = None, days: int = 7) -> List[Dict]:
+        """Awaitable variant of fetch_news (same cache), for callers on an event loop."""
+        return await asyncio.to_thread(self.fetch_news, company_name, query_string, days)
+
+    def _fetch_uncached(self, company_name: str, query: str, days: int) -> List[Dict]:
+        future = _http.submit(self._gather, company_name, query, days)
+        # The gather honours its own deadline; the margin only guards a wedged loop
+        return future.result(timeout=self.deadline + 5)
+
+    def fetch_since(self, company_name: str, since: datetime, query_string: str = None) -> List[Dict]:
+        """
+        Incremental fetch for pollers: articles published after `since` (tz-aware), bypassing
+        the cache. Sources are asked for the fractional-day window back to `since`; undated
+        articles are kept and left to the caller's own de-duplication. Unlike fetch_news,
+        errors propagate, so a poller does not mistake a failed poll for a quiet period.
+        """
+        if not self.sources:
+            return []
+        query = query_string or f'"{company_name}"'
+        days = max((datetime.now(timezone.utc) - since).total_seconds(), 60.0) / 86400
+        articles = self._fetch_uncached(company_name, query, days)
+        return [a for a in articles if (published_datetime(a) or since) >= since]
+
+    def fetch_news(self, company_name: str, query_string: str = None, days: int = 7) -> List[Dict]:
+        if not self.sources:
+            logger.error("No news sources configured (set NEWS_API_KEY or NEWS_RSS_FEEDS)")
+            return []
+        query = query_string or f'"{company_name}"'
+        fetch = lambda: self._fetch_uncached(company_name, query, days)
+        try:
+            if self.cache is None:
+                return fetch()
+            key = NewsCache.make_key(company_name, query, days)
+            meta = {"company": company_name, "query": query, "days": days}
+            return self.cache.get_or_fetch(key, fetch, meta)
+        except Exception as e:
+            print(f"!!! [News] ERROR: {e}")
+            logger.error(f"News aggregation error: {e}")
+            return []
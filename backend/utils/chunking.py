@@ -0,0 +1,151 @@
+import re
+from typing import List, Dict, Any, Iterable, Iterator, Tuple
+
+# Matches the markers written by PDFParser.extract_text: "--- Page 12 ---"
+PAGE_MARKER_RE = re.compile(r"^--- Page (\d+) ---$", re.MULTILINE)
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+def split_pages(text: str) -> List[Tuple[int, str]]:
+    """Splits parser output into (page_number, page_text). Text without markers is treated as page 1."""
+    markers = list(PAGE_MARKER_RE.finditer(text))
+    if not markers:
+        return [(1, text)] if text.strip() else []
+
+    pages = []
+    for i, m in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+        body = text[m.end():end].strip()
+        if body:
+            pages.append((int(m.group(1)), body))
+    return pages
+
+def is_heading(line: str) -> bool:
+    """
+    Cheap heading heuristic for annual-report layouts:
+    short, no terminal punctuation, and either ALL CAPS or mostly Title Case.
+    """
+    line = line.strip()
+    if len(line) < 4 or len(line) > 80 or line[-1] in ".,;:":
+        return False
+    words = line.split()
+    if len(words) > 10:
+        return False
+    letters = [c for c in line if c.isalpha()]
+    if len(letters) < 0.6 * len(line.replace(" ", "")):
+        return False  # mostly numbers -> table row, not a heading
+    if line.isupper():
+        return True
+    capitalized = sum(1 for w in words if w[0].isupper())
+    return len(words) >= 2 and capitalized / len(words) >= 0.6
+
+class PageAwareSplitter:
+    """
+    Chunks parser output without crossing page boundaries, starting a new chunk
+    at section headings, and without overlap. Each chunk carries its page number
+    and the nearest heading so retrieval can cite sources.
+    """
+    def __init__(self, chunk_size: int = 1000, min_chunk_size: int = 200):
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+
+    def _split_long(self, line: str) -> List[str]:
+        """Breaks a single over-long line at sentence ends, then hard-wraps as a last resort."""
+        pieces, current = [], ""
+        for sentence in SENTENCE_END_RE.split(line):
+            while len(sentence) > self.chunk_size:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(sentence[:self.chunk_size])
+                sentence = sentence[self.chunk_size:]
+            if current and len(current) + 1 + len(sentence) > self.chunk_size:
+                pieces.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def split_page(self, page: int, text: str) -> Iterable[Dict[str, Any]]:
+        section = ""
+        lines, size = [], 0
+
+        def flush():
+            body = "\n".join(lines).strip()
+            if body:
+                return {"text": body, "page": page, "section": section}
+            return None
+
+        for raw in text.split("\n"):
+            line = raw.strip()
+            if not line:
+                continue
+            if is_heading(line) and size >= self.min_chunk_size:
+                chunk = flush()
+                if chunk:
+                    yield chunk
+                lines, size = [], 0
+            if is_heading(line):
+                section = line[:80]
+
+            for piece in (self._split_long(line) if len(line) > self.chunk_size else [line]):
+                # Tiny leftovers (e.g. a lone heading) ride along with the next piece instead of
+                # becoming their own chunk, so a chunk can exceed chunk_size by < min_chunk_size
+                if size >= self.min_chunk_size and size + 1 + len(piece) > self.chunk_size:
+                    chunk = flush()
+                    if chunk:
+                        yield chunk
+                    lines, size = [], 0
+                lines.append(piece)
+                size += len(piece) + (1 if size else 0)
+
+        chunk = flush()
+        if chunk:
+            yield chunk
+
+    def iter_chunks(self, pages: Iterable[Tuple[int, str]]) -> Iterator[Dict[str, Any]]:
+        """Streams chunks from an iterable of (page_number, text), e.g. PDFParser.iter_pages()."""
+        for page, body in pages:
+            yield from self.split_page(page, body)
+
+    def split_text(self, text: str) -> List[Dict[str, Any]]:
+        return list(self.iter_chunks(split_pages(text)))
+
+def overlap_length(previous: str, text: str, max_overlap: int = 400) -> int:
+    """Length of the longest prefix of `text` that is also a suffix of `previous` (ignoring tiny matches)."""
+    limit = min(len(previous), len(text), max_overlap)
+    for k in range(limit, 20, -1):
+        if previous.endswith(text[:k]):
+            return k
+    return 0
+
+def dedupe_hits(hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drops duplicate chunks and trims text shared with an adjacent chunk of the same
+    document (legacy overlapping splits), keeping the relevance order of `hits`.
+    """
+    kept = {}  # (doc_id, chunk_index) -> original text
+    seen_texts = set()
+    result = []
+    for hit in hits:
+        meta = hit.get("metadata") or {}
+        doc_id, index = meta.get("doc_id"), meta.get("chunk_index")
+        original = hit["document"]
+        if (doc_id, index) in kept or original in seen_texts:
+            continue
+        text = original
+        if index is not None:
+            prev = kept.get((doc_id, index - 1))
+            if prev is not None:
+                text = text[overlap_length(prev, text):]
+            nxt = kept.get((doc_id, index + 1))
+            if nxt is not None:
+                cut = overlap_length(original, nxt)
+                if cut:
+                    text = text[:max(0, len(text) - cut)]
+            kept[(doc_id, index)] = original
+        seen_texts.add(original)
+        if text.strip():
+            result.append({**hit, "document": text.strip()})
+    return result
@@ -0,0 +1,108 @@
+import os
+import re
+import json
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from backend.config import BASE_DIR, NEWS_LOCAL_MIN_MARGIN, NEWS_LOCAL_SEVERE_SIMILARITY
+
+logger = logging.getLogger(__name__)
+
+PROTOTYPES_PATH = os.path.join(BASE_DIR, "backend", "data", "headline_prototypes.json")
+LABELS = ["positive", "negative", "neutral"]
+# Class score = mean cosine similarity to the class's K nearest prototype headlines
+PROTOTYPE_K = 3
+
+# Kill-switch vocabulary: any hit sends the news to the LLM for a severity rating, whatever the embedding says
+_SEVERE_RE = re.compile(
+    r"\b(fraud|raids?|raided|arrest(ed)?|bankrupt(cy)?|insolven(t|cy)|liquidation|default(s|ed)?|"
+    r"forensic|bribe(ry)?|money laundering|scam|probe|penalt(y|ies)|sebi (order|bars?)|"
+    r"fire|blast|explosion|strike|lockout|recall|short seller|nclt|enforcement directorate)\b"
+)
+
+class HeadlineClassifier:
+    """
+    Nearest-prototype sentiment classifier over sentence embeddings.
+
+    Labelled seed headlines (backend/data/headline_prototypes.json) are embedded once with
+    the same model as the headlines; a headline's class score is its mean cosine similarity to
+    the PROTOTYPE_K closest seeds of that class. `severe` prototypes are not a sentiment
+    label: closeness to them (or a kill-switch keyword) flags the headline for the LLM.
+
+    `encode` maps a list of texts to a (n, dim) array; by default the resident RAG
+    embedding model, so no second model is loaded.
+    """
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], prototypes_path: str = PROTOTYPES_PATH):
+        self.encode = encode
+        with open(prototypes_path, encoding="utf-8") as f:
+            self.prototypes: Dict[str, List[str]] = json.load(f)
+        self._vectors: Optional[Dict[str, np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.asarray(self.encode(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _prototype_vectors(self) -> Dict[str, np.ndarray]:
+        if self._vectors is None:
+            with self._lock:
+                if self._vectors is None:
+                    self._vectors = {label: self._embed(texts) for label, texts in self.prototypes.items()}
+        return self._vectors
+
+    @staticmethod
+    def _class_score(sims: np.ndarray) -> np.ndarray:
+        k = min(PROTOTYPE_K, sims.shape[1])
+        return np.sort(sims, axis=1)[:, -k:].mean(axis=1)
+
+    def classify(self, headlines: List[str]) -> List[Dict]:
+        """
+        Per headline: {'sentiment', 'confidence' (margin between the best and second class
+        score), 'clear' (confidence >= NEWS_LOCAL_MIN_MARGIN), 'severe'}.
+        """
+        if not headlines:
+            return []
+        prototypes = self._prototype_vectors()
+        vectors = self._embed(headlines)
+        scores = np.stack([self._class_score(vectors @ prototypes[label].T) for label in LABELS], axis=1)
+        severe_sim = self._class_score(vectors @ prototypes["severe"].T) if "severe" in prototypes else np.zeros(len(headlines))
+
+        ranked = np.sort(scores, axis=1)
+        margins = ranked[:, -1] - ranked[:, -2]
+        results = []
+        for i, headline in enumerate(headlines):
+            results.append({
+                "sentiment": LABELS[int(scores[i].argmax())],
+                "confidence": round(float(margins[i]), 3),
+                "clear": bool(margins[i] >= NEWS_LOCAL_MIN_MARGIN),
+                "severe": bool(severe_sim[i] >= NEWS_LOCAL_SEVERE_SIMILARITY or _SEVERE_RE.search(headline.lower())),
+            })
+        return results
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def get_headline_classifier() -> Optional[HeadlineClassifier]:
+    """
+    The classifier on the resident embedding model, or None while that model is not loaded
+    (startup preload still running or failed) -- callers then fall back to the LLM.
+    """
+    global _classifier
+    if _classifier is None:
+        from backend.utils.rag import get_rag, get_rag_status
+        if get_rag_status()["state"] != "ready":
+            return None
+        with _classifier_lock:
+            if _classifier is None:
+                rag = get_rag()
+                try:
+                    # Uncached: headlines would evict /api/ask questions from the query LRU and skew its hit rate
+                    _classifier = HeadlineClassifier(lambda texts: np.stack(rag.embed_texts(texts)))
+                except Exception as e:
+                    logger.error(f"Headline classifier unavailable: {e}")
+                    return None
+    return _classifier
@@ -0,0 +1,139 @@
+import math
+from collections import Counter
+from itertools import chain
+from typing import List, Dict, Tuple
+
+# Match-quality tiers; market cap only breaks ties within a tier
+EXACT, PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = 4, 3, 2, 1, 0
+# Candidates kept per trie node (already sorted by market cap)
+TRIE_NODE_LIMIT = 50
+# Minimum Dice similarity on trigrams for a typo-tolerant match, against the best-matching
+# run of as many words of the name as the query has (so long names are not penalised)
+FUZZY_MIN_SIMILARITY = 0.35
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _word_windows(name: str, size: int) -> List[str]:
+    """Every run of `size` consecutive words in `name` (the whole name if it is shorter)."""
+    words = name.split()
+    if len(words) <= size:
+        return [name]
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+def _dice(a: set, b: set) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+def _core_trigrams(text: str) -> set:
+    """Unpadded trigrams: every one of them occurs in any name containing `text`."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class NameSearchIndex:
+    """
+    In-memory autocomplete index over company names, built once at load time.
+
+    - Prefix trie over the full name and over every word start, so "tata" and "motors"
+      both reach "Tata Motors". Each node stores its top TRIE_NODE_LIMIT rows by market cap.
+    - Trigram inverted index for typo-tolerant matches ("infosis" -> "Infosys",
+      "relaince" -> every "Reliance ..."), used only when the trie yields fewer than
+      `limit` results. A typo is scored against the best-matching words of the name.
+    Results are ranked by match tier (exact > prefix > word prefix > substring > fuzzy),
+    then by market cap.
+    """
+    def __init__(self, names: List[str], market_caps: List[float]):
+        self.names = names
+        self.lower = [n.lower() for n in names]
+        self.caps = [c if c == c else 0.0 for c in market_caps]  # NaN -> 0
+        self._trie: Dict = {}
+        self._trigrams: Dict[str, List[int]] = {}
+        # (row, words per window) -> trigram sets of the name's word windows, filled on first fuzzy use
+        self._window_grams: Dict[Tuple[int, int], List[set]] = {}
+
+        by_cap = sorted(range(len(names)), key=lambda i: -self.caps[i])
+        for row in by_cap:
+            name = self.lower[row]
+            starts = [0] + [i + 1 for i, ch in enumerate(name) if ch == " " and i + 1 < len(name)]
+            for start in starts:
+                self._insert(name[start:], row)
+            for gram in _trigrams(name):
+                self._trigrams.setdefault(gram, []).append(row)
+
+    def _insert(self, key: str, row: int):
+        node = self._trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+            rows = node.setdefault("", [])
+            if len(rows) < TRIE_NODE_LIMIT and (not rows or rows[-1] != row):
+                rows.append(row)
+
+    def _prefix_rows(self, prefix: str) -> List[int]:
+        node = self._trie
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        return node.get("", [])
+
+    def _windows(self, row: int, size: int) -> List[set]:
+        key = (row, size)
+        windows = self._window_grams.get(key)
+        if windows is None:
+            windows = [_trigrams(w) for w in _word_windows(self.lower[row], size)]
+            self._window_grams[key] = windows
+        return windows
+
+    def _tier(self, query: str, row: int) -> int:
+        name = self.lower[row]
+        if name == query:
+            return EXACT
+        if name.startswith(query):
+            return PREFIX
+        if f" {query}" in name:
+            return WORD_PREFIX
+        if query in name:
+            return SUBSTRING
+        return FUZZY
+
+    def search(self, query: str, limit: int = 10) -> List[str]:
+        return [self.names[row] for row, _ in self.search_scored(query, limit)]
+
+    def search_scored(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Returns [(row, score)] best first. Score = tier + a (0, 1) market-cap tiebreak."""
+        query = " ".join(query.lower().split())
+        if not query:
+            return []
+
+        candidates = {row: self._tier(query, row) for row in self._prefix_rows(query)}
+
+        if len(candidates) < limit and len(query) >= 3:
+            # Trigram pass: catches infix substrings beyond the trie and typos.
+            # Counting shared grams is one C-level Counter over the posting lists; the exact
+            # tier test only runs on rows that could be a substring or a close fuzzy match.
+            grams = _trigrams(query)
+            core = _core_trigrams(query)
+            counts = Counter(chain.from_iterable(self._trigrams.get(g, ()) for g in grams))
+            core_counts = Counter(chain.from_iterable(self._trigrams.get(g, ()) for g in core))
+            size = len(query.split())
+            for row, shared in counts.items():
+                if row in candidates:
+                    continue
+                if core_counts.get(row, 0) == len(core):
+                    tier = self._tier(query, row)
+                    if tier != FUZZY:
+                        candidates[row] = tier
+                        continue
+                # Cheap bound first: too few of the query's grams anywhere in the name
+                if shared < FUZZY_MIN_SIMILARITY * len(grams):
+                    continue
+                dice = max(_dice(grams, window) for window in self._windows(row, size))
+                if dice >= FUZZY_MIN_SIMILARITY:
+                    # Better typo matches rank higher among fuzzy hits
+                    candidates[row] = FUZZY + dice - 1
+
+        def score(item):
+            row, tier = item
+            return tier + math.log1p(max(self.caps[row], 0.0)) / 100.0
+
+        ranked = sorted(candidates.items(), key=score, reverse=True)[:limit]
+        return [(row, score((row, tier))) for row, tier in ranked]
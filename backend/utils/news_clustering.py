@@ -0,0 +1,100 @@
+import re
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+# MinHash signature length; the Jaccard estimate's standard error is ~1/sqrt(NUM_PERM)
+NUM_PERM = 64
+# Estimated Jaccard similarity (word unigrams + bigrams) above which two articles are one story
+NEAR_DUPLICATE_SIMILARITY = 0.5
+# Headlines with fewer shingles than this (six words or less) differ by one word in a large share of
+# them ("profit rises" / "profit falls"), so on their own they must be far more alike to merge
+SHORT_TITLE_SHINGLES = 12
+SHORT_TITLE_SIMILARITY = 0.8
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240607)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+def _headline(title: str) -> str:
+    # Aggregators append " - Publisher" to headlines
+    return (title or "").rsplit(" - ", 1)[0]
+
+def headline_key(title: str) -> str:
+    """Lower-case words of the headline without the publisher suffix, for matching echoed titles."""
+    return " ".join(_WORD_RE.findall(_headline(title).lower()))
+
+def _shingles(text: str) -> set:
+    words = _WORD_RE.findall(text.lower())
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+def minhash(text: str) -> np.ndarray:
+    """MinHash signature (NUM_PERM uint64) of the text's word unigrams and bigrams."""
+    shingles = _shingles(text)
+    if not shingles:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    # (a * x + b) mod p: a, x < 2^32 so the product cannot overflow uint64
+    return ((_A[:, None] * (hashes[None, :] % _PRIME) + _B[:, None]) % _PRIME).min(axis=1)
+
+def _similarity(signatures: np.ndarray) -> np.ndarray:
+    """Pairwise estimated Jaccard: share of matching signature slots."""
+    return (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+
+def cluster_articles(articles: List[Dict], threshold: float = NEAR_DUPLICATE_SIMILARITY) -> List[Dict]:
+    """
+    Collapses syndicated rewrites into one representative per story.
+
+    Two articles are the same story when their headlines are near-duplicates (a stricter
+    SHORT_TITLE_SIMILARITY when either headline is short), or when both carry a description
+    and headline + description are near-duplicates. News lists are at
+    most a few hundred items, so all pairs are compared on the signatures in one numpy pass.
+
+    Returns one dict per story in the input order of its representative (input is newest
+    first), each a copy of the representative article (the member with the longest
+    description) plus `cluster_size`, `sources` and `members` (indices into `articles`).
+    """
+    if not articles:
+        return []
+    titles = [_headline(a.get('title')) for a in articles]
+    has_desc = np.array([bool(a.get('description')) for a in articles])
+
+    short = np.array([len(_shingles(t)) < SHORT_TITLE_SHINGLES for t in titles])
+    title_threshold = np.where(short[:, None] | short[None, :], max(threshold, SHORT_TITLE_SIMILARITY), threshold)
+    similar = _similarity(np.stack([minhash(t) for t in titles])) >= title_threshold
+    if has_desc.any():
+        full = np.stack([minhash(f"{t} {a.get('description') or ''}") for t, a in zip(titles, articles)])
+        both = has_desc[:, None] & has_desc[None, :]
+        similar |= both & (_similarity(full) >= threshold)
+
+    # Union-find over the similarity graph
+    parent = list(range(len(articles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(*np.nonzero(np.triu(similar, k=1))):
+        ri, rj = find(int(i)), find(int(j))
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(articles)):
+        groups.setdefault(find(i), []).append(i)
+
+    stories = []
+    for members in groups.values():
+        best = max(members, key=lambda i: (len(articles[i].get('description') or ""), -i))
+        story = dict(articles[best])
+        story['cluster_size'] = len(members)
+        story['sources'] = list(dict.fromkeys(articles[i].get('source') for i in members if articles[i].get('source')))
+        story['members'] = members
+        stories.append(story)
+    stories.sort(key=lambda s: s['members'][0])
+    return stories
@@ -0,0 +1,95 @@
+import os
+import json
+import mmap
+import zlib
+import shutil
+import tempfile
+import logging
+from typing import List, Tuple, Iterator, Optional, Dict, Any
+from backend.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+class PageCacheWriter:
+    """
+    Appends zlib-compressed page records to pages.bin while the document is parsed.
+    The entry becomes visible to readers only when close() publishes index.json.
+    """
+    def __init__(self, entry_dir: str):
+        self.entry_dir = entry_dir
+        # Unique per writer: two jobs parsing the same PDF in one process must not share pages.bin
+        self.tmp_dir = tempfile.mkdtemp(prefix=f"{os.path.basename(entry_dir)}.", suffix=".tmp",
+                                        dir=os.path.dirname(entry_dir))
+        self._bin = open(os.path.join(self.tmp_dir, "pages.bin"), "wb")
+        self.pages = []
+        self.offsets = [0]
+
+    def add(self, page_no: int, text: str, blocks: List[list]):
+        record = json.dumps({"text": text, "blocks": blocks}, separators=(",", ":")).encode("utf-8")
+        payload = zlib.compress(record, 6)
+        self._bin.write(payload)
+        self.pages.append(page_no)
+        self.offsets.append(self.offsets[-1] + len(payload))
+
+    def abort(self):
+        self._bin.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def close(self):
+        self._bin.close()
+        with open(os.path.join(self.tmp_dir, "index.json"), "w", encoding="utf-8") as f:
+            json.dump({"pages": self.pages, "offsets": self.offsets}, f)
+        if os.path.exists(os.path.join(self.entry_dir, "index.json")):
+            # Another writer published the same document first; theirs is equivalent
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+            return
+        try:
+            os.replace(self.tmp_dir, self.entry_dir)
+        except OSError:
+            # Lost the rename race (the entry now exists and is non-empty): a no-op
+            shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+class PageCache:
+    """
+    Per-document cache of extracted page text and layout blocks, keyed by document hash and
+    parser version: CACHE_DIR/pages/<sha256>-v<version>/{pages.bin, index.json}.
+    pages.bin holds one zlib-compressed JSON record per page and is memory-mapped on read,
+    so single pages can be decompressed without loading the whole document.
+    """
+    def __init__(self, doc_hash: str, parser_version: int, cache_dir: str = CACHE_DIR):
+        self.entry_dir = os.path.join(cache_dir, "pages", f"{doc_hash}-v{parser_version}")
+        self._index = None
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.entry_dir, "index.json"))
+
+    def writer(self) -> PageCacheWriter:
+        os.makedirs(os.path.dirname(self.entry_dir), exist_ok=True)
+        return PageCacheWriter(self.entry_dir)
+
+    def _load_index(self) -> Dict[str, Any]:
+        if self._index is None:
+            with open(os.path.join(self.entry_dir, "index.json"), encoding="utf-8") as f:
+                self._index = json.load(f)
+        return self._index
+
+    def page_numbers(self) -> List[int]:
+        return list(self._load_index()["pages"])
+
+    def iter_records(self, pages: Optional[List[int]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yields (page_number, {'text', 'blocks'}) in page order, optionally only for `pages`."""
+        index = self._load_index()
+        offsets = index["offsets"]
+        wanted = set(pages) if pages is not None else None
+        if offsets[-1] == 0:
+            return
+        with open(os.path.join(self.entry_dir, "pages.bin"), "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for i, page_no in enumerate(index["pages"]):
+                    if wanted is not None and page_no not in wanted:
+                        continue
+                    yield page_no, json.loads(zlib.decompress(mm[offsets[i]:offsets[i + 1]]))
+
+    def iter_pages(self) -> Iterator[Tuple[int, str]]:
+        for page_no, record in self.iter_records():
+            yield page_no, record["text"]
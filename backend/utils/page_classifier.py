@@ -0,0 +1,87 @@
+import re
+from typing import Dict
+
+# Page categories, in the order used for tie-breaks (most valuable first)
+FINANCIAL = "financial"
+MDNA = "mdna"
+GOVERNANCE = "governance"
+BOILERPLATE = "boilerplate"
+CATEGORIES = [FINANCIAL, MDNA, GOVERNANCE, BOILERPLATE]
+
+# Pages with less text than this are covers, photo spreads, dividers etc., unless they
+# name financial or MD&A content (a graphics-heavy "Financial Highlights" page)
+MIN_PAGE_CHARS = 300
+
+_KEYWORDS = {
+    FINANCIAL: [
+        "balance sheet", "statement of profit and loss", "profit and loss", "cash flow",
+        "revenue from operations", "total income", "total expenses", "ebitda", "net profit",
+        "profit before tax", "profit after tax", "earnings per share", "total assets",
+        "total equity", "borrowings", "financial highlights", "key financial ratios",
+        "debt equity", "debt to equity", "net worth", "operating margin", "consolidated results",
+    ],
+    MDNA: [
+        "management discussion", "management's discussion", "industry structure", "outlook",
+        "opportunities and threats", "risks and concerns", "risk management", "key risks",
+        "segment", "strategy", "strategic", "growth", "demand", "capex", "capital expenditure",
+        "expansion", "capacity", "guidance", "market share", "new products", "order book",
+    ],
+    GOVERNANCE: [
+        "corporate governance", "board of directors", "audit committee", "nomination and remuneration",
+        "stakeholders relationship committee", "secretarial audit", "independent director",
+        "remuneration policy", "code of conduct", "whistle blower", "vigil mechanism",
+        "related party transactions", "board meetings", "board evaluation",
+    ],
+    BOILERPLATE: [
+        "notice is hereby given", "annual general meeting", "e-voting", "remote e-voting", "proxy",
+        "attendance slip", "route map", "book closure", "green initiative", "scrutinizer",
+        "corporate social responsibility", "csr activities", "csr committee", "beneficiaries",
+        "din:", "directorships", "brief profile", "he holds", "she holds", "photograph",
+        "registered office", "investor service", "unclaimed dividend", "iepf",
+    ],
+}
+
+_PATTERNS = {
+    category: re.compile("|".join(re.escape(k) for k in sorted(words, key=len, reverse=True)))
+    for category, words in _KEYWORDS.items()
+}
+_NUMBER_RE = re.compile(r"\d[\d,]*\.?\d*")
+
+def _keyword_hits(text: str) -> Dict[str, float]:
+    lowered = text.lower()
+    return {category: float(len(pattern.findall(lowered))) for category, pattern in _PATTERNS.items()}
+
+def score_page(text: str) -> Dict[str, float]:
+    """Keyword hit counts per category, plus a numeric-density bonus for financial tables."""
+    scores = _keyword_hits(text)
+
+    numbers = _NUMBER_RE.findall(text)
+    words = max(1, len(text.split()))
+    number_ratio = len(numbers) / words
+    # Statement pages are mostly figures; a third of tokens being numbers is a strong signal
+    if number_ratio > 0.3:
+        scores[FINANCIAL] += 3 + 10 * (number_ratio - 0.3)
+    return scores
+
+def classify_page(text: str) -> str:
+    """
+    Cheap lexical/structural page classifier run before embedding.
+    Returns one of CATEGORIES. Substantive pages with no clear signal default to MD&A
+    (general narrative) so nothing useful is dropped; near-empty pages are boilerplate
+    unless they carry financial or MD&A keywords.
+    """
+    if len(text.strip()) < MIN_PAGE_CHARS:
+        # Keywords only: on a few lines the numeric-density bonus would fire on page numbers
+        hits = _keyword_hits(text)
+        if hits[FINANCIAL] or hits[MDNA]:
+            return FINANCIAL if hits[FINANCIAL] >= hits[MDNA] else MDNA
+        return BOILERPLATE
+
+    scores = score_page(text)
+    best = max(CATEGORIES, key=lambda c: (scores[c], -CATEGORIES.index(c)))
+    if scores[best] < 2:
+        return MDNA
+    # Boilerplate only wins outright; a notice page that quotes results is still worth keeping
+    if best == BOILERPLATE and scores[BOILERPLATE] < 1.5 * max(scores[FINANCIAL], scores[MDNA]):
+        return FINANCIAL if scores[FINANCIAL] >= scores[MDNA] else MDNA
+    return best
@@ -1,30 +1,248 @@
 import pdfplumber
 import os
+import tempfile
+import re
+import json
+import hashlib
 import logging
-from typing import List, Dict, Any
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Tuple, Iterator, Optional
+from backend.config import PDF_EXTRACT_WORKERS, CACHE_DIR, PAGE_CACHE
+from backend.utils.page_cache import PageCache
 
 logger = logging.getLogger(__name__)
 
+# Bump when page text/block extraction changes so cached pages are re-parsed
+PARSER_VERSION = 1
+
+# Below this many pages the pool's IPC/startup overhead outweighs the parallel speedup
+PARALLEL_MIN_PAGES = 40
+# Pages per task; small enough to balance uneven pages, big enough to amortize fitz.open()
+PAGES_PER_TASK = 25
+# Table detection is ~100x slower per page than text, so table tasks are much smaller
+TABLE_PAGES_PER_TASK = 4
+# Bump when table extraction output changes so stale cache entries are ignored
+TABLE_CACHE_VERSION = 2
+# Height (points) of the band above a table kept as its caption, where "(₹ in Crore)" usually sits
+TABLE_CAPTION_HEIGHT = 80
+
+# Pages mentioning a primary statement are the only ones worth running the table finder on
+TABLE_CANDIDATE_RE = re.compile(
+    r"balance sheet|profit and loss|profit & loss|cash flows?|revenue from operations|total income|"
+    r"total assets|total equity|financial highlights|borrowings",
+    re.IGNORECASE
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _pool_size() -> int:
+    return PDF_EXTRACT_WORKERS or os.cpu_count() or 1
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Shared process pool, created on first use. forkserver avoids forking a threaded (torch) parent."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = _pool_size()
+            methods = multiprocessing.get_all_start_methods()
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        return _executor
+
+def _reset_executor():
+    """Drops a broken pool so the next call starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[Tuple[int, str, List[list]]]:
+    """
+    Worker: opens its own fitz document and extracts pages [start, end) as
+    (page_number, text, blocks). Blocks are [x0, y0, x1, y1, text] text blocks in reading
+    order; the page text is their concatenation (same as page.get_text()). Bad pages are skipped.
+    """
+    import fitz  # PyMuPDF
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for i in range(start, end):
+            try:
+                raw_blocks = doc.load_page(i).get_text("blocks")
+            except Exception as e:
+                logger.warning(f"Skipping page {i+1} of {pdf_path}: {e}")
+                continue
+            blocks = [
+                [round(b[0], 1), round(b[1], 1), round(b[2], 1), round(b[3], 1), b[4]]
+                for b in raw_blocks if b[6] == 0  # 0 = text, 1 = image
+            ]
+            text = "".join(b[4] for b in blocks)
+            if text:
+                pages.append((i + 1, text, blocks))
+    return pages
+
+def _extract_tables_pages(pdf_path: str, page_numbers: List[int], prefilter: bool) -> List[Dict[str, Any]]:
+    """
+    Worker: runs PyMuPDF's table finder on the given 1-based pages.
+    With `prefilter`, pages whose text has no statement keywords are skipped cheaply first.
+    """
+    import fitz  # PyMuPDF
+    tables = []
+    with fitz.open(pdf_path) as doc:
+        for page_no in page_numbers:
+            try:
+                page = doc.load_page(page_no - 1)
+                if prefilter and not TABLE_CANDIDATE_RE.search(page.get_text()):
+                    continue
+                found = page.find_tables()
+            except Exception as e:
+                logger.warning(f"Skipping tables on page {page_no} of {pdf_path}: {e}")
+                continue
+            for t_idx, table in enumerate(found.tables):
+                table_data = table.extract()
+                # Filter out empty or tiny tables (likely noise)
+                if not table_data or len(table_data) < 2:
+                    continue
+                cleaned_table = [
+                    [cell.strip().replace('\n', ' ') if cell else '' for cell in row]
+                    for row in table_data
+                ]
+                top = table.bbox[1]
+                band = fitz.Rect(page.rect.x0, max(page.rect.y0, top - TABLE_CAPTION_HEIGHT), page.rect.x1, top)
+                caption = " ".join(page.get_text("text", clip=band).split()) if band.height > 0 else ""
+                tables.append({'page': page_no, 'table_index': t_idx, 'data': cleaned_table, 'caption': caption})
+    return tables
+
 class PDFParser:
     def __init__(self, pdf_path: str):
         self.pdf_path = pdf_path
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
-    def extract_text(self) -> str:
-        """Extracts full text from PDF using PyMuPDF (extremely fast)."""
+    def document_hash(self) -> str:
+        """SHA-256 of the file contents; identifies the document across uploads and restarts."""
+        if not hasattr(self, "_hash"):
+            digest = hashlib.sha256()
+            with open(self.pdf_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            self._hash = digest.hexdigest()
+        return self._hash
+
+    def page_count(self) -> int:
         import fitz  # PyMuPDF
-        full_text = []
+        with fitz.open(self.pdf_path) as doc:
+            return doc.page_count
+
+    def _iter_parsed(self, n_pages: int) -> Iterator[Tuple[int, str, List[list]]]:
+        """
+        Yields (page_number, text, blocks) of the first `n_pages` pages in page order as soon
+        as each page range is ready. Large documents are split into page ranges across a
+        process pool, with only a bounded window of ranges in flight so memory stays flat
+        for long reports. Unreadable pages are skipped individually.
+        """
+        ranges = [(s, min(s + PAGES_PER_TASK, n_pages)) for s in range(0, n_pages, PAGES_PER_TASK)]
+        if n_pages < PARALLEL_MIN_PAGES or PDF_EXTRACT_WORKERS == 1:
+            for s, e in ranges:
+                yield from _extract_page_range(self.pdf_path, s, e)
+            return
+
+        try:
+            executor = _get_executor()
+        except Exception as e:
+            logger.warning(f"Process pool unavailable ({e}), extracting serially")
+            executor = None
+
+        window = 2 * _pool_size()
+        pending = deque()
+        next_range = 0
+        while next_range < len(ranges) or pending:
+            while executor is not None and next_range < len(ranges) and len(pending) < window:
+                s, e = ranges[next_range]
+                try:
+                    pending.append(((s, e), executor.submit(_extract_page_range, self.pdf_path, s, e)))
+                except Exception as err:
+                    logger.warning(f"Process pool unavailable ({err}), extracting serially")
+                    executor = None
+                    break
+                next_range += 1
+
+            if pending:
+                (s, e), future = pending.popleft()
+                try:
+                    pages = future.result()
+                except Exception as err:
+                    if isinstance(err, BrokenProcessPool):
+                        _reset_executor()
+                    # A crashed range (e.g. broken pool) is retried in-process rather than dropped
+                    logger.warning(f"Page range {s+1}-{e} failed in worker ({err}), retrying serially")
+                    pages = _extract_page_range(self.pdf_path, s, e)
+            else:
+                s, e = ranges[next_range]
+                next_range += 1
+                pages = _extract_page_range(self.pdf_path, s, e)
+            yield from pages
+
+    def page_cache(self) -> PageCache:
+        return PageCache(self.document_hash(), PARSER_VERSION)
+
+    def iter_page_records(self) -> Iterator[Tuple[int, str, List[list]]]:
+        """
+        Yields (page_number, text, blocks). Served from the per-document page cache when
+        this file was parsed before (no PDF parsing at all); otherwise parsed and written
+        through to the cache, which is published only if the document opened and was read
+        to the end (a document that fails to open yields nothing and caches nothing).
+        """
+        cache = self.page_cache() if PAGE_CACHE else None
+        if cache is not None and cache.exists():
+            print(f"[PDF Parser] Page cache hit for {os.path.basename(self.pdf_path)}")
+            for page_no, record in cache.iter_records():
+                yield page_no, record["text"], record["blocks"]
+            return
+
         try:
-            doc = fitz.open(self.pdf_path)
-            for i, page in enumerate(doc):
-                text = page.get_text()
-                if text:
-                    full_text.append(f"--- Page {i+1} ---\n{text}")
-            return "\n\n".join(full_text)
+            n_pages = self.page_count()
         except Exception as e:
-            logger.error(f"Error extracting text from {self.pdf_path}: {e}")
-            return ""
+            logger.error(f"Error opening {self.pdf_path}: {e}")
+            return
+
+        writer = None
+        if cache is not None:
+            try:
+                writer = cache.writer()
+            except Exception as e:
+                logger.warning(f"Page cache unavailable: {e}")
+
+        completed = False
+        try:
+            for page_no, text, blocks in self._iter_parsed(n_pages):
+                if writer is not None:
+                    writer.add(page_no, text, blocks)
+                yield page_no, text, blocks
+            completed = True
+        finally:
+            if writer is not None and completed:
+                writer.close()
+            elif writer is not None:
+                writer.abort()
+
+    def iter_pages(self) -> Iterator[Tuple[int, str]]:
+        """Yields (page_number, text) in page order; see iter_page_records."""
+        for page_no, text, _ in self.iter_page_records():
+            yield page_no, text
+
+    def extract_pages(self) -> List[Tuple[int, str]]:
+        """Returns [(page_number, text)] in page order (see iter_pages)."""
+        return list(self.iter_pages())
+
+    def extract_text(self) -> str:
+        """Extracts full text from PDF using PyMuPDF (extremely fast), parallel across page ranges."""
+        return "\n\n".join(f"--- Page {n} ---\n{text}" for n, text in self.extract_pages())
 
     def extract_tables(self) -> List[Dict[str, Any]]:
         """Extracts all tables with metadata."""
@@ -53,3 +271,67 @@ class PDFParser:
         except Exception as e:
             logger.error(f"Error extracting tables: {e}")
             return []
+
+    def extract_tables_fast(self, candidate_pages: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Same output as extract_tables, using PyMuPDF's table finder instead of pdfplumber, plus
+        each table's `caption` (the text just above it, where the reporting unit is stated).
+        Only candidate pages are scanned: `candidate_pages` if given (e.g. pages the ingestion
+        prefilter tagged as financial), otherwise pages whose text mentions a primary statement.
+        Pages are processed in parallel on the shared pool and results are cached per document hash.
+        """
+        if candidate_pages is not None:
+            candidate_pages = sorted(set(candidate_pages))
+        # The cache is keyed on the caller's argument: a None request resolves to different
+        # candidate lists depending on whether the page cache is warm yet
+        requested = candidate_pages
+        try:
+            cache_path = os.path.join(CACHE_DIR, "tables", f"{self.document_hash()}.json")
+            if os.path.exists(cache_path):
+                with open(cache_path, encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("version") == TABLE_CACHE_VERSION and cached.get("requested", cached.get("candidates")) == requested:
+                    return cached["tables"]
+
+            if candidate_pages is None and PAGE_CACHE and self.page_cache().exists():
+                # Pick candidates from cached text instead of re-reading every page in the workers
+                candidate_pages = [
+                    page_no for page_no, record in self.page_cache().iter_records()
+                    if TABLE_CANDIDATE_RE.search(record["text"])
+                ]
+            prefilter = candidate_pages is None
+            pages = candidate_pages if candidate_pages is not None else list(range(1, self.page_count() + 1))
+            groups = [pages[i:i + TABLE_PAGES_PER_TASK] for i in range(0, len(pages), TABLE_PAGES_PER_TASK)]
+
+            tables = []
+            if len(groups) <= 1 or PDF_EXTRACT_WORKERS == 1:
+                for group in groups:
+                    tables.extend(_extract_tables_pages(self.pdf_path, group, prefilter))
+            else:
+                executor = _get_executor()
+                futures = [executor.submit(_extract_tables_pages, self.pdf_path, g, prefilter) for g in groups]
+                for group, future in zip(groups, futures):
+                    try:
+                        tables.extend(future.result())
+                    except Exception as err:
+                        if isinstance(err, BrokenProcessPool):
+                            _reset_executor()
+                        logger.warning(f"Table pages {group} failed in worker ({err}), retrying serially")
+                        tables.extend(_extract_tables_pages(self.pdf_path, group, prefilter))
+
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Unique temp file per writer, so concurrent jobs on the same PDF never share one
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": TABLE_CACHE_VERSION, "requested": requested,
+                               "candidates": candidate_pages, "tables": tables}, f)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            return tables
+        except Exception as e:
+            logger.error(f"Error extracting tables: {e}")
+            return []
@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 def safe_float(val):
     if val is None or val == '':
@@ -105,3 +106,77 @@ def calculate_normalized_scores_v2(raw_data: Dict[str, Any]) -> Dict[str, float]
         "Dividend Yield": round(dividend_score, 1),
         "Momentum": round(momentum_score, 1)
     }
+
+
+SCORE_DIMENSIONS = ["Growth", "Profitability", "Efficiency", "Valuation", "Dividend Yield", "Momentum"]
+
+def normalize_linear_array(values: np.ndarray, min_val: float, max_val: float) -> np.ndarray:
+    """normalize_linear over an array, with the same arithmetic order (and NaN -> 50)."""
+    scaled = ((values - min_val) / (max_val - min_val)) * 100.0
+    scaled = np.where(values <= min_val, 0.0, np.where(values >= max_val, 100.0, scaled))
+    return np.where(np.isnan(values), 50.0, scaled)
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    # Python's round() rounds the exact binary value; np.round scales by 10 first and can land
+    # on the other side of a .x5 tie, so round per element to stay identical to the scalar path
+    return np.array([round(v, 1) for v in values.tolist()], dtype=np.float64)
+
+def calculate_normalized_scores_batch(roe: np.ndarray, roce: np.ndarray, pe_ratio: np.ndarray,
+                                      industry_pe: np.ndarray, dividend: np.ndarray,
+                                      current_price: np.ndarray, returns_1y: np.ndarray,
+                                      returns_5y: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    calculate_normalized_scores_v2 for a whole universe in one pass, taking the inputs the
+    peer path uses (dividend + current price, no precomputed yield). Returns one float64
+    array per SCORE_DIMENSIONS entry, element-for-element equal to the scalar function.
+    """
+    arrays = [np.asarray(a, dtype=np.float64) for a in
+              (roe, roce, pe_ratio, industry_pe, dividend, current_price, returns_1y, returns_5y)]
+    roe, roce, pe_ratio, industry_pe, dividend, current_price, returns_1y, returns_5y = arrays
+
+    growth = normalize_linear_array(returns_5y, -20, 100)
+    profitability = normalize_linear_array(roe, 0, 30)
+    efficiency = normalize_linear_array(roce, 0, 30)
+
+    # Valuation: same branches as the scalar version; `pe and ind and ind > 0` == pe != 0 and ind > 0
+    has_pe = (pe_ratio != 0) & (industry_pe > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        deviation = np.abs(pe_ratio - industry_pe) / industry_pe * 100
+        valuation = np.maximum(0, 100 - (deviation * 2))
+        valuation = np.where(pe_ratio < industry_pe, np.minimum(100, valuation * 1.1), valuation)
+        dividend_yield = np.where((dividend != 0) & (current_price > 0), (dividend / current_price) * 100, 0.0)
+    fallback = np.where((pe_ratio != 0) & (pe_ratio < 0), 20.0, 50.0)
+    valuation = np.where(has_pe, valuation, fallback)
+
+    dividend_score = normalize_linear_array(dividend_yield, 0, 5)
+    momentum = normalize_linear_array(returns_1y, -50, 100)
+
+    raw = [growth, profitability, efficiency, valuation, dividend_score, momentum]
+    return {name: _round1(values) for name, values in zip(SCORE_DIMENSIONS, raw)}
+
+def industry_percentiles(scores: Dict[str, np.ndarray], industry_keys: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Percentile rank (0-100, ties counted half) of each score within its industry, where an
+    industry is the set of tickers sharing an Industry PE. Rows without one get NaN.
+    """
+    industry_keys = np.asarray(industry_keys, dtype=np.float64)
+    result = {name: np.full(len(industry_keys), np.nan) for name in scores}
+    valid = industry_keys != 0
+    if not valid.any():
+        return result
+
+    # Group rows by industry key once: sort by key, then split at key changes
+    order = np.argsort(industry_keys, kind='stable')
+    order = order[valid[order]]
+    boundaries = np.flatnonzero(np.diff(industry_keys[order])) + 1
+    groups: List[np.ndarray] = np.split(order, boundaries)
+
+    for name, values in scores.items():
+        out = result[name]
+        for rows in groups:
+            group_values = values[rows]
+            ranked = np.sort(group_values)
+            below = np.searchsorted(ranked, group_values, side='left')
+            at_or_below = np.searchsorted(ranked, group_values, side='right')
+            out[rows] = (below + at_or_below) / 2.0 / len(rows) * 100.0
+    return result
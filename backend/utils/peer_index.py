@@ -0,0 +1,160 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+class IndustryPEIndex:
+    """
+    Range index over Industry PE, built once at load time.
+
+    Rows are grouped by their exact Industry PE value (one value per industry in the CSV),
+    each group pre-sorted by market cap descending, and the group keys kept sorted.
+    A peer query is two bisects for the tolerance window, then a lazy k-way merge of the
+    groups inside it that stops as soon as `limit` non-excluded rows are collected.
+    """
+    def __init__(self, industry_pes: List[float], market_caps: List[float], names: List[str]):
+        self.names_lower = [n.lower() for n in names]
+        self.caps = [c if c == c else 0.0 for c in market_caps]  # NaN -> 0
+
+        groups = {}
+        for row, pe in enumerate(industry_pes):
+            if pe != pe or pe == 0:
+                continue  # No industry PE, never a peer (queries with 0 are rejected too)
+            groups.setdefault(pe, []).append(row)
+
+        self.keys = sorted(groups)
+        # Ties on market cap keep CSV order so results are deterministic
+        self.groups = [sorted(groups[k], key=lambda r: (-self.caps[r], r)) for k in self.keys]
+
+    def peers(self, industry_pe: float, limit: int = 5, tolerance: float = 0.1,
+              exclude: Optional[Iterable[str]] = None) -> List[int]:
+        """Row positions with Industry PE within ±tolerance, largest market cap first."""
+        lo = bisect_left(self.keys, industry_pe - tolerance)
+        hi = bisect_right(self.keys, industry_pe + tolerance)
+        if lo >= hi or limit <= 0:
+            return []
+
+        excluded = {n.strip().lower() for n in (exclude or []) if n}
+        window = self.groups[lo:hi]
+        if len(window) == 1:
+            candidates = window[0]
+        else:
+            candidates = heapq.merge(*window, key=lambda r: (-self.caps[r], r))
+
+        rows = []
+        for row in candidates:
+            if self.names_lower[row] in excluded:
+                continue
+            rows.append(row)
+            if len(rows) >= limit:
+                break
+        return rows
+
+# Metrics describing a business for k-NN peers, with their distance weights.
+# Market cap is compared on a log scale.
+KNN_FEATURES = {
+    "PE Ratio": 1.0,
+    "PB Ratio": 1.0,
+    "ROE": 1.0,
+    "ROCE": 1.0,
+    "Dividend": 0.5,
+    "1 Yr Returns": 0.5,
+    "5 Yr Returns": 0.5,
+    "Market Cap (Cr.)": 1.0,
+}
+# Columns where 0 means "not reported" and is imputed instead of used as a value
+KNN_ZERO_IS_MISSING = {"PE Ratio", "PB Ratio", "Market Cap (Cr.)"}
+# Standardized values are clipped so one extreme metric (a PE of 2,000) can't dominate the distance
+KNN_CLIP = 3.0
+
+class MetricKNN:
+    """
+    k-nearest-neighbour peers on a standardized metric matrix, built once per snapshot.
+
+    Industry PE is the only sector signal in the CSV, but as a number it is meaningless (two
+    industries at 34x are not related), so it is used as a category: neighbours come from
+    the target's own Industry PE group first, and other industries only fill the slots
+    the group cannot (or all of them when the target has no Industry PE).
+
+    Each column is centred on its median and scaled by its IQR (robust to the heavy tails
+    in PE/returns), clipped to ±KNN_CLIP, with missing values imputed to 0 (the median).
+    A query is one vectorized weighted squared-distance pass over all rows plus an
+    argpartition; at ~2,800 x 9 that is well under a millisecond, so no tree is needed.
+    """
+    def __init__(self, columns: Dict[str, np.ndarray], names: List[str], industry_pe: Optional[np.ndarray] = None):
+        self.names_lower = [n.lower() for n in names]
+        self.industry = np.zeros(len(names)) if industry_pe is None else np.asarray(industry_pe, dtype=np.float64)
+        features = [c for c in KNN_FEATURES if c in columns]
+        self.features = features
+        self.weights = np.array([KNN_FEATURES[c] for c in features], dtype=np.float64)
+
+        raw = np.column_stack([np.asarray(columns[c], dtype=np.float64) for c in features])
+        for j, col in enumerate(features):
+            if col in KNN_ZERO_IS_MISSING:
+                raw[raw[:, j] == 0, j] = np.nan
+            if col == "Market Cap (Cr.)":
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    raw[:, j] = np.log10(raw[:, j])
+        self.mcap = np.asarray(columns.get("Market Cap (Cr.)", np.zeros(len(names))), dtype=np.float64)
+
+        with np.errstate(all="ignore"):
+            self.center = np.nanmedian(raw, axis=0)
+            q75, q25 = np.nanpercentile(raw, [75, 25], axis=0)
+        scale = q75 - q25
+        self.scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+        self.center = np.where(np.isfinite(self.center), self.center, 0.0)
+        self.missing = np.isnan(raw)
+        self.matrix = self._standardize(raw)
+
+    def _standardize(self, raw: np.ndarray) -> np.ndarray:
+        z = (raw - self.center) / self.scale
+        z = np.clip(z, -KNN_CLIP, KNN_CLIP)
+        return np.where(np.isnan(z), 0.0, z)
+
+    def neighbours(self, row: int, k: int = 5, mcap_band: Optional[float] = 10.0,
+                   exclude: Optional[Iterable[str]] = None) -> List[tuple]:
+        """
+        [(row, distance)] of the k nearest tickers to `row`, in tiers, each closest first:
+        same Industry PE group within the market-cap band, the rest of that group, then
+        other industries within the band. mcap_band is a market-cap multiple of the target
+        (10.0 = from a tenth to ten times its size); None disables the band.
+        """
+        if k <= 0:
+            return []
+        # Metrics the target doesn't report carry no information about it: drop them
+        weights = np.where(self.missing[row], 0.0, self.weights)
+        diff = self.matrix - self.matrix[row]
+        dist = np.sqrt((diff * diff) @ weights)
+        dist[row] = np.inf
+
+        excluded = {n.strip().lower() for n in (exclude or []) if n}
+        if excluded:
+            for i, name in enumerate(self.names_lower):
+                if name in excluded:
+                    dist[i] = np.inf
+        target_cap = self.mcap[row]
+        inside = np.ones(len(dist), dtype=bool)
+        if mcap_band and target_cap > 0:
+            inside = (self.mcap >= target_cap / mcap_band) & (self.mcap <= target_cap * mcap_band)
+
+        finite = np.isfinite(dist)
+        if self.industry[row] == 0:
+            return self._nearest(np.flatnonzero(finite & inside), dist, k)
+        same = self.industry == self.industry[row]
+        found = []
+        # A same-industry company of a very different size is still a better peer than another industry
+        for tier in (same & inside, same & ~inside, ~same & inside):
+            found += self._nearest(np.flatnonzero(finite & tier), dist, k - len(found))
+        return found
+
+    @staticmethod
+    def _nearest(candidates: np.ndarray, dist: np.ndarray, k: int) -> List[tuple]:
+        """[(row, distance)] of the k closest `candidates`, closest first."""
+        if k <= 0:
+            return []
+        if len(candidates) > k:
+            nearest = np.argpartition(dist[candidates], k)[:k]
+            candidates = candidates[nearest]
+        ordered = candidates[np.argsort(dist[candidates], kind="stable")]
+        return [(int(i), float(dist[i])) for i in ordered]
@@ -1,83 +1,319 @@
-import chromadb
-from chromadb.config import Settings
 import os
-from typing import List, Dict
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from chromadb.utils import embedding_functions
-from backend.config import HF_TOKEN
+import queue
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple, Iterable
+from backend.utils.chunking import PageAwareSplitter, dedupe_hits, split_pages
+from backend.config import HF_TOKEN, RAG_BACKEND, RAG_PERSIST_DIR, RAG_FLAT_DTYPE, EMBEDDING_MODEL_DIR, PAGE_PREFILTER
+from backend.utils.page_classifier import classify_page, CATEGORIES, BOILERPLATE, GOVERNANCE, FINANCIAL
+
+EMBEDDING_MODEL_NAME = "all-MiniLM-L6-v2"
+# Max number of distinct query strings whose embeddings are kept in memory (LRU)
+QUERY_CACHE_SIZE = 512
+# Streaming ingestion: chunks embedded/upserted per batch, and max batches buffered ahead of the embedder
+INGEST_BATCH_SIZE = 64
+INGEST_QUEUE_DEPTH = 4
+
+def ensure_local_model(model_dir: str = EMBEDDING_MODEL_DIR):
+    """
+    Returns (model_path, model). Loads the pre-serialized snapshot from `model_dir` if present;
+    otherwise downloads from the hub once and saves the snapshot for the next start.
+    `model` is the loaded SentenceTransformer, or None if only the path was resolved.
+    """
+    if os.path.exists(os.path.join(model_dir, "modules.json")):
+        return model_dir, None
+
+    from sentence_transformers import SentenceTransformer
+    print(f"[RAG] No local snapshot at {model_dir}, downloading {EMBEDDING_MODEL_NAME} from the hub...")
+    model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+    try:
+        model.save(model_dir)
+        print(f"[RAG] Saved model snapshot to {model_dir}")
+        return model_dir, model
+    except Exception as e:
+        # Read-only filesystem etc. -- still usable, just not cached
+        print(f"!!! [RAG] Could not save model snapshot: {e}")
+        return EMBEDDING_MODEL_NAME, model
 
 class FinancialRAG:
-    def __init__(self, persist_dir: str = "chroma_db"):
+    def __init__(self, persist_dir: str = RAG_PERSIST_DIR, backend: str = RAG_BACKEND):
         self.persist_dir = persist_dir
-        
+        self.backend = backend
+
         # Use HuggingFace all-MiniLM-L6-v2 locally via sentence-transformers (Much faster on CPU)
-        print("[RAG] Initializing Local HuggingFace Embedding Model (all-MiniLM-L6-v2)...")
+        print(f"[RAG] Initializing Local HuggingFace Embedding Model ({EMBEDDING_MODEL_NAME}), backend={backend}...")
         # Ensure HF_TOKEN is used if provided, otherwise it will download anonymously
         if HF_TOKEN:
             os.environ["HF_TOKEN"] = HF_TOKEN
-            
-        self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
-        )
-
-        # Initialize Client
-        self.client = chromadb.PersistentClient(path=persist_dir)
-        
-        self.collection = self.client.get_or_create_collection(
-            name="financial_reports",
-            embedding_function=self.embedding_fn
-        )
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200,
-            separators=["\n\n", "\n", ". ", " "]
-        )
-
-    def add_document(self, text: str, company_name: str, report_type: str, doc_id: str):
-        chunks = self.text_splitter.split_text(text)
-        
-        ids = [f"{doc_id}_chunk_{i}" for i in range(len(chunks))]
-        metadatas = [{
-            "company": company_name,
-            "report_type": report_type,
-            "doc_id": doc_id,
-            "chunk_index": i
-        } for i in range(len(chunks))]
-        
-        print(f"[RAG] Adding {len(chunks)} chunks to Vector DB...")
-        self.collection.add(
-            documents=chunks,
-            metadatas=metadatas,
-            ids=ids
-        )
-        print("[RAG] Chunks added successfully.")
+        model_path, model = ensure_local_model()
+
+        if backend == "flat":
+            # Skips the chromadb import + SQLite entirely; vectors live in memory-mapped files
+            from sentence_transformers import SentenceTransformer
+            from backend.utils.vector_index import FlatVectorIndex
+            self.model = model or SentenceTransformer(model_path)
+            self.index = FlatVectorIndex(os.path.join(persist_dir, "flat_index"), dtype=RAG_FLAT_DTYPE)
+        elif backend == "chroma":
+            import chromadb
+            from chromadb.utils import embedding_functions
+            self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
+                model_name=model_path
+            )
+
+            # Initialize Client
+            self.client = chromadb.PersistentClient(path=persist_dir)
+
+            self.collection = self.client.get_or_create_collection(
+                name="financial_reports",
+                embedding_function=self.embedding_fn
+            )
+        else:
+            raise ValueError(f"Unknown RAG backend: {backend} (expected 'chroma' or 'flat')")
+
+        # Query embedding cache: normalized question text -> vector
+        self._query_cache = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self.query_cache_hits = 0
+        self.query_cache_misses = 0
+
+        # Page/heading-aware chunks with no overlap (see backend/utils/chunking.py)
+        self.text_splitter = PageAwareSplitter(chunk_size=1000, min_chunk_size=200)
+
+    def add_document(self, text: str, company_name: str, report_type: str, doc_id: str) -> Dict[str, Any]:
+        return self.add_pages(split_pages(text), company_name, report_type, doc_id)
+
+    def _prefilter_pages(self, pages: Iterable[Tuple[int, str]], categories: Dict[int, str], counts: Dict[str, int]):
+        """Tags each page (see page_classifier) and drops boilerplate before it reaches the embedder."""
+        for page, text in pages:
+            category = classify_page(text) if PAGE_PREFILTER else "unfiltered"
+            counts[category] = counts.get(category, 0) + 1
+            if category == BOILERPLATE:
+                continue
+            categories[page] = category
+            yield page, text
+
+    def add_pages(self, pages: Iterable[Tuple[int, str]], company_name: str, report_type: str, doc_id: str) -> Dict[str, Any]:
+        """
+        Streaming ingestion: a producer thread pulls pages (e.g. PDFParser.iter_pages()) and chunks them
+        into a bounded queue while this thread embeds and upserts batch by batch. Extraction and
+        embedding overlap, and memory is bounded by INGEST_QUEUE_DEPTH batches regardless of report length.
+        Boilerplate pages are skipped before chunking.
+        Returns ingestion stats: {'chunks', 'pages_total', 'pages_embedded', 'page_categories', 'financial_pages'}.
+        """
+        page_categories = {}  # page number -> category, for chunk metadata
+        category_counts = {c: 0 for c in CATEGORIES} if PAGE_PREFILTER else {}
+        pages = self._prefilter_pages(pages, page_categories, category_counts)
+        batches = queue.Queue(maxsize=INGEST_QUEUE_DEPTH)
+        stop = threading.Event()
+        done = object()
+        errors = []
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                batch = []
+                for chunk in self.text_splitter.iter_chunks(pages):
+                    batch.append(chunk)
+                    if len(batch) >= INGEST_BATCH_SIZE:
+                        if not put(batch):
+                            return
+                        batch = []
+                if batch:
+                    put(batch)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                put(done)
+
+        producer = threading.Thread(target=produce, name=f"ingest-{doc_id}", daemon=True)
+        producer.start()
+
+        writer = None
+        if self.backend == "flat":
+            writer = self.index.open_writer(doc_id, company=company_name, report_type=report_type)
+
+        count = 0
+        try:
+            while True:
+                batch = batches.get()
+                if batch is done:
+                    break
+                texts = [c["text"] for c in batch]
+                metadatas = [{
+                    "company": company_name,
+                    "report_type": report_type,
+                    "doc_id": doc_id,
+                    "chunk_index": count + i,
+                    "page": c["page"],
+                    "section": c["section"],
+                    "category": page_categories.get(c["page"], "unfiltered")
+                } for i, c in enumerate(batch)]
+
+                if writer is not None:
+                    writer.append(self._encode(texts), texts, metadatas)
+                else:
+                    self.collection.add(
+                        documents=texts,
+                        metadatas=metadatas,
+                        ids=[f"{doc_id}_chunk_{m['chunk_index']}" for m in metadatas]
+                    )
+                count += len(batch)
+                print(f"[RAG] Embedded {count} chunks so far (through page {batch[-1]['page']})...")
+            if errors:
+                raise errors[0]
+        except Exception:
+            stop.set()
+            if writer is not None:
+                writer.abort()
+            raise
+        finally:
+            stop.set()
+            producer.join(timeout=5)
+
+        if writer is not None:
+            writer.close()
+        pages_total = sum(category_counts.values())
+        stats = {
+            "chunks": count,
+            "pages_total": pages_total,
+            "pages_embedded": pages_total - category_counts.get(BOILERPLATE, 0),
+            "page_categories": category_counts,
+            # Candidate pages for table extraction; None when the prefilter is off (scan everything)
+            "financial_pages": sorted(p for p, c in page_categories.items() if c == FINANCIAL) if PAGE_PREFILTER else None
+        }
+        print(f"[RAG] Added {count} chunks to Vector DB. Pages: {category_counts}")
+        return stats
+
+    def _encode(self, texts: List[str]):
+        if self.backend == "flat":
+            return list(self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True))
+        return list(self.embedding_fn(texts))
+
+    def embed_texts(self, texts: List[str]) -> list:
+        """Embeds texts without the query cache, for one-off bulk text (e.g. news headlines) that would only evict questions."""
+        return self._encode(list(texts)) if texts else []
+
+    @staticmethod
+    def _cache_key(question: str) -> str:
+        # MiniLM is uncased, so case/whitespace variants share one embedding
+        return " ".join(question.lower().split())
+
+    def embed_queries(self, questions: List[str]) -> list:
+        """Embeds questions, serving repeats from the LRU cache and encoding all misses in one batch."""
+        keys = [self._cache_key(q) for q in questions]
+        embeddings = {}
+        with self._query_cache_lock:
+            for key in keys:
+                if key in self._query_cache:
+                    self._query_cache.move_to_end(key)
+                    embeddings[key] = self._query_cache[key]
+        missing = list(dict.fromkeys(k for k in keys if k not in embeddings))
+        if missing:
+            for key, vector in zip(missing, self._encode(missing)):
+                embeddings[key] = vector
+        with self._query_cache_lock:
+            self.query_cache_hits += len(keys) - len(missing)
+            self.query_cache_misses += len(missing)
+            for key in missing:
+                self._query_cache[key] = embeddings[key]
+            while len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return [embeddings[k] for k in keys]
+
+    def search_many(self, questions: List[str], company_name: str, n_results: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Embeds and searches several questions in one pass.
+        Returns per question a list of hits {'document', 'metadata'}, de-duplicated, best first.
+        """
+        if not questions:
+            return []
+        query_embeddings = self.embed_queries(questions)
+        if self.backend == "flat":
+            hits_per_question = self.index.query_many(query_embeddings, n_results=n_results, where={"company": company_name})
+        else:
+            results = self.collection.query(
+                query_embeddings=[[float(x) for x in e] for e in query_embeddings],
+                n_results=n_results,
+                where={"company": company_name}
+            )
+            documents = results['documents'] or [[] for _ in questions]
+            metadatas = results['metadatas'] or [[{} for _ in docs] for docs in documents]
+            hits_per_question = [
+                [{"document": d, "metadata": m or {}} for d, m in zip(docs, metas)]
+                for docs, metas in zip(documents, metadatas)
+            ]
+
+        # Governance pages are kept but down-weighted: they rank after substantive hits (stable sort)
+        hits_per_question = [
+            sorted(dedupe_hits(hits), key=lambda h: h["metadata"].get("category") == GOVERNANCE)
+            for hits in hits_per_question
+        ]
+        for question, hits in zip(questions, hits_per_question):
+            print(f"[RAG] Query: '{question}' for '{company_name}' -> Found {len(hits)} docs.")
+        return hits_per_question
+
+    def retrieve_many(self, questions: List[str], company_name: str, n_results: int = 5) -> List[List[str]]:
+        """Like search_many, but returns only the chunk texts per question."""
+        return [[h["document"] for h in hits] for hits in self.search_many(questions, company_name, n_results)]
+
+    def query_context_many(self, questions: List[str], company_name: str, n_results: int = 5) -> List[str]:
+        return ["\n\n---\n\n".join(docs) for docs in self.retrieve_many(questions, company_name, n_results)]
 
     def query_context(self, question: str, company_name: str, n_results: int = 5) -> str:
-        results = self.collection.query(
-            query_texts=[question],
-            n_results=n_results,
-            where={"company": company_name}
-        )
-        n_found = len(results['documents'][0]) if results['documents'] else 0
-        print(f"[RAG] Query: '{question}' for '{company_name}' -> Found {n_found} docs.")
-        if n_found == 0:
-            return ""
-        
-        docs = results['documents'][0]
-        return "\n\n---\n\n".join(docs)
-    
+        return self.query_context_many([question], company_name, n_results)[0]
+
+    def query_with_sources(self, question: str, company_name: str, n_results: int = 5) -> Tuple[str, List[str]]:
+        """Returns (context, sources) where sources cite the page/section of each retrieved chunk."""
+        hits = self.search_many([question], company_name, n_results)[0]
+        context = "\n\n---\n\n".join(h["document"] for h in hits)
+        sources = []
+        for h in hits:
+            page = h["metadata"].get("page")
+            if page is None:
+                continue
+            section = h["metadata"].get("section")
+            label = f"Page {page}" + (f" - {section}" if section else "")
+            if label not in sources:
+                sources.append(label)
+        return context, sources
+
     def clear_company(self, company_name: str):
         # Basic cleanup if needed
         try:
-            self.collection.delete(where={"company": company_name})
+            if self.backend == "flat":
+                self.index.delete(where={"company": company_name})
+            else:
+                self.collection.delete(where={"company": company_name})
         except:
             pass
 
 _rag_instance = None
+_rag_lock = threading.Lock()
+_rag_status = {"state": "not_started", "error": None}
 
 def get_rag() -> FinancialRAG:
-    """Returns a singleton instance of the FinancialRAG."""
+    """Returns a singleton instance of the FinancialRAG. Concurrent first callers wait for one load."""
     global _rag_instance
     if _rag_instance is None:
-        _rag_instance = FinancialRAG()
+        with _rag_lock:
+            if _rag_instance is None:
+                _rag_status.update(state="loading", error=None)
+                try:
+                    _rag_instance = FinancialRAG()
+                except Exception as e:
+                    _rag_status.update(state="failed", error=str(e))
+                    raise
+                _rag_status["state"] = "ready"
     return _rag_instance
+
+def get_rag_status() -> Dict[str, Any]:
+    """Embedding model state for readiness checks: not_started | loading | ready | failed."""
+    return dict(_rag_status)
@@ -0,0 +1,154 @@
+import re
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from backend.config import TICKER_HISTORY
+from backend.utils.peer_comparison import SCORE_DIMENSIONS
+
+# Screen field -> stocks.csv column. Fields in ZERO_IS_MISSING treat 0 as "no data" (the CSV
+# loader fills blanks with 0), so e.g. `rsi<30` does not match tickers without an RSI.
+COLUMN_FIELDS = {
+    "ltp": "LTP", "change": "Change(%)", "volume": "Volume", "mcap": "Market Cap (Cr.)",
+    "pe": "PE Ratio", "industry_pe": "Industry PE", "high_52w": "52W High", "low_52w": "52W Low",
+    "returns_1m": "1M Returns", "returns_3m": "3M Returns", "returns_1y": "1 Yr Returns",
+    "returns_3y": "3 Yr Returns", "returns_5y": "5 Yr Returns", "pb": "PB Ratio",
+    "dividend": "Dividend", "roe": "ROE", "roce": "ROCE", "eps": "EPS",
+    "dma_50": "50 DMA", "dma_200": "200 DMA", "rsi": "RSI",
+}
+ZERO_IS_MISSING = {"ltp", "mcap", "industry_pe", "high_52w", "low_52w", "dma_50", "dma_200", "rsi"}
+
+# Normalized score fields (0-100), plus `score` = their mean
+SCORE_FIELDS = {name.lower().replace(" ", "_"): name for name in SCORE_DIMENSIONS}
+
+DERIVED_DOCS = {
+    "pe_vs_industry": "PE / Industry PE (below 1 = cheaper than the industry)",
+    "from_52w_high": "% below the 52-week high (negative)",
+    "from_52w_low": "% above the 52-week low",
+    "vs_dma_200": "% above (+) / below (-) the 200 DMA",
+    "score": "mean of the six normalized scores (0-100)",
+    "drawdown_20d": "% below the 20-day high (needs 2+ days of ticker history)",
+    "change_20d": "% LTP change over 20 days (history)",
+    "rsi_change_20d": "RSI change over 20 days (history)",
+    "oversold_days": "consecutive latest days with RSI < 30 (history)",
+}
+
+# Named filter sets for common contrarian setups
+PRESETS = {
+    "oversold_quality": "returns_1m<-10,rsi<30,roe>15",
+    "beaten_down_value": "from_52w_high<-30,pe_vs_industry<0.8,roce>15",
+    "cheap_compounders": "pe_vs_industry<1,returns_5y>50,roe>18",
+}
+
+_CONDITION_RE = re.compile(r"^\s*([a-z0-9_]+)\s*(<=|>=|!=|==|<|>|=)\s*(-?\d+(?:\.\d+)?)\s*$")
+_OPS = {
+    "<": np.less, "<=": np.less_equal, ">": np.greater, ">=": np.greater_equal,
+    "=": np.equal, "==": np.equal, "!=": np.not_equal,
+}
+# Fields always included in results, besides the ones filtered/sorted on
+RESULT_FIELDS = ["score", "ltp", "mcap", "pe", "industry_pe", "roe", "rsi", "returns_1m"]
+
+def parse_filters(expr: str) -> List[Tuple[str, str, float]]:
+    """'returns_1m<-10, rsi<30' -> [('returns_1m', '<', -10.0), ('rsi', '<', 30.0)]"""
+    conditions = []
+    for part in (expr or "").split(","):
+        if not part.strip():
+            continue
+        match = _CONDITION_RE.match(part.lower())
+        if not match:
+            raise ValueError(f"Invalid filter '{part.strip()}'. Use field<op>number, e.g. rsi<30")
+        field, op, value = match.groups()
+        conditions.append((field, op, float(value)))
+    return conditions
+
+class Screener:
+    """
+    Vectorized filters and rankings over one ticker snapshot. Every field is a float64
+    array aligned with the snapshot's rows (NaN = no data), built once per snapshot;
+    a screen is a few boolean masks and one argsort over ~2,800 rows.
+    """
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        store = snapshot.store
+        self.fields: Dict[str, np.ndarray] = {}
+
+        for field, column in COLUMN_FIELDS.items():
+            if not store.has_column(column):
+                continue
+            values = store.array(column)
+            if field in ZERO_IS_MISSING:
+                values = np.where(values == 0, np.nan, values)
+            self.fields[field] = values
+
+        for field, dimension in SCORE_FIELDS.items():
+            self.fields[field] = snapshot.scores[dimension]
+        self.fields["score"] = np.mean([snapshot.scores[d] for d in SCORE_DIMENSIONS], axis=0)
+
+        f = self.fields
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if "pe" in f and "industry_pe" in f:
+                # Loss makers (PE <= 0) have no meaningful relative valuation
+                f["pe_vs_industry"] = np.where(f["pe"] > 0, f["pe"] / f["industry_pe"], np.nan)
+            if "ltp" in f and "high_52w" in f:
+                f["from_52w_high"] = (f["ltp"] / f["high_52w"] - 1) * 100
+            if "ltp" in f and "low_52w" in f:
+                f["from_52w_low"] = (f["ltp"] / f["low_52w"] - 1) * 100
+            if "ltp" in f and "dma_200" in f:
+                f["vs_dma_200"] = (f["ltp"] / f["dma_200"] - 1) * 100
+
+        # Trajectory fields from the daily history, once at least two days are recorded
+        if TICKER_HISTORY:
+            from backend.utils.ticker_history import get_ticker_history
+            f.update(get_ticker_history().features_for(store.names))
+
+    def describe(self) -> Dict[str, str]:
+        docs = {field: COLUMN_FIELDS[field] for field in COLUMN_FIELDS if field in self.fields}
+        docs.update({field: f"{dim} score (0-100)" for field, dim in SCORE_FIELDS.items()})
+        docs.update({field: text for field, text in DERIVED_DOCS.items() if field in self.fields})
+        return docs
+
+    def _field(self, name: str) -> np.ndarray:
+        values = self.fields.get(name)
+        if values is None:
+            raise ValueError(f"Unknown field '{name}'. Available: {', '.join(sorted(self.fields))}")
+        return values
+
+    def screen(self, filters: str = "", sort: str = "-score", limit: int = 25) -> Dict:
+        """
+        filters: comma-separated conditions, all of which must hold (NaN never matches).
+        sort:    field to rank by; leading '-' for descending (default: strongest score first).
+        """
+        started = time.perf_counter()
+        conditions = parse_filters(filters)
+
+        mask = np.ones(len(self.snapshot.store), dtype=bool)
+        for field, op, value in conditions:
+            with np.errstate(invalid='ignore'):
+                mask &= _OPS[op](self._field(field), value)
+
+        descending = sort.startswith("-")
+        sort_field = sort.lstrip("-+") or "score"
+        key = self._field(sort_field)
+        rows = np.flatnonzero(mask & ~np.isnan(key))
+        order = np.argsort(-key[rows] if descending else key[rows], kind='stable')
+        top = rows[order[:max(0, limit)]]
+
+        shown = list(dict.fromkeys(RESULT_FIELDS + [f for f, _, _ in conditions] + [sort_field]))
+        names = self.snapshot.store.names
+        results = []
+        for row in top.tolist():
+            item = {"name": names[row]}
+            for field in shown:
+                value = self.fields[field][row] if field in self.fields else np.nan
+                item[field] = None if value != value else round(float(value), 2)
+            results.append(item)
+
+        return {
+            "filters": [f"{f}{op}{v:g}" for f, op, v in conditions],
+            "sort": ("-" if descending else "") + sort_field,
+            "matched": int(mask.sum()),
+            "results": results,
+            "snapshot": self.snapshot.version,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
@@ -1,9 +1,81 @@
+import re
 import pandas as pd
 from typing import List, Dict, Optional, Any
 
+# Row labels for the figures FundamentalMetrics needs, most specific first
+REVENUE_LABELS = ["revenue from operations", "net sales", "total revenue", "sales", "total income"]
+PROFIT_LABELS = ["profit for the year", "profit after tax", "net profit", "profit for the period"]
+EQUITY_LABELS = ["total equity", "shareholders' funds", "shareholders funds", "net worth"]
+BORROWING_LABELS = ["borrowings"]
+
+_NUMBER_RE = re.compile(r"^\(?-?[\d,]+(\.\d+)?\)?$")
+# Header cells naming a reporting period: "2024", "31.03.2024", "March 31, 2024", "FY24", "Year ended ..."
+_PERIOD_RE = re.compile(r"\b(19|20)\d{2}\b|\bfy\s?'?\d{2}\b|year ended|as at|as on|current year|previous year")
+_NOTE_RE = re.compile(r"\bnote")
+# Header rows scanned for period / note columns (headers often wrap over two rows)
+HEADER_ROWS = 3
+# Reporting unit in a statement header: "(₹ in Crore)", "Rs. in Lakhs", "` Million" (₹ in a legacy rupee font)
+_UNIT_RE = re.compile(
+    r"(?:₹|`|\brs\.?|\binr|\brupees|\bamount|\bfigures|\bin)\s*(?:in\s+)?(?:₹|`|rs\.?|inr)?\s*"
+    r"(crores?|cr\b|lakhs?|lacs?|millions?|mn\b|billions?|bn\b|thousands?)"
+)
+# Multiplier from each reporting unit to crores
+UNIT_TO_CRORE = {
+    "crore": 1.0, "cr": 1.0, "lakh": 0.01, "lac": 0.01,
+    "million": 0.1, "mn": 0.1, "billion": 100.0, "bn": 100.0, "thousand": 0.0001,
+}
+
+STATEMENT_TYPES = ['balance_sheet', 'income_statement', 'cash_flow']
+
+# keyword -> (statement type, weight). Each keyword counts once per table, so long tables
+# that repeat "profit" on every row don't outrank the real statement.
+STATEMENT_KEYWORDS = {
+    'balance sheet': ('balance_sheet', 5),
+    'total assets': ('balance_sheet', 3),
+    'current assets': ('balance_sheet', 2),
+    'total liabilities': ('balance_sheet', 2),
+    'current liabilities': ('balance_sheet', 2),
+    'total equity': ('balance_sheet', 2),
+    'assets': ('balance_sheet', 1),
+    'liabilities': ('balance_sheet', 1),
+    'borrowings': ('balance_sheet', 1),
+    'profit and loss': ('income_statement', 4),
+    'profit & loss': ('income_statement', 4),
+    'revenue from operations': ('income_statement', 3),
+    'total income': ('income_statement', 2),
+    'total expenses': ('income_statement', 2),
+    'profit before tax': ('income_statement', 2),
+    'earnings per share': ('income_statement', 2),
+    'revenue': ('income_statement', 1),
+    'profit': ('income_statement', 1),
+    'loss': ('income_statement', 1),
+    'cash flow': ('cash_flow', 3),
+    'cash flows': ('cash_flow', 3),
+    'operating activities': ('cash_flow', 3),
+    'investing activities': ('cash_flow', 2),
+    'financing activities': ('cash_flow', 2),
+    'cash and cash equivalents': ('cash_flow', 1),
+    'operating': ('cash_flow', 1),
+}
+# Below this a table is not a candidate for any statement
+MIN_STATEMENT_SCORE = 2
+
+# One compiled alternation scans each table once for every keyword (longest first, so
+# "total assets" is matched as a whole rather than as "assets")
+_KEYWORD_RE = re.compile("|".join(re.escape(k) for k in sorted(STATEMENT_KEYWORDS, key=len, reverse=True)))
+
+def parse_number(cell: str) -> Optional[float]:
+    """Parses report-style figures: '1,23,456.78' -> 123456.78, '(1,000)' -> -1000.0. Non-numbers -> None."""
+    text = (cell or "").strip().replace(" ", "")
+    if not text or not _NUMBER_RE.match(text):
+        return None
+    negative = text.startswith("(") and text.endswith(")")
+    value = float(text.strip("()").replace(",", ""))
+    return -value if negative else value
+
 class FinancialTableExtractor:
-    def clean_dataframe(self, data: List[List[str]]) -> pd.DataFrame:
-        """Converts list of lists to cleaned DataFrame."""
+    def clean_dataframe(self, data: List[List[str]], caption: str = "") -> pd.DataFrame:
+        """Converts list of lists to cleaned DataFrame; `caption` (text above the table) is kept in attrs."""
         if not data:
             return pd.DataFrame()
         
@@ -15,37 +87,43 @@ class FinancialTableExtractor:
         headers = [h if h else f"Col_{i}" for i, h in enumerate(headers)]
         
         df = pd.DataFrame(rows, columns=headers)
+        df.attrs['caption'] = caption or ""
         return df
 
+    def score_table(self, data: List[List[str]]) -> Dict[str, int]:
+        """Keyword score per statement type from one scan over the table's cells."""
+        content = "\n".join(" ".join(cell or "" for cell in row) for row in data).lower()
+        scores = dict.fromkeys(STATEMENT_TYPES, 0)
+        for keyword in set(_KEYWORD_RE.findall(content)):
+            statement, weight = STATEMENT_KEYWORDS[keyword]
+            scores[statement] += weight
+        return scores
+
+    def rank_financial_tables(self, tables: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Scores every table in a single pass and returns, per statement type, the candidate
+        tables ranked best first as {'index', 'page', 'score'}. Each table is a candidate only
+        for its highest-scoring type (ties go to the earlier type in STATEMENT_TYPES).
+        """
+        ranked = {t: [] for t in STATEMENT_TYPES}
+        for idx, table_info in enumerate(tables):
+            scores = self.score_table(table_info['data'])
+            best = max(STATEMENT_TYPES, key=lambda t: (scores[t], -STATEMENT_TYPES.index(t)))
+            if scores[best] >= MIN_STATEMENT_SCORE:
+                ranked[best].append({'index': idx, 'page': table_info.get('page'), 'score': scores[best]})
+        for candidates in ranked.values():
+            # Stable sort: equal scores keep document order (earlier table wins)
+            candidates.sort(key=lambda c: c['score'], reverse=True)
+        return ranked
+
     def identify_financial_tables(self, tables: List[Dict[str, Any]]) -> Dict[str, pd.DataFrame]:
-        """Heuristic to identify key statements."""
-        identified = {
-            'balance_sheet': None,
-            'income_statement': None,
-            'cash_flow': None
+        """Picks the best-ranked table per statement; DataFrames are built only for the winners."""
+        ranked = self.rank_financial_tables(tables)
+        winners = {statement: tables[c[0]['index']] if c else None for statement, c in ranked.items()}
+        return {
+            statement: self.clean_dataframe(table['data'], table.get('caption', "")) if table else None
+            for statement, table in winners.items()
         }
-        
-        for table_info in tables:
-            data = table_info['data']
-            # Flatten to string to search keywords
-            content_str = str(data).lower()
-            
-            df = self.clean_dataframe(data)
-            
-            # Simple keyword scoring
-            if 'balance sheet' in content_str or ('assets' in content_str and 'liabilities' in content_str):
-                if identified['balance_sheet'] is None: # take first match
-                    identified['balance_sheet'] = df
-            
-            elif 'profit' in content_str and 'loss' in content_str and 'revenue' in content_str:
-                if identified['income_statement'] is None:
-                    identified['income_statement'] = df
-            
-            elif 'cash flow' in content_str and 'operating' in content_str:
-                if identified['cash_flow'] is None:
-                    identified['cash_flow'] = df
-                    
-        return identified
 
     def table_to_text(self, df: pd.DataFrame, table_type: str) -> str:
         """Converts table to LLM-readable text."""
@@ -53,3 +131,110 @@ class FinancialTableExtractor:
             return ""
         
         return f"--- {table_type.replace('_', ' ').upper()} ---\n" + df.to_string()
+
+    def _rows(self, df: pd.DataFrame) -> List[List[str]]:
+        return [list(map(str, df.columns))] + [[str(c) for c in row] for row in df.values.tolist()]
+
+    def _columns(self, rows: List[List[str]]) -> Dict[str, List[int]]:
+        """
+        Period and note columns from the header rows. Statements put a "Note No." column
+        between the label and the figures; its small integers must not be read as values.
+        """
+        periods, notes = [], []
+        for row in rows[:HEADER_ROWS]:
+            head = (row[0] if row else "").lower()
+            if any(label in head for label in REVENUE_LABELS + PROFIT_LABELS + EQUITY_LABELS + BORROWING_LABELS):
+                break
+            for i, cell in enumerate(row[1:], 1):
+                text = (cell or "").lower()
+                if _NOTE_RE.search(text):
+                    notes.append(i)
+                elif _PERIOD_RE.search(text) and i not in periods:
+                    periods.append(i)
+        return {"periods": sorted(periods), "notes": notes}
+
+    def _values(self, row: List[str], columns: Dict[str, List[int]]) -> List[float]:
+        """A row's figures, current period first."""
+        if columns["periods"]:
+            cells = [row[i] if i < len(row) else "" for i in columns["periods"]]
+            return [v for v in (parse_number(c) for c in cells) if v is not None]
+        cells = [c for i, c in enumerate(row[1:], 1) if i not in columns["notes"]]
+        values = [(c, parse_number(c)) for c in cells]
+        values = [(c, v) for c, v in values if v is not None]
+        # No labelled header: a leading small bare integer followed by two figures is a note number
+        if len(values) >= 3 and re.fullmatch(r"\d{1,3}", values[0][0].strip()):
+            values = values[1:]
+        return [v for _, v in values]
+
+    def _unit_to_crore(self, df: pd.DataFrame, rows: List[List[str]]) -> Optional[float]:
+        """Multiplier to crores from the unit in the caption or header rows, or None if no unit is stated."""
+        header = " ".join([df.attrs.get('caption', "")] + [" ".join(row) for row in rows[:HEADER_ROWS]])
+        match = _UNIT_RE.search(header.lower())
+        if not match:
+            return None
+        unit = match.group(1).rstrip("s")
+        return UNIT_TO_CRORE.get(unit)
+
+    def _row_values(self, rows: List[List[str]], labels: List[str], exclude: str = None,
+                    columns: Dict[str, List[int]] = None) -> List[float]:
+        """Figures in the first row whose label matches one of `labels` (in priority order)."""
+        columns = columns or self._columns(rows)
+        for label in labels:
+            for row in rows:
+                if not row:
+                    continue
+                head = row[0].lower()
+                if label in head and not (exclude and exclude in head):
+                    values = self._values(row, columns)
+                    if values:
+                        return values
+        return []
+
+    def _borrowings(self, rows: List[List[str]], columns: Dict[str, List[int]]) -> Optional[float]:
+        """Total borrowings for the current period: the total row if there is one, else the sum of the parts."""
+        parts = []
+        for row in rows:
+            head = row[0].lower() if row else ""
+            if not any(label in head for label in BORROWING_LABELS):
+                continue
+            values = self._values(row, columns)
+            if not values:
+                continue
+            if "total" in head:
+                return values[0]
+            # Non-current and current borrowings are separate rows
+            parts.append(values[0])
+        return sum(parts) if parts else None
+
+    def extract_key_figures(self, identified: Dict[str, pd.DataFrame]) -> Dict[str, float]:
+        """
+        Reads revenue, net profit (current and prior year, in crores) and debt-to-equity
+        straight from identified statements. Figures come from the period columns named in
+        the header (Indian reports list the current year first), never the Note column.
+        Revenue and profit are converted from the unit stated in the statement header
+        ("₹ in Lakhs", "₹ Million") and left out when no unit is stated. Only figures
+        actually found are returned.
+        """
+        figures = {}
+        income = identified.get('income_statement')
+        if income is not None and not income.empty:
+            rows = self._rows(income)
+            columns = self._columns(rows)
+            scale = self._unit_to_crore(income, rows)
+            if scale is not None:
+                revenue = self._row_values(rows, REVENUE_LABELS, exclude="other", columns=columns)
+                if len(revenue) >= 2:
+                    figures['revenue_current'], figures['revenue_prior'] = (round(v * scale, 2) for v in revenue[:2])
+                profit = self._row_values(rows, PROFIT_LABELS, exclude="before", columns=columns)
+                if len(profit) >= 2:
+                    figures['profit_current'], figures['profit_prior'] = (round(v * scale, 2) for v in profit[:2])
+
+        balance = identified.get('balance_sheet')
+        if balance is not None and not balance.empty:
+            rows = self._rows(balance)
+            columns = self._columns(rows)
+            equity = self._row_values(rows, EQUITY_LABELS, columns=columns)
+            debt = self._borrowings(rows, columns)
+            if equity and equity[0] > 0 and debt is not None:
+                figures['debt_to_equity'] = round(debt / equity[0], 2)
+        return figures
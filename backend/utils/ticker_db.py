@@ -1,137 +1,461 @@
-import pandas as pd
 import logging
 import os
+import re
+import numpy as np
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from backend.config import TICKER_HISTORY
+from backend.utils.name_search import NameSearchIndex
+from backend.utils.peer_index import IndustryPEIndex, MetricKNN, KNN_FEATURES
+from backend.utils.ticker_store import load_ticker_store, file_hash
+from backend.utils.peer_comparison import calculate_normalized_scores_batch, industry_percentiles
 
 logger = logging.getLogger(__name__)
 
+# Trailing corporate suffixes ignored when matching names ("Infosys Ltd" == "Infosys")
+_SUFFIX_RE = re.compile(r"\b(ltd|limited|pvt|private|inc|corp|corporation|co|company|plc)\b\.?", re.IGNORECASE)
+_PUNCT_RE = re.compile(r"[^a-z0-9&]+")
+
+# Common short forms that are not derivable from the listed names
+COMMON_ALIASES = {
+    "tcs": "Tata Consultancy Services",
+    "sbi": "State Bank of India",
+    "ril": "Reliance Industries",
+    "reliance": "Reliance Industries",
+    "hul": "Hindustan Unilever",
+    "l&t": "Larsen & Toubro",
+    "m&m": "Mahindra & Mahindra",
+    "hcl tech": "HCL Technologies",
+    "airtel": "Bharti Airtel",
+    "ongc": "Oil & Natural Gas Corporation",
+}
+
+# Leading words too generic to stand for one company on their own ("Bank", "The", "India")
+GENERIC_NAME_WORDS = {
+    "the", "india", "indian", "bank", "new", "power", "national", "tata", "state", "general",
+    "united", "hindustan", "bharat", "bharti", "oil", "gas", "steel", "capital", "finance",
+    "global", "international", "industries", "southern", "eastern", "western", "northern",
+    "central", "punjab", "gujarat", "bombay", "delhi", "kerala", "mahindra", "adani", "birla",
+    "jindal", "bajaj", "godrej", "reliance", "aditya", "shree", "sri", "shri", "jai",
+}
+
+def normalize_name(name: str) -> str:
+    """Lowercase, drop Ltd/Limited-style suffixes and punctuation, collapse whitespace."""
+    text = _SUFFIX_RE.sub(" ", str(name).lower())
+    return " ".join(_PUNCT_RE.sub(" ", text).split())
+
+def build_name_index(names: list, caps: list) -> dict:
+    """
+    Builds key -> row position for O(1) lookups. Keys, in precedence order:
+    exact lowercase name, COMMON_ALIASES, normalized name (no Ltd/Limited/punctuation),
+    and the first word of a name -- only when no other listed name starts with that
+    word and it is not in GENERIC_NAME_WORDS, so "Infosys" resolves but "Tata" or
+    "Bank" does not.
+    """
+    # Passes run from lowest to highest precedence; later passes overwrite earlier keys.
+    # Iterating by ascending market cap makes the largest company win within a pass.
+    index = {}
+    by_cap = sorted(range(len(names)), key=lambda i: caps[i])
+    normalized = [normalize_name(name) for name in names]
+    first_words = [key.split()[0] if key else None for key in normalized]
+    counts = {}
+    for word in first_words:
+        if word:
+            counts[word] = counts.get(word, 0) + 1
+    for i, word in enumerate(first_words):
+        if word and counts[word] == 1 and word not in GENERIC_NAME_WORDS:
+            index[word] = i
+    for i in by_cap:
+        if normalized[i]:
+            index[normalized[i]] = i
+
+    lower_to_row = {}
+    for i, name in enumerate(names):
+        lower_to_row.setdefault(name.lower(), i)  # first CSV occurrence wins, as before
+    for alias, target in COMMON_ALIASES.items():
+        row = lower_to_row.get(target.lower())
+        if row is not None:
+            index[alias] = row
+            index[normalize_name(alias)] = row
+    index.update(lower_to_row)
+    return index
+
+def score_universe(store):
+    """
+    Normalized scores for every ticker in one vectorized pass, fed exactly what
+    PeerComparator feeds calculate_normalized_scores_v2 for a CSV peer.
+    Returns ({dimension: array}, {dimension: industry percentile array}).
+    """
+    def col(name):
+        return np.array(store.values(name) if store.has_column(name) else [0.0] * len(store), dtype=np.float64)
+
+    industry_pe = col('Industry PE')
+    scores = calculate_normalized_scores_batch(
+        roe=col('ROE'), roce=col('ROCE'), pe_ratio=col('PE Ratio'), industry_pe=industry_pe,
+        dividend=col('Dividend'), current_price=col('LTP'),
+        returns_1y=col('1 Yr Returns'), returns_5y=col('5 Yr Returns')
+    )
+    return scores, industry_percentiles(scores, industry_pe)
+
+class TickerSnapshot:
+    """
+    One immutable, fully indexed version of the ticker universe. Reloads build a new
+    snapshot off to the side and swap the reference, so a reader holding a snapshot
+    never sees a half-built index. `version` is the source CSV's content hash prefix;
+    `source_mtime` is the CSV's modification time when loading started.
+    """
+    def __init__(self, store, source_path: str, source_mtime: float = None):
+        self.store = store
+        self.source_path = source_path
+        self.source_mtime = source_mtime
+        self.version = store.source_hash[:12]
+        self.loaded_at = time.time()
+
+        names = store.names
+        caps = store.values('Market Cap (Cr.)') if store.has_column('Market Cap (Cr.)') else [0.0] * len(names)
+        self.name_index = build_name_index(names, caps)
+        self.search_index = NameSearchIndex(names, caps)
+        if store.has_column('Industry PE'):
+            self.peer_index = IndustryPEIndex(store.values('Industry PE'), caps, names)
+        else:
+            self.peer_index = None
+        self.knn = MetricKNN(
+            {c: store.array(c) for c in KNN_FEATURES if store.has_column(c)}, names,
+            industry_pe=store.array('Industry PE') if store.has_column('Industry PE') else None
+        )
+        self.scores, self.score_percentiles = score_universe(store)
+        # Derived rows only; filled lazily, never changes what the snapshot answers
+        self._row_cache = {}
+        self._screener = None
+
+    def screener(self):
+        """Screen field arrays for this snapshot, built on first use."""
+        if self._screener is None:
+            from backend.utils.screener import Screener
+            self._screener = Screener(self)
+        return self._screener
+
+    def lookup_row(self, name: str):
+        """Resolves a name/alias to a row position, or None. O(1)."""
+        if not name:
+            return None
+        key = name.strip().lower()
+        row = self.name_index.get(key)
+        if row is None:
+            row = self.name_index.get(normalize_name(key))
+        return row
+
+    def row_dict(self, row: int) -> dict:
+        """Row as dict, converted once and cached; callers get a copy they may mutate."""
+        data = self._row_cache.get(row)
+        if data is None:
+            data = self.store.row(row)
+            self._row_cache[row] = data
+        return dict(data)
+
+    def scores_for(self, row: int) -> dict:
+        return {name: float(values[row]) for name, values in self.scores.items()}
+
+    def percentiles_for(self, row: int) -> dict:
+        """Industry percentile per dimension; empty when the ticker has no Industry PE."""
+        result = {}
+        for name, values in self.score_percentiles.items():
+            value = values[row]
+            if value == value:  # NaN -> no industry
+                result[name] = round(float(value), 1)
+        return result
+
+def build_snapshot(filepath: str):
+    """Loads (or memory-maps from cache) the universe at `filepath` and indexes it."""
+    # Taken before reading, so an edit made while loading still counts as a change
+    mtime = os.path.getmtime(filepath)
+    store = load_ticker_store(filepath)
+    if store is None:
+        return None
+    snapshot = TickerSnapshot(store, filepath, mtime)
+    if TICKER_HISTORY:
+        record_history(store)
+    snapshot.screener()  # warm before the swap so the first /api/screen is fast too
+    return snapshot
+
+def record_history(store):
+    """
+    Appends the universe to the daily history as of today (the ingest date). File mtimes
+    are not used: git checkout, Docker COPY and touch all reset them. Data identical to
+    the last recorded day (a restart or reload of the same CSV) is not recorded again.
+    """
+    try:
+        from backend.utils.ticker_history import get_ticker_history
+        history = get_ticker_history()
+        if history.last_source == store.source_hash:
+            return
+        history.append(date.today(), store)
+    except Exception as e:
+        logger.warning(f"Could not record ticker history: {e}")
+
+# Snapshot pinned for the current job/thread; see TickerDatabase.pin()
+_pinned_snapshot: ContextVar = ContextVar("pinned_ticker_snapshot", default=None)
+
 class TickerDatabase:
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(TickerDatabase, cls).__new__(cls)
-            cls._instance.df = None
+            cls._instance._snapshot = None
+            cls._instance._reload_lock = threading.Lock()
+            cls._instance._watcher = None
+            cls._instance._watcher_stop = threading.Event()
         return cls._instance
 
-    def load_data(self, filepath: str):
-        """Loads and cleans the CSV data into memory."""
+    def snapshot(self):
+        """The snapshot pinned by pin() in this context, else the current one (or None)."""
+        return _pinned_snapshot.get() or self._snapshot
+
+    @contextmanager
+    def pin(self):
+        """
+        Pins the current snapshot for the duration of a job: every lookup made in this
+        context (thread) sees the same universe even if a reload swaps in a new one.
+        """
+        token = _pinned_snapshot.set(self._snapshot)
+        try:
+            yield self._snapshot
+        finally:
+            _pinned_snapshot.reset(token)
+
+    @property
+    def store(self):
+        snapshot = self.snapshot()
+        return None if snapshot is None else snapshot.store
+
+    @property
+    def df(self):
+        """
+        The universe as a pandas DataFrame, built on demand (not kept resident).
+        Lookups go through the columnar store; this is for ad-hoc analysis and scripts.
+        """
+        store = self.store
+        return None if store is None else store.to_frame()
+
+    def load_data(self, filepath: str) -> bool:
+        """
+        Builds a snapshot from `filepath` and swaps it in. The CSV is parsed once per
+        content hash; later boots (and other workers) memory-map the binary cache written
+        by load_ticker_store. On failure the previous snapshot, if any, stays live.
+        """
         if not os.path.exists(filepath):
             logger.error(f"Stock data file not found at: {filepath}")
-            return
+            return False
 
-        try:
-            # Read CSV with flexible encoding
+        with self._reload_lock:
             try:
-                self.df = pd.read_csv(filepath, encoding='utf-8')
-            except UnicodeDecodeError:
-                self.df = pd.read_csv(filepath, encoding='latin1')
-            
-            # Clean column names
-            self.df.columns = self.df.columns.str.strip()
-            
-            # Ensure required columns
-            if 'Name' not in self.df.columns:
-                logger.error("CSV missing required 'Name' column.")
-                self.df = None
-                return
-
-            # Clean Name column
-            self.df['Name'] = self.df['Name'].astype(str).str.strip()
-            
-            # Numeric cleaning for all metric columns
-            # We explicitly clean these columns to be usable floats
-            numeric_cols = [
-                'LTP', 'Change(%)', 'Open', 'Volume', 'Market Cap (Cr.)', 
-                'PE Ratio', 'Industry PE', '52W High', '52W Low', 
-                '1M Returns', '3M Returns', '1 Yr Returns', '3 Yr Returns', '5 Yr Returns',
-                'PB Ratio', 'Dividend', 'ROE', 'ROCE', 'EPS', 
-                '50 DMA', '200 DMA', 'RSI', 'Margin Funding', 'Margin Pledge'
-            ]
-            
-            for col in numeric_cols:
-                if col in self.df.columns:
-                    # Remove commas, %, and whitespace, then coerce to numeric
-                    # Force string conversion first to handle mixed types safely
-                    self.df[col] = (
-                        self.df[col]
-                        .astype(str)
-                        .str.replace(',', '', regex=False)
-                        .str.replace('%', '', regex=False)
-                        .str.strip()
-                    )
-                    self.df[col] = pd.to_numeric(self.df[col], errors='coerce').fillna(0.0)
-
-            logger.info(f"Loaded {len(self.df)} tickers from {filepath}")
-            
-        except Exception as e:
-            logger.error(f"Failed to load stock data: {e}")
-            self.df = None
+                snapshot = build_snapshot(filepath)
+            except Exception as e:
+                logger.error(f"Failed to load stock data: {e}")
+                return False
+            if snapshot is None:
+                return False
+
+            previous = self._snapshot
+            self._snapshot = snapshot  # single reference assignment: readers see old or new, never a mix
+            source = "binary cache" if snapshot.store.from_cache else filepath
+            if previous is None:
+                logger.info(f"Loaded {len(snapshot.store)} tickers from {source} (snapshot {snapshot.version})")
+            else:
+                logger.info(f"Swapped ticker snapshot {previous.version} -> {snapshot.version} ({len(snapshot.store)} tickers)")
+            return True
+
+    def reload(self, force: bool = False) -> dict:
+        """
+        Rebuilds from the current snapshot's source file if its contents changed
+        (or always, with force). Safe to call from any thread.
+        """
+        current = self._snapshot
+        if current is None:
+            return {"reloaded": False, "reason": "not loaded", **self.status()}
+        path = current.source_path
+        if not os.path.exists(path):
+            return {"reloaded": False, "reason": f"source missing: {path}", **self.status()}
+        if not force and file_hash(path) == current.store.source_hash:
+            return {"reloaded": False, "reason": "unchanged", **self.status()}
+        reloaded = self.load_data(path)
+        return {"reloaded": reloaded, "reason": None if reloaded else "load failed", **self.status()}
+
+    def start_watcher(self, interval: float):
+        """Polls the source file's mtime every `interval` seconds and reloads on change."""
+        if self._watcher is not None or interval <= 0:
+            return
+        self._watcher_stop.clear()
+
+        def watch():
+            last_mtime = None
+            while not self._watcher_stop.wait(interval):
+                snapshot = self._snapshot
+                if snapshot is None:
+                    continue
+                if last_mtime is None:
+                    # Compare against the file as loaded, so an edit before the first tick is seen
+                    last_mtime = snapshot.source_mtime
+                try:
+                    mtime = os.path.getmtime(snapshot.source_path)
+                except OSError:
+                    continue
+                if last_mtime is not None and mtime != last_mtime:
+                    try:
+                        self.reload()
+                    except Exception as e:
+                        logger.error(f"Ticker reload failed: {e}")
+                last_mtime = mtime
+
+        self._watcher = threading.Thread(target=watch, name="ticker-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self):
+        if self._watcher is not None:
+            self._watcher_stop.set()
+            self._watcher = None
 
     def search_names(self, query: str, limit: int = 10):
-        """Searches for company names containing the query string (case-insensitive)."""
-        if self.df is None or not query:
+        """
+        Autocomplete: company names ranked by match quality (exact > prefix > word prefix >
+        substring > typo-tolerant) and then market cap. See NameSearchIndex.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None or not query:
             return []
-        
+
         try:
-            mask = self.df['Name'].str.contains(query, case=False, na=False)
-            matches = self.df.loc[mask, 'Name'].head(limit).tolist()
-            return matches
+            return snapshot.search_index.search(query, limit)
         except Exception as e:
             logger.error(f"Error filtering names: {e}")
             return []
 
     def validate_name(self, name: str) -> bool:
-        """Checks if a company name exists in the database (exact match, case-insensitive)."""
-        if self.df is None or not name:
-            return False
-        
-        mask = self.df['Name'].str.lower() == name.strip().lower()
-        return mask.any()
+        """Checks if a company name (or known alias) exists in the database, case-insensitive."""
+        snapshot = self.snapshot()
+        return snapshot is not None and snapshot.lookup_row(name) is not None
+
+    def resolve_name(self, name: str):
+        """Returns the canonical listed name for a name or alias, or None."""
+        snapshot = self.snapshot()
+        row = None if snapshot is None else snapshot.lookup_row(name)
+        return None if row is None else snapshot.store.names[row]
 
     def get_company_details(self, name: str) -> dict:
-        """Returns the full row of data for a given company name."""
-        if self.df is None or not name:
+        """Returns the full row of data for a given company name or alias."""
+        snapshot = self.snapshot()
+        row = None if snapshot is None else snapshot.lookup_row(name)
+        if row is None:
             return None
-        
+
         try:
-            # Case-insensitive exact match
-            row = self.df[self.df['Name'].str.lower() == name.strip().lower()]
-            if row.empty:
-                return None
-            
-            # Convert to dictionary and handle Nan/Inf for JSON serialization
-            data = row.iloc[0].to_dict()
-            return data
+            return snapshot.row_dict(row)
         except Exception as e:
             logger.error(f"Error getting details for {name}: {e}")
             return None
 
-    def get_peers_by_industry(self, industry_pe: float, exclude_name: str, limit: int = 5) -> list:
+    def get_peers_by_industry(self, industry_pe: float, exclude_name: str, limit: int = 5,
+                              tolerance: float = 0.1, exclude: list = None) -> list:
         """
-        Finds peers with the same or similar Industry PE.
+        Finds peers with the same or similar Industry PE, largest market cap first.
         This uses the logic: Same Industry PE = Same Sector/Industry.
+        `tolerance` widens the Industry PE window; `exclude` drops further names
+        (e.g. competitors already picked) before the top `limit` are taken.
         """
-        if self.df is None or industry_pe == 0:
+        snapshot = self.snapshot()
+        if snapshot is None or snapshot.peer_index is None or industry_pe == 0:
             return []
         
         try:
-            # Filter by matching Industry PE
-            # Using a small tolerance just in case of float weirdness, though exact match is requested
-            peers = self.df[
-                (self.df['Industry PE'] >= industry_pe - 0.1) & 
-                (self.df['Industry PE'] <= industry_pe + 0.1) &
-                (self.df['Name'].str.lower() != exclude_name.lower())
-            ]
-            
-            # Use 'Market Cap (Cr.)' for sorting if available, else random slice
-            if 'Market Cap (Cr.)' in self.df.columns:
-                peers = peers.sort_values(by='Market Cap (Cr.)', ascending=False)
-
-            return peers.head(limit).to_dict('records')
+            # Resolve aliases so "TCS" also excludes "Tata Consultancy Services"
+            excluded = []
+            for n in [exclude_name] + list(exclude or []):
+                if n:
+                    row = snapshot.lookup_row(n)
+                    excluded.append(n if row is None else snapshot.store.names[row])
+            rows = snapshot.peer_index.peers(industry_pe, limit=limit, tolerance=tolerance, exclude=excluded)
+            return [snapshot.row_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error finding peers: {e}")
             return []
 
+    def get_similar_peers(self, name: str, limit: int = 5, mcap_band: float = 10.0, exclude: list = None) -> list:
+        """
+        Nearest tickers to `name` on standardized valuation/return/size metrics (see MetricKNN):
+        its own Industry PE group first (within the market-cap band, then outside it), other
+        industries in the band only for the remaining slots or when Industry PE is missing.
+        Each row carries its 'Peer Distance'.
+        """
+        snapshot = self.snapshot()
+        row = None if snapshot is None else snapshot.lookup_row(name)
+        if row is None:
+            return []
+
+        try:
+            excluded = []
+            for n in exclude or []:
+                if n:
+                    r = snapshot.lookup_row(n)
+                    excluded.append(n if r is None else snapshot.store.names[r])
+            peers = []
+            for peer_row, distance in snapshot.knn.neighbours(row, k=limit, mcap_band=mcap_band, exclude=excluded):
+                data = snapshot.row_dict(peer_row)
+                data['Peer Distance'] = round(distance, 3)
+                peers.append(data)
+            return peers
+        except Exception as e:
+            logger.error(f"Error finding similar peers: {e}")
+            return []
+
+    def get_normalized_scores(self, name: str):
+        """Precomputed radar-chart scores (see calculate_normalized_scores_v2), or None."""
+        snapshot = self.snapshot()
+        row = None if snapshot is None else snapshot.lookup_row(name)
+        return None if row is None else snapshot.scores_for(row)
+
+    def get_industry_percentiles(self, name: str):
+        """Percentile of each normalized score among same-Industry-PE tickers, or None."""
+        snapshot = self.snapshot()
+        row = None if snapshot is None else snapshot.lookup_row(name)
+        return None if row is None else snapshot.percentiles_for(row)
+
+    def get_history_features(self, name: str) -> dict:
+        """Drawdown / RSI-trajectory features from the daily history; {} until 2+ days are recorded."""
+        snapshot = self.snapshot()
+        row = None if snapshot is None else snapshot.lookup_row(name)
+        if row is None or not TICKER_HISTORY:
+            return {}
+        from backend.utils.ticker_history import get_ticker_history
+        return get_ticker_history().ticker_features(snapshot.store.names[row])
+
+    def screen(self, filters: str = "", sort: str = "-score", limit: int = 25) -> dict:
+        """
+        Filters and ranks the whole universe, e.g. filters="returns_1m<-10,rsi<30,roe>15".
+        Raises ValueError for unknown fields or malformed conditions.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            raise RuntimeError("Ticker database not loaded")
+        return snapshot.screener().screen(filters, sort, limit)
+
+    def status(self) -> dict:
+        """Load state for readiness checks."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {"loaded": False, "tickers": 0}
+        return {
+            "loaded": True,
+            "tickers": len(snapshot.store),
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at,
+            "from_cache": snapshot.store.from_cache,
+            "numeric_bytes": snapshot.store.nbytes()
+        }
+
 # Global instance accessor
 def get_ticker_db():
     return TickerDatabase()
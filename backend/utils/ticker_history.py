@@ -0,0 +1,265 @@
+import os
+import sys
+import json
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from backend.config import TICKER_HISTORY_DIR
+from backend.utils.ticker_store import NUMERIC_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+HISTORY_VERSION = 1
+# Trading days looked back by the derived features (drawdown_20d, ...)
+HISTORY_FEATURE_WINDOW = 20
+# RSI below this counts as oversold for oversold_days
+OVERSOLD_RSI = 30
+
+class TickerHistory:
+    """
+    Append-only daily history of the ticker universe, one float32 file per metric.
+
+    Each recorded day appends one block per metric holding a value for every ticker id
+    known so far (ids are assigned on first sight and never reused, so blocks only grow).
+    index.json keeps dates, block offsets and the ticker table; it is replaced atomically
+    after the blocks are written, so a crash mid-append leaves the previous days intact
+    (stray bytes past the last offset are truncated on the next append).
+
+    Reads memory-map the metric files; a (date range, ticker) query is one fancy index
+    into the map, and a window over the whole universe is N contiguous slices.
+    """
+    def __init__(self, root: str = TICKER_HISTORY_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._maps: Dict[int, np.ndarray] = {}
+        self._features_cache: Dict[int, Tuple[int, Dict[str, np.ndarray]]] = {}
+        self._load_index()
+
+    # --- Index ---
+
+    def _index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    def _load_index(self):
+        path = self._index_path()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        else:
+            self.index = {"version": HISTORY_VERSION, "columns": list(NUMERIC_COLUMNS),
+                          "tickers": [], "dates": [], "offsets": [0]}
+        self._ids = {name: i for i, name in enumerate(self.index["tickers"])}
+        self._col_pos = {c: i for i, c in enumerate(self.index["columns"])}
+
+    def _write_index(self):
+        tmp = f"{self._index_path()}.tmp{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self._index_path())
+
+    @property
+    def dates(self) -> List[str]:
+        return list(self.index["dates"])
+
+    @property
+    def last_source(self) -> Optional[str]:
+        """Source hash of the latest recorded day, or None."""
+        sources = self.index.get("sources") or []
+        return sources[-1] if sources and len(sources) == len(self.index["dates"]) else None
+
+    def __len__(self) -> int:
+        return len(self.index["dates"])
+
+    def _column_file(self, col_pos: int) -> str:
+        return os.path.join(self.root, f"c{col_pos:02d}.f32")
+
+    # --- Writing ---
+
+    def append(self, day: date, store) -> bool:
+        """
+        Records `store` (a TickerStore) as the universe on `day`. Days must be appended in
+        order; re-recording the latest day replaces it (a corrected file for the same date).
+        Returns False if `day` is already recorded with identical source data.
+        """
+        iso = day.isoformat()
+        with self._lock:
+            dates, offsets = self.index["dates"], self.index["offsets"]
+            if dates and iso < dates[-1]:
+                raise ValueError(f"History is append-only: {iso} is before last recorded day {dates[-1]}")
+            sources = self.index.setdefault("sources", [])
+            if dates and iso == dates[-1]:
+                if sources and sources[-1] == store.source_hash:
+                    return False
+                dates.pop()
+                offsets.pop()
+                if sources:
+                    sources.pop()
+
+            ids = []
+            for name in store.names:
+                tid = self._ids.get(name)
+                if tid is None:
+                    tid = len(self.index["tickers"])
+                    self.index["tickers"].append(name)
+                    self._ids[name] = tid
+                ids.append(tid)
+            ids = np.array(ids, dtype=np.int64)
+            width = len(self.index["tickers"])
+
+            os.makedirs(self.root, exist_ok=True)
+            end = offsets[-1] * 4
+            for column, pos in self._col_pos.items():
+                block = np.full(width, np.nan, dtype=np.float32)
+                if store.has_column(column):
+                    block[ids] = store.column(column)
+                with open(self._column_file(pos), "ab") as f:
+                    f.truncate(end)
+                    f.write(block.tobytes())
+
+            dates.append(iso)
+            offsets.append(offsets[-1] + width)
+            sources.append(store.source_hash)
+            self._write_index()
+            self._maps = {}
+            self._features_cache = {}
+        logger.info(f"Recorded {len(store)} tickers for {iso} ({len(dates)} days of history)")
+        return True
+
+    # --- Reading ---
+
+    def _data(self, column: str) -> np.ndarray:
+        pos = self._col_pos.get(column)
+        if pos is None:
+            raise KeyError(f"Column not tracked in history: {column}")
+        data = self._maps.get(pos)
+        if data is None:
+            total = self.index["offsets"][-1]
+            if total == 0:
+                data = np.zeros(0, dtype=np.float32)
+            else:
+                data = np.memmap(self._column_file(pos), dtype=np.float32, mode="r", shape=(total,))
+            self._maps[pos] = data
+        return data
+
+    def series(self, name: str, column: str, start: Optional[str] = None,
+               end: Optional[str] = None) -> Tuple[List[str], np.ndarray]:
+        """(dates, values) for one ticker between ISO dates start..end inclusive; NaN = not listed."""
+        dates = self.index["dates"]
+        lo = 0 if start is None else bisect_left(dates, start)
+        hi = len(dates) if end is None else bisect_right(dates, end)
+        tid = self._ids.get(name)
+        values = np.full(max(0, hi - lo), np.nan, dtype=np.float32)
+        if tid is None or hi <= lo:
+            return dates[lo:hi], values
+
+        offsets = np.asarray(self.index["offsets"], dtype=np.int64)
+        starts = offsets[lo:hi]
+        present = tid < (offsets[lo + 1:hi + 1] - starts)
+        values[present] = self._data(column)[starts[present] + tid]
+        return dates[lo:hi], values
+
+    def window(self, column: str, days: int) -> np.ndarray:
+        """Last `days` recorded days of `column` for every ticker id: shape (days, n_tickers)."""
+        offsets = self.index["offsets"]
+        days = min(days, len(self.index["dates"]))
+        width = len(self.index["tickers"])
+        out = np.full((days, width), np.nan, dtype=np.float32)
+        data = self._data(column)
+        first = len(self.index["dates"]) - days
+        for i in range(days):
+            a, b = offsets[first + i], offsets[first + i + 1]
+            out[i, :b - a] = data[a:b]
+        return out
+
+    # --- Features ---
+
+    def features(self, window: int = HISTORY_FEATURE_WINDOW) -> Dict[str, np.ndarray]:
+        """
+        History-aware features per ticker id, over the last `window` days (plus today):
+          drawdown_{w}d   % below the highest LTP in the window (0 = at the high)
+          change_{w}d     % LTP change from the start of the window
+          rsi_change_{w}d RSI points gained/lost over the window
+          oversold_days   consecutive latest days with RSI < OVERSOLD_RSI (a new panic is small)
+        Empty until at least two days are recorded.
+        """
+        n_days = len(self.index["dates"])
+        cached = self._features_cache.get(window)
+        if cached is not None and cached[0] == n_days:
+            return cached[1]
+        if n_days < 2:
+            return {}
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ltp = self.window("LTP", window + 1).astype(np.float64)
+            ltp[ltp == 0] = np.nan  # 0 = blank in the source CSV
+            last = ltp[-1]
+            first = ltp[0]
+            peak = np.nanmax(np.where(np.isnan(ltp), -np.inf, ltp), axis=0)
+            peak[np.isinf(peak)] = np.nan
+
+            rsi = self.window("RSI", window + 1).astype(np.float64)
+            rsi[rsi == 0] = np.nan
+            oversold = np.nan_to_num(rsi, nan=100.0) < OVERSOLD_RSI
+            # Count trailing True values: cumulative product from the latest day backwards
+            streak = np.cumprod(oversold[::-1], axis=0).sum(axis=0).astype(np.float64)
+            streak[np.isnan(rsi[-1])] = np.nan
+
+            feats = {
+                f"drawdown_{window}d": (last / peak - 1) * 100,
+                f"change_{window}d": (last / first - 1) * 100,
+                f"rsi_change_{window}d": rsi[-1] - rsi[0],
+                "oversold_days": streak,
+            }
+        self._features_cache[window] = (n_days, feats)
+        return feats
+
+    def features_for(self, names: List[str], window: int = HISTORY_FEATURE_WINDOW) -> Dict[str, np.ndarray]:
+        """features() re-aligned to `names` (e.g. a snapshot's rows); NaN for untracked tickers."""
+        feats = self.features(window)
+        if not feats:
+            return {}
+        ids = np.array([self._ids.get(n, -1) for n in names], dtype=np.int64)
+        known = ids >= 0
+        aligned = {}
+        for key, values in feats.items():
+            out = np.full(len(names), np.nan)
+            out[known] = values[ids[known]]
+            aligned[key] = out
+        return aligned
+
+    def ticker_features(self, name: str, window: int = HISTORY_FEATURE_WINDOW) -> Dict[str, Optional[float]]:
+        feats = self.features(window)
+        tid = self._ids.get(name)
+        if not feats or tid is None:
+            return {}
+        return {k: (None if v[tid] != v[tid] else round(float(v[tid]), 2)) for k, v in feats.items()}
+
+_history = None
+_history_lock = threading.Lock()
+
+def get_ticker_history() -> TickerHistory:
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = TickerHistory()
+    return _history
+
+if __name__ == "__main__":
+    # Backfill: python -m backend.utils.ticker_history 2025-01-02=path/to/stocks.csv [...]
+    from backend.utils.ticker_store import load_ticker_store
+    logging.basicConfig(level=logging.INFO)
+    history = get_ticker_history()
+    for arg in sorted(sys.argv[1:]):
+        day, _, path = arg.partition("=")
+        store = load_ticker_store(path)
+        if store is None:
+            print(f"[Ticker History] Skipping unreadable {path}")
+            continue
+        history.append(date.fromisoformat(day), store)
+    print(f"[Ticker History] {len(history)} days recorded in {history.root}")
@@ -0,0 +1,203 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from backend.config import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cleaning rules or on-disk layout change; old cache entries are then ignored
+TICKER_STORE_VERSION = 1
+
+# Metric columns cleaned to floats; everything else (Name, Screener URL, ...) stays text
+NUMERIC_COLUMNS = [
+    'LTP', 'Change(%)', 'Open', 'Volume', 'Market Cap (Cr.)',
+    'PE Ratio', 'Industry PE', '52W High', '52W Low',
+    '1M Returns', '3M Returns', '1 Yr Returns', '3 Yr Returns', '5 Yr Returns',
+    'PB Ratio', 'Dividend', 'ROE', 'ROCE', 'EPS',
+    '50 DMA', '200 DMA', 'RSI', 'Margin Funding', 'Margin Pledge'
+]
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _clean_array(values: np.ndarray) -> np.ndarray:
+    """float32 -> float64 without float32 noise (1559.2, not 1559.199951171875)."""
+    return values.astype(str).astype(np.float64)
+
+def _clean_floats(values: np.ndarray) -> List[float]:
+    return _clean_array(values).tolist()
+
+class TickerStore:
+    """
+    Cleaned ticker universe in columnar form.
+
+    numeric: float32 matrix of shape (n_numeric_columns, n_rows), one contiguous row per
+    metric, memory-mapped read-only when loaded from cache so workers share the pages.
+    names:   interned company names, in CSV order (row position == index everywhere).
+    text:    the remaining string columns (e.g. Screener URL), in CSV order.
+    """
+    def __init__(self, columns: List[str], numeric_columns: List[str], numeric: np.ndarray,
+                 names: List[str], text: Dict[str, List[Optional[str]]], source_hash: str = ""):
+        self.columns = columns
+        self.numeric_columns = numeric_columns
+        self.numeric = numeric
+        self.names = [sys.intern(n) for n in names]
+        self.text = text
+        self.source_hash = source_hash
+        self.from_cache = False
+        self._numeric_pos = {c: i for i, c in enumerate(numeric_columns)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def has_column(self, name: str) -> bool:
+        return name in self._numeric_pos or name in self.text or name == 'Name'
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw float32 view of a numeric column (no copy)."""
+        return self.numeric[self._numeric_pos[name]]
+
+    def array(self, name: str) -> np.ndarray:
+        """A numeric column as a clean float64 array (a copy)."""
+        return _clean_array(self.column(name))
+
+    def values(self, name: str) -> List[float]:
+        """A numeric column as clean Python floats."""
+        return _clean_floats(self.column(name))
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """One ticker as a {column: value} dict, in CSV column order."""
+        numbers = dict(zip(self.numeric_columns, _clean_floats(self.numeric[:, i])))
+        data = {}
+        for col in self.columns:
+            if col == 'Name':
+                data[col] = self.names[i]
+            elif col in numbers:
+                data[col] = numbers[col]
+            else:
+                data[col] = self.text[col][i]
+        return data
+
+    def nbytes(self) -> int:
+        return int(self.numeric.nbytes)
+
+    def to_frame(self):
+        """Full pandas DataFrame. Allocates the whole table; for debugging and ad-hoc use."""
+        import pandas as pd
+        data = {}
+        for col in self.columns:
+            if col == 'Name':
+                data[col] = self.names
+            elif col in self._numeric_pos:
+                data[col] = np.asarray(self.column(col), dtype=np.float64)
+            else:
+                data[col] = self.text[col]
+        return pd.DataFrame(data, columns=self.columns)
+
+    # --- Building ---
+
+    @classmethod
+    def from_csv(cls, filepath: str, source_hash: str = "") -> Optional["TickerStore"]:
+        """Parses and cleans the CSV once. Returns None if the 'Name' column is missing."""
+        import pandas as pd
+
+        # Read CSV with flexible encoding
+        try:
+            df = pd.read_csv(filepath, encoding='utf-8', dtype=str, keep_default_na=False)
+        except UnicodeDecodeError:
+            df = pd.read_csv(filepath, encoding='latin1', dtype=str, keep_default_na=False)
+
+        # Clean column names (also drops a UTF-8 BOM on the first header)
+        df.columns = df.columns.str.strip().str.lstrip('\ufeff')
+
+        if 'Name' not in df.columns:
+            logger.error("CSV missing required 'Name' column.")
+            return None
+
+        columns = list(df.columns)
+        numeric_columns = [c for c in columns if c in NUMERIC_COLUMNS]
+        numeric = np.zeros((len(numeric_columns), len(df)), dtype=np.float32)
+        for i, col in enumerate(numeric_columns):
+            # Remove commas, %, and whitespace, then coerce to numeric
+            cleaned = (
+                df[col]
+                .str.replace(',', '', regex=False)
+                .str.replace('%', '', regex=False)
+                .str.strip()
+            )
+            numeric[i] = pd.to_numeric(cleaned, errors='coerce').fillna(0.0).to_numpy(dtype=np.float32)
+
+        names = df['Name'].str.strip().tolist()
+        text = {
+            col: [v if v != '' else None for v in df[col].tolist()]
+            for col in columns if col != 'Name' and col not in numeric_columns
+        }
+        return cls(columns, numeric_columns, numeric, names, text, source_hash)
+
+    # --- Binary cache ---
+
+    def save(self, entry_dir: str):
+        """Writes numeric.npy + meta.json to a temp dir and publishes it atomically."""
+        tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        try:
+            np.save(os.path.join(tmp_dir, "numeric.npy"), np.ascontiguousarray(self.numeric))
+            meta = {
+                "columns": self.columns,
+                "numeric_columns": self.numeric_columns,
+                "names": self.names,
+                "text": self.text,
+                "source_hash": self.source_hash,
+            }
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Another worker published the same CSV first; theirs is equivalent
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, entry_dir: str) -> "TickerStore":
+        numeric = np.load(os.path.join(entry_dir, "numeric.npy"), mmap_mode='r')
+        with open(os.path.join(entry_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        store = cls(meta["columns"], meta["numeric_columns"], numeric, meta["names"],
+                    meta["text"], meta.get("source_hash", ""))
+        store.from_cache = True
+        return store
+
+def load_ticker_store(filepath: str, cache_dir: str = CACHE_DIR) -> Optional[TickerStore]:
+    """
+    Returns the cleaned store for `filepath`, from CACHE_DIR/tickers/<csv sha256>-v<version>/
+    when present (a memory-mapped load), otherwise parsing the CSV and writing that entry.
+    """
+    source_hash = file_hash(filepath)
+    entry_dir = os.path.join(cache_dir, "tickers", f"{source_hash}-v{TICKER_STORE_VERSION}")
+
+    if os.path.exists(os.path.join(entry_dir, "meta.json")):
+        try:
+            return TickerStore.load(entry_dir)
+        except Exception as e:
+            logger.warning(f"Ticker cache at {entry_dir} unreadable, rebuilding: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    store = TickerStore.from_csv(filepath, source_hash)
+    if store is None:
+        return None
+    try:
+        os.makedirs(os.path.dirname(entry_dir), exist_ok=True)
+        store.save(entry_dir)
+    except Exception as e:
+        logger.warning(f"Could not write ticker cache: {e}")
+    return store
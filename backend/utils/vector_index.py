@@ -0,0 +1,231 @@
+import os
+import json
+import mmap
+import logging
+import threading
+import numpy as np
+from typing import List, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+class FlatIndexWriter:
+    """
+    Appends normalized embeddings + chunk text for one document to disk.
+    Nothing is visible to readers until close() writes the sidecar.
+    """
+    def __init__(self, index: "FlatVectorIndex", doc_id: str, base_metadata: Dict[str, Any]):
+        self.index = index
+        self.doc_id = doc_id
+        self.base_metadata = base_metadata
+        self.count = 0
+        self.dim = None
+        self.offsets = [0]
+        self.metadatas = []
+        self._vec_file = open(index._path(doc_id, ".vec.tmp"), "wb")
+        self._txt_file = open(index._path(doc_id, ".txt.tmp"), "wb")
+
+    def append(self, embeddings, texts: List[str], metadatas: List[Dict[str, Any]]):
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(texts):
+            raise ValueError("Embeddings must be a 2D array with one row per text.")
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dim changed from {self.dim} to {vectors.shape[1]}")
+
+        # Store unit vectors so a dot product is the cosine similarity
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+
+        self._vec_file.write(vectors.astype(self.index.dtype).tobytes())
+        for text, meta in zip(texts, metadatas):
+            encoded = text.encode("utf-8")
+            self._txt_file.write(encoded)
+            self.offsets.append(self.offsets[-1] + len(encoded))
+            self.metadatas.append(meta)
+        self.count += len(texts)
+
+    def abort(self):
+        """Discards everything written so far; the index is left untouched."""
+        self._vec_file.close()
+        self._txt_file.close()
+        for suffix in (".vec.tmp", ".txt.tmp"):
+            try:
+                os.remove(self.index._path(self.doc_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        self._vec_file.close()
+        self._txt_file.close()
+        sidecar = {
+            **self.base_metadata,
+            "doc_id": self.doc_id,
+            "dtype": np.dtype(self.index.dtype).name,
+            "dim": self.dim or 0,
+            "count": self.count,
+            "offsets": self.offsets,
+            "metadatas": self.metadatas,
+        }
+        # Swap data files in first, then publish the sidecar that makes them readable
+        os.replace(self.index._path(self.doc_id, ".vec.tmp"), self.index._path(self.doc_id, ".vec"))
+        os.replace(self.index._path(self.doc_id, ".txt.tmp"), self.index._path(self.doc_id, ".txt"))
+        tmp_meta = self.index._path(self.doc_id, ".json.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(sidecar, f)
+        os.replace(tmp_meta, self.index._path(self.doc_id, ".json"))
+        self.index._register(sidecar)
+
+class FlatVectorIndex:
+    """
+    Lightweight alternative to ChromaDB for single-report workloads.
+
+    Each document is stored as three files in `index_dir`:
+      - <doc_id>.vec   raw float16/float32 matrix (count x dim) of unit vectors, memory-mapped on read
+      - <doc_id>.txt   concatenated UTF-8 chunk text
+      - <doc_id>.json  sidecar with company/report metadata, per-chunk metadata and byte offsets into .txt
+    Top-k is a single matrix-vector product over the memory-mapped rows.
+
+    Writers (ingesting jobs) register and delete documents while other jobs query, so the
+    document tables are only mutated under `_lock` and queries work on a snapshot of them.
+    """
+    def __init__(self, index_dir: str, dtype: str = "float16"):
+        self.index_dir = index_dir
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float16, np.float32):
+            raise ValueError(f"Unsupported index dtype: {dtype}")
+        os.makedirs(index_dir, exist_ok=True)
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._vectors: Dict[str, np.memmap] = {}
+        self._lock = threading.Lock()
+        self._load_manifest()
+
+    def _path(self, doc_id: str, suffix: str) -> str:
+        return os.path.join(self.index_dir, f"{doc_id}{suffix}")
+
+    def _load_manifest(self):
+        for fname in os.listdir(self.index_dir):
+            if not fname.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.index_dir, fname), encoding="utf-8") as f:
+                    self._register(json.load(f))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable index sidecar {fname}: {e}")
+
+    def _register(self, sidecar: Dict[str, Any]):
+        doc_id = sidecar["doc_id"]
+        with self._lock:
+            self._vectors.pop(doc_id, None)
+            self.docs[doc_id] = sidecar
+
+    def _get_vectors(self, doc_id: str, meta: Dict[str, Any]) -> Optional[np.ndarray]:
+        if meta["count"] == 0:
+            return None
+        with self._lock:
+            vectors = self._vectors.get(doc_id)
+            # A re-registered document gets a fresh sidecar; never pair it with a stale map
+            if vectors is not None and self.docs.get(doc_id) is meta:
+                return vectors
+        vectors = np.memmap(
+            self._path(doc_id, ".vec"), dtype=meta["dtype"], mode="r",
+            shape=(meta["count"], meta["dim"])
+        )
+        with self._lock:
+            if self.docs.get(doc_id) is meta:
+                self._vectors[doc_id] = vectors
+        return vectors
+
+    def _read_text(self, meta: Dict[str, Any], rows: List[int]) -> List[str]:
+        doc_id = meta["doc_id"]
+        offsets = meta["offsets"]
+        with open(self._path(doc_id, ".txt"), "rb") as f:
+            if offsets[-1] == 0:
+                return ["" for _ in rows]
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return [mm[offsets[r]:offsets[r + 1]].decode("utf-8") for r in rows]
+
+    def open_writer(self, doc_id: str, **base_metadata) -> FlatIndexWriter:
+        return FlatIndexWriter(self, doc_id, base_metadata)
+
+    def add(self, doc_id: str, embeddings, texts: List[str], metadatas: List[Dict[str, Any]], **base_metadata):
+        writer = self.open_writer(doc_id, **base_metadata)
+        try:
+            writer.append(embeddings, texts, metadatas)
+        except Exception:
+            writer.abort()
+            raise
+        writer.close()
+
+    def query(self, query_embedding, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Returns up to n_results hits as dicts: {'document', 'metadata', 'score'}, best first.
+        `where` filters on document-level metadata (e.g. {"company": "TCS"}).
+        """
+        return self.query_many(np.asarray(query_embedding).reshape(1, -1), n_results, where)[0]
+
+    def query_many(self, query_embeddings, n_results: int = 5, where: Optional[Dict[str, Any]] = None) -> List[List[Dict[str, Any]]]:
+        """Batched query: one matrix-matrix product per document covers every question."""
+        q = np.asarray(query_embeddings, dtype=np.float32)
+        if q.ndim == 1:
+            q = q.reshape(1, -1)
+        norms = np.linalg.norm(q, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        q = q / norms
+
+        with self._lock:
+            docs = dict(self.docs)
+
+        candidates = [[] for _ in range(len(q))]  # per question: (score, doc_id, row)
+        for doc_id, meta in docs.items():
+            if where and any(meta.get(k) != v for k, v in where.items()):
+                continue
+            try:
+                vectors = self._get_vectors(doc_id, meta)
+            except FileNotFoundError:
+                continue  # deleted since the snapshot
+            if vectors is None or vectors.shape[1] != q.shape[1]:
+                continue
+            scores = np.asarray(vectors @ q.T.astype(vectors.dtype), dtype=np.float32)  # (count, n_questions)
+            k = min(n_results, len(scores))
+            top = np.argpartition(-scores, k - 1, axis=0)[:k]
+            for qi in range(len(q)):
+                candidates[qi].extend((float(scores[r, qi]), doc_id, int(r)) for r in top[:, qi])
+
+        for qi in range(len(q)):
+            candidates[qi].sort(key=lambda c: c[0], reverse=True)
+            candidates[qi] = candidates[qi][:n_results]
+
+        # Group text reads per document so each .txt is mapped once for the whole batch
+        by_doc: Dict[str, set] = {}
+        for hits in candidates:
+            for _, doc_id, row in hits:
+                by_doc.setdefault(doc_id, set()).add(row)
+        texts = {}
+        for doc_id, rows in by_doc.items():
+            rows = sorted(rows)
+            try:
+                for row, text in zip(rows, self._read_text(docs[doc_id], rows)):
+                    texts[(doc_id, row)] = text
+            except FileNotFoundError:
+                continue  # deleted mid-query; its hits are dropped below
+
+        return [[{
+            "document": texts[(doc_id, row)],
+            "metadata": docs[doc_id]["metadatas"][row],
+            "score": score
+        } for score, doc_id, row in hits if (doc_id, row) in texts] for hits in candidates]
+
+    def delete(self, where: Dict[str, Any]):
+        with self._lock:
+            doc_ids = [d for d, m in self.docs.items() if all(m.get(k) == v for k, v in where.items())]
+            for doc_id in doc_ids:
+                self._vectors.pop(doc_id, None)
+                self.docs.pop(doc_id, None)
+        for doc_id in doc_ids:
+            for suffix in (".json", ".vec", ".txt"):
+                try:
+                    os.remove(self._path(doc_id, suffix))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,61 @@
+import sys
+import os
+import time
+import logging
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Loading stocks.csv here must not write a day into the live ticker history
+os.environ["TICKER_HISTORY"] = "0"
+
+from backend.utils.ticker_db import get_ticker_db
+
+# Keystroke-style queries: short prefixes, full words, infixes and typos
+QUERIES = ["r", "re", "rel", "relia", "tata", "tata mo", "motors", "bank", "hdfc b",
+           "infosis", "relaince", "finance", "pharma", "adani po", "xyzq"]
+
+def bench(repeats: int = 200):
+    logging.disable(logging.INFO)
+    db = get_ticker_db()
+    csv_path = os.path.join("backend", "data", "stocks.csv")
+    if not os.path.exists(csv_path):
+        print(f"❌ Stocks CSV not found at {csv_path}")
+        return
+    db.load_data(csv_path)
+
+    df = db.df
+
+    def legacy(q):
+        """The previous implementation: regex str.contains over every name, CSV order."""
+        mask = df['Name'].str.contains(q, case=False, na=False)
+        return df.loc[mask, 'Name'].head(10).tolist()
+
+    print(f"{'query':<10} {'legacy ms':>10} {'index ms':>10}  top results")
+    worst = 0.0
+    for q in QUERIES:
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            legacy(q)
+        t_legacy = (time.perf_counter() - t0) / repeats * 1000
+
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            results = db.search_names(q)
+        t_index = (time.perf_counter() - t0) / repeats * 1000
+        worst = max(worst, t_index)
+        print(f"{q:<10} {t_legacy:>10.3f} {t_index:>10.3f}  {results[:3]}")
+
+    # Typos are matched against the best-matching word, so long names are not penalised
+    for q, expected in [("relaince", "Reliance Industries"), ("infosis", "Infosys")]:
+        results = db.search_names(q)
+        top = results[0] if results else None
+        print(f"{'✅' if top == expected else '❌'} '{q}' -> {top}")
+
+    if worst < 1.0:
+        print(f"✅ Worst-case index latency {worst:.3f} ms (sub-millisecond).")
+    else:
+        print(f"❌ Worst-case index latency {worst:.3f} ms.")
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,79 @@
+import sys
+import os
+import time
+import random
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.table_extractor import FinancialTableExtractor
+
+FILLER_LABELS = [
+    "Name of the Director", "Category", "No. of Board Meetings attended", "Shareholding",
+    "Location", "CSR Project", "Amount spent", "Remuneration", "Designation", "Segment"
+]
+
+def make_table(kind: str, rows: int = 30, cols: int = 5) -> list:
+    labels = {
+        'balance_sheet': ["Total assets", "Current assets", "Total liabilities", "Borrowings", "Total equity"],
+        'income_statement': ["Revenue from operations", "Total income", "Total expenses", "Profit before tax", "Profit for the year"],
+        'cash_flow': ["Cash flow from operating activities", "Investing activities", "Financing activities", "Cash and cash equivalents"],
+        'filler': FILLER_LABELS,
+    }[kind]
+    data = [["Particulars"] + [f"FY{24 - i}" for i in range(cols - 1)]]
+    for r in range(rows):
+        label = labels[r % len(labels)]
+        data.append([label] + [f"{random.randint(1, 99999):,}" for _ in range(cols - 1)])
+    return data
+
+def legacy_identify(extractor: FinancialTableExtractor, tables: list) -> dict:
+    """The previous implementation: str(data) + DataFrame for every table, first match wins."""
+    identified = {'balance_sheet': None, 'income_statement': None, 'cash_flow': None}
+    for table_info in tables:
+        data = table_info['data']
+        content_str = str(data).lower()
+        df = extractor.clean_dataframe(data)
+        if 'balance sheet' in content_str or ('assets' in content_str and 'liabilities' in content_str):
+            if identified['balance_sheet'] is None:
+                identified['balance_sheet'] = df
+        elif 'profit' in content_str and 'loss' in content_str and 'revenue' in content_str:
+            if identified['income_statement'] is None:
+                identified['income_statement'] = df
+        elif 'cash flow' in content_str and 'operating' in content_str:
+            if identified['cash_flow'] is None:
+                identified['cash_flow'] = df
+    return identified
+
+def bench(n_tables: int = 2000, repeats: int = 3):
+    random.seed(42)
+    # Mostly non-statement tables, with the real statements buried in the middle
+    tables = [{'page': i // 3 + 1, 'table_index': i % 3, 'data': make_table('filler')} for i in range(n_tables)]
+    for kind, pos in [('balance_sheet', n_tables // 2), ('income_statement', n_tables // 2 + 1), ('cash_flow', n_tables // 2 + 2)]:
+        tables[pos]['data'] = make_table(kind)
+
+    extractor = FinancialTableExtractor()
+
+    def timed(fn):
+        best = float('inf')
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - t0)
+        return best, result
+
+    t_legacy, _ = timed(lambda: legacy_identify(extractor, tables))
+    t_new, identified = timed(lambda: extractor.identify_financial_tables(tables))
+
+    print(f"Tables: {n_tables}")
+    print(f"Legacy (DataFrame per table): {t_legacy * 1000:.1f} ms")
+    print(f"Indexed single pass:          {t_new * 1000:.1f} ms  ({t_legacy / t_new:.1f}x faster)")
+
+    found = {k: (v is not None and 'Particulars' in v.columns) for k, v in identified.items()}
+    print(f"Statements found: {found}")
+    if all(found.values()):
+        print("✅ All three statements identified.")
+    else:
+        print("❌ Missing statements.")
+
+if __name__ == "__main__":
+    bench()
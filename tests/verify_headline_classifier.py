@@ -0,0 +1,53 @@
+import sys
+import os
+import re
+import zlib
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.headline_classifier import HeadlineClassifier
+
+def hashed_bow(texts, dim=512):
+    """Stand-in for MiniLM: hashed bag of words (the classifier only needs comparable vectors)."""
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            out[i, zlib.crc32(word.encode()) % dim] += 1
+    return out
+
+def verify():
+    classifier = HeadlineClassifier(hashed_bow)
+    cases = [
+        ("Tata Motors shares surge as order book hits record high", "positive"),
+        ("Brokerage downgrades Wipro to sell, slashes target price", "negative"),
+        ("Infosys board meeting scheduled to consider fund raising", "neutral"),
+    ]
+    started = time.perf_counter()
+    results = classifier.classify([h for h, _ in cases])
+    elapsed = (time.perf_counter() - started) * 1000
+
+    correct = sum(r['sentiment'] == expected for r, (_, expected) in zip(results, cases))
+    if correct == len(cases):
+        print(f"✅ Labelled {len(cases)} headlines against the prototypes ({elapsed:.1f}ms incl. prototype embedding)")
+    else:
+        print(f"❌ Labels: {[(h, r['sentiment']) for (h, _), r in zip(cases, results)]}")
+
+    if all(0 <= r['confidence'] for r in results) and all(isinstance(r['clear'], bool) for r in results):
+        print("✅ Confidence margins reported")
+    else:
+        print("❌ Missing confidence fields")
+
+    severe = classifier.classify(["Enforcement Directorate raids Example Ltd offices",
+                                  "Example Ltd chairman arrested over bribery allegations",
+                                  "Example Ltd wins large order"])
+    if severe[0]['severe'] and severe[1]['severe'] and not severe[2]['severe']:
+        print("✅ High-severity headlines flagged for the LLM")
+    else:
+        print(f"❌ Severity flags: {[r['severe'] for r in severe]}")
+
+if __name__ == "__main__":
+    verify()
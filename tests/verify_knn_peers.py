@@ -0,0 +1,51 @@
+import sys
+import os
+import logging
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Loading stocks.csv here must not write a day into the live ticker history
+os.environ["TICKER_HISTORY"] = "0"
+
+from backend.utils.ticker_db import get_ticker_db
+
+def verify():
+    logging.disable(logging.INFO)
+    csv_path = os.path.join("backend", "data", "stocks.csv")
+    if not os.path.exists(csv_path):
+        print(f"❌ Stocks CSV not found at {csv_path}")
+        return
+
+    db = get_ticker_db()
+    db.load_data(csv_path)
+
+    for company, expected in [("HDFC Bank", "ICICI Bank"), ("Sun Pharmaceutical", "Cipla"), ("TCS", "Infosys")]:
+        target = db.get_company_details(company)
+        peers = db.get_similar_peers(company, limit=5)
+        names = [p['Name'] for p in peers]
+        same_industry = all(p['Industry PE'] == target['Industry PE'] for p in peers)
+        # Closest first within each tier: inside the default 10x market-cap band, then outside it
+        cap = target['Market Cap (Cr.)']
+        ranked = [(not cap / 10 <= p['Market Cap (Cr.)'] <= cap * 10, p['Peer Distance']) for p in peers]
+        ok = (expected in names and same_industry and ranked == sorted(ranked)
+              and db.resolve_name(company) not in names)
+        print(f"{'✅' if ok else '❌'} {company}: {names} (all Industry PE {target['Industry PE']}: {same_industry})")
+
+    tcs = [p['Name'] for p in db.get_similar_peers("TCS", limit=8)]
+    ok = "Wipro" in tcs and "Tech Mahindra" in tcs and "Hindustan Zinc" not in tcs
+    print(f"{'✅' if ok else '❌'} TCS top 8 stays in IT services: {tcs}")
+
+    target = db.get_company_details("Asian Paints")
+    peers = db.get_similar_peers("Asian Paints", limit=10, mcap_band=2.0, exclude=["Berger Paints"])
+    cap = target['Market Cap (Cr.)']
+    in_band = [cap / 2 <= p['Market Cap (Cr.)'] <= cap * 2 for p in peers]
+    same = [p['Industry PE'] == target['Industry PE'] for p in peers]
+    # Outside the band only same-industry peers are allowed, and only after the in-band ones of that industry
+    tiers = [0 if s and b else 1 if s else 2 for s, b in zip(same, in_band)]
+    band_ok = all(b or s for s, b in zip(same, in_band)) and tiers == sorted(tiers)
+    excluded = all(p['Name'] != "Berger Paints" for p in peers)
+    print(f"{'✅' if band_ok and excluded else '❌'} Market-cap band and exclusions respected ({len(peers)} peers)")
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,40 @@
+import sys
+import os
+import logging
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Loading stocks.csv here must not write a day into the live ticker history
+os.environ["TICKER_HISTORY"] = "0"
+
+from backend.utils.ticker_db import get_ticker_db, build_name_index
+
+def verify():
+    logging.disable(logging.INFO)
+    csv_path = os.path.join("backend", "data", "stocks.csv")
+    if not os.path.exists(csv_path):
+        print(f"❌ Stocks CSV not found at {csv_path}")
+        return
+
+    db = get_ticker_db()
+    db.load_data(csv_path)
+
+    # Generic or shared leading words must not validate as a company
+    for word in ["The", "India", "Bank", "New", "Power", "National", "Tata"]:
+        resolved = db.resolve_name(word)
+        ok = resolved is None and not db.validate_name(word)
+        print(f"{'✅' if ok else '❌'} '{word}' does not resolve ({resolved})")
+
+    for alias, expected in [("Infosys", "Infosys"), ("TCS", "Tata Consultancy Services"),
+                            ("Reliance", "Reliance Industries"), ("HDFC Bank Ltd", "HDFC Bank")]:
+        resolved = db.resolve_name(alias)
+        print(f"{'✅' if resolved == expected else '❌'} '{alias}' -> {resolved}")
+
+    # A first word shared by two listings is ambiguous and left out
+    index = build_name_index(["Acme Chemicals", "Acme Textiles", "Zenith Pumps"], [10.0, 20.0, 5.0])
+    ok = "acme" not in index and index.get("zenith") == 2
+    print(f"{'✅' if ok else '❌'} Shared first word left out, unique one kept")
+
+if __name__ == "__main__":
+    verify()
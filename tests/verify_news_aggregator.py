@@ -0,0 +1,66 @@
+import sys
+import os
+import time
+import asyncio
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.api_clients import NewsAggregator
+
+class FakeSource:
+    """Stands in for a NewsAPI/RSS source: returns `articles` after `delay` seconds."""
+    def __init__(self, name, delay, articles, fail=False):
+        self.name, self.delay, self.articles, self.fail = name, delay, articles, fail
+
+    async def fetch(self, client, company_name, query, days):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("source down")
+        return self.articles
+
+def article(i, host, title=None, description=None, url=None):
+    return {
+        'title': title or f"Headline {i}",
+        'description': description,
+        'url': url or f"https://{host}/story/{i}?utm_source=feed",
+        'published_at': f"2025-01-{i:02d}T00:00:00Z",
+        'source': host
+    }
+
+def verify():
+    fast = FakeSource("fast", 0.05, [article(i, "a.com") for i in range(1, 11)])
+    # Same stories again: by URL (www./trailing slash/no tracking) and by headline with a publisher suffix
+    repeats = FakeSource("repeats", 0.1, [article(i, "a.com", description="full text", url=f"https://www.a.com/story/{i}/") for i in range(1, 4)]
+                         + [article(20, "b.com", title="Headline 5 - Some Paper")])
+    slow = FakeSource("slow", 5.0, [article(i, "c.com") for i in range(11, 20)])
+    down = FakeSource("down", 0.01, [], fail=True)
+
+    aggregator = NewsAggregator(sources=[fast, repeats, slow, down], min_articles=50, deadline=0.5)
+    started = time.time()
+    articles = aggregator.fetch_news("Example Co")
+    elapsed = time.time() - started
+
+    if len(articles) == 10:
+        print("✅ Merged and de-duplicated across sources (10 unique)")
+    else:
+        print(f"❌ Expected 10 unique articles, got {len(articles)}")
+    if sum(1 for a in articles if a['description']) == 3:
+        print("✅ Kept the copy with a description for repeated stories")
+    else:
+        print("❌ Description-bearing duplicates were not preferred")
+    if elapsed < 1.0:
+        print(f"✅ Returned at the deadline despite a slow and a failing source ({elapsed:.2f}s)")
+    else:
+        print(f"❌ Waited {elapsed:.2f}s for slow sources")
+
+    early = NewsAggregator(sources=[fast, slow], min_articles=10, deadline=5.0)
+    started = time.time()
+    articles = early.fetch_news("Example Co")
+    if len(articles) == 10 and time.time() - started < 1.0:
+        print("✅ Returned as soon as enough articles arrived")
+    else:
+        print("❌ Did not return early")
+
+if __name__ == "__main__":
+    verify()
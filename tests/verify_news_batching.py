@@ -0,0 +1,61 @@
+import sys
+import os
+import re
+import json
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import backend.agents.news_analyzer as news_analyzer
+from backend.agents.news_analyzer import NewsAnalyzer
+
+COMPANIES = ["Alpha Ltd", "Beta Ltd", "Gamma Ltd"]
+prompts = []
+
+def mock_llm(prompt):
+    """Answers batch prompts for every company but the last, which must then be retried alone."""
+    prompts.append(prompt)
+    def result(score):
+        return {"score": score, "positive_count": 0, "negative_count": 0, "neutral_count": 0,
+                "key_themes": [], "headlines": [], "panic_level": "low", "severity_score": 2, "severity_reason": ""}
+    ids = re.findall(r"\[(C\d+)\] ", prompt)
+    if ids:
+        return json.dumps({cid: result(i) for i, cid in enumerate(ids[:-1], 1)})
+    return json.dumps(result(-3))
+
+class MockAggregator:
+    def fetch_news(self, company_name, query_string=None, days=7):
+        return [{'title': f"{company_name} story {i}", 'description': None, 'url': f"https://x.com/{company_name}/{i}",
+                 'published_at': "2025-01-01T00:00:00Z", 'source': "x.com"} for i in range(3)]
+
+def verify():
+    news_analyzer.generate_content_with_fallback = mock_llm
+    analyzer = NewsAnalyzer.__new__(NewsAnalyzer)
+    analyzer.aggregator = MockAggregator()
+    analyzer._classify_locally = lambda stories: None  # no embedding model in this test
+
+    results = analyzer.analyze_many(COMPANIES + ["Alpha Ltd"])
+
+    if list(results) == COMPANIES:
+        print("✅ One result per distinct company, in request order")
+    else:
+        print(f"❌ Results for {list(results)}")
+
+    batch_prompts = [p for p in prompts if "[C1]" in p]
+    if len(batch_prompts) == 1 and all(c in batch_prompts[0] for c in COMPANIES):
+        print("✅ All companies packed into a single batch prompt")
+    else:
+        print(f"❌ {len(batch_prompts)} batch prompts")
+
+    if results["Alpha Ltd"].score == 1 and results["Beta Ltd"].score == 2 and len(results["Beta Ltd"].headlines) == 3:
+        print("✅ Batch response split back into per-company NewsSentiment")
+    else:
+        print(f"❌ Split results wrong: {results}")
+
+    if len(prompts) == 2 and results["Gamma Ltd"].score == -3:
+        print("✅ Company missing from the batch response retried alone (2 LLM calls instead of 3)")
+    else:
+        print(f"❌ {len(prompts)} LLM calls; Gamma score {results['Gamma Ltd'].score}")
+
+if __name__ == "__main__":
+    verify()
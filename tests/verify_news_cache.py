@@ -0,0 +1,88 @@
+import sys
+import os
+import time
+import asyncio
+import tempfile
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.api_clients import NewsAggregator, NewsCache
+
+class CountingSource:
+    """Fake news source that counts its fetches and returns a fresh headline each time."""
+    name = "counting"
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    async def fetch(self, client, company_name, query, days):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay)
+        return [{
+            'title': f"{company_name} story {call}",
+            'description': None,
+            'url': f"https://example.com/{call}",
+            'published_at': "2025-01-01T00:00:00Z",
+            'source': "example.com"
+        }]
+
+def verify():
+    cache_dir = tempfile.mkdtemp()
+    source = CountingSource()
+    cache = NewsCache(cache_dir=cache_dir, ttl=0.5, stale=60)
+    aggregator = NewsAggregator(sources=[source], min_articles=1, deadline=2, cache=cache)
+
+    # Concurrent misses for the same query share one fetch
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(aggregator.fetch_news("Example Co")))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if source.calls == 1 and all(r == results[0] for r in results):
+        print("✅ Five concurrent jobs triggered a single fetch")
+    else:
+        print(f"❌ Expected 1 fetch for concurrent jobs, got {source.calls}")
+
+    aggregator.fetch_news("Example Co")
+    if source.calls == 1 and cache.stats()["hits"] >= 1:
+        print("✅ Fresh entry served from cache")
+    else:
+        print("❌ Fresh entry was refetched")
+
+    # Past the TTL: the stale list comes back at once, one refresh runs in the background
+    time.sleep(0.6)
+    started = time.time()
+    stale = aggregator.fetch_news("Example Co")
+    elapsed = time.time() - started
+    time.sleep(0.3)
+    refreshed = aggregator.fetch_news("Example Co")
+    if stale[0]['title'].endswith("story 1") and elapsed < 0.05 and refreshed[0]['title'].endswith("story 2"):
+        print(f"✅ Stale entry served immediately ({elapsed * 1000:.1f}ms) and revalidated in the background")
+    else:
+        print(f"❌ Stale-while-revalidate failed: {stale[0]['title']} / {refreshed[0]['title']} ({elapsed:.2f}s)")
+
+    # A new process (fresh cache object) reads the persisted entry
+    restarted = NewsCache(cache_dir=cache_dir, ttl=60, stale=60)
+    calls_before = source.calls
+    persisted = NewsAggregator(sources=[source], min_articles=1, deadline=2, cache=restarted).fetch_news("Example Co")
+    if source.calls == calls_before and persisted[0]['title'].endswith("story 2"):
+        print("✅ Entries persist across restarts")
+    else:
+        print("❌ Persisted entry was not reused")
+
+    # Different windows are different keys
+    aggregator.fetch_news("Example Co", days=30)
+    stats = cache.stats()
+    if source.calls == calls_before + 1 and stats["misses"] == 2:
+        print(f"✅ Keyed by query and window (hit rate {stats['hit_rate']})")
+    else:
+        print(f"❌ Unexpected counters: {stats}")
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,74 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.news_clustering import cluster_articles
+
+def article(title, source, description=None):
+    return {'title': title, 'description': description, 'url': f"https://{source}/{hash(title)}",
+            'published_at': "2025-01-01T00:00:00Z", 'source': source}
+
+def verify():
+    articles = [
+        article("Adani Enterprises shares crash 20% after US indictment - Mint", "livemint.com"),
+        article("Adani Enterprises shares crash 20% after US bribery indictment", "ndtv.com",
+                description="Shares of Adani Enterprises fell 20% on Thursday after US prosecutors charged the chairman."),
+        article("Adani Enterprises shares crash 20% after US indictment, investors lose crores", "zeebiz.com"),
+        article("Adani Green withdraws $600 million bond offering", "reuters.com"),
+        article("Adani Ports Q2 profit rises 37% on higher cargo volumes", "businessline.com"),
+        article("Adani Ports Q2 net profit rises 37% on higher cargo volumes", "moneycontrol.com"),
+        article("Adani Ports Q2 results: Strong show, margins expand", "cnbctv18.com"),
+    ]
+
+    started = time.perf_counter()
+    stories = cluster_articles(articles)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    sizes = [s['cluster_size'] for s in stories]
+    if sizes == [3, 1, 2, 1]:
+        print(f"✅ 7 articles collapsed into {len(stories)} stories {sizes} ({elapsed:.1f}ms)")
+    else:
+        print(f"❌ Unexpected clusters: {[(s['title'], s['cluster_size']) for s in stories]}")
+
+    if stories[0]['description'] and stories[0]['sources'] == ["livemint.com", "ndtv.com", "zeebiz.com"]:
+        print("✅ Representative is the copy with a description; all outlets kept")
+    else:
+        print(f"❌ Representative/sources wrong: {stories[0]}")
+
+    if sorted(i for s in stories for i in s['members']) == list(range(len(articles))):
+        print("✅ Every article belongs to exactly one story")
+    else:
+        print("❌ Members do not cover the input")
+
+    headlines = [
+        "Infosys wins $1.5 billion deal from European telecom firm",
+        "Infosys cuts revenue guidance for FY25",
+        "Infosys shares fall 3% after guidance cut",
+        "Infosys board approves share buyback",
+        "Infosys CFO resigns, company names successor",
+    ]
+    distinct = cluster_articles([article(t, "a.com") for t in headlines])
+    if len(distinct) == len(headlines):
+        print("✅ Different stories about the same company are not merged")
+    else:
+        print(f"❌ Distinct headlines merged into {len(distinct)} stories")
+
+    # Short headlines one word apart can say opposite things
+    opposite = cluster_articles([article("TCS Q2 profit rises", "a.com"), article("TCS Q2 profit falls", "b.com")])
+    if len(opposite) == 2:
+        print("✅ 'TCS Q2 profit rises' and 'TCS Q2 profit falls' kept as separate stories")
+    else:
+        print(f"❌ Opposite short headlines merged: {opposite[0]['title']} x{opposite[0]['cluster_size']}")
+
+    syndicated = cluster_articles([article("TCS Q2 profit rises - Mint", "livemint.com"),
+                                   article("TCS Q2 profit rises", "ndtv.com")])
+    if len(syndicated) == 1:
+        print("✅ The same short headline from two outlets is still one story")
+    else:
+        print("❌ Identical short headlines not merged")
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,127 @@
+import sys
+import os
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Loading stocks.csv here must not write a day into the live ticker history
+os.environ["TICKER_HISTORY"] = "0"
+
+from backend.agents.news_watcher import NewsWatcher
+from backend.models.schemas import NewsSentiment
+from backend.utils.api_clients import NewsAggregator
+from backend.utils.ticker_db import get_ticker_db
+
+class FeedSource:
+    """Fake source serving whatever is in `articles`, filtered to the requested window like the real ones."""
+    name = "feed"
+
+    def __init__(self):
+        self.articles = []
+        self.windows = []
+
+    async def fetch(self, client, company_name, query, days):
+        self.windows.append(days)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        return [a for a in self.articles if datetime.fromisoformat(a['published_at'].replace("Z", "+00:00")) >= cutoff]
+
+class StubAnalyzer:
+    """Scores without an LLM: severity 10 if any headline mentions a raid."""
+    def __init__(self, source):
+        self.aggregator = NewsAggregator(sources=[source], min_articles=100, deadline=1)
+        self.calls = 0
+
+    @staticmethod
+    def query_for(company_name):
+        return f'"{company_name}"'
+
+    def score_articles(self, company_name, articles):
+        self.calls += 1
+        severe = any("raid" in a['title'].lower() for a in articles)
+        return NewsSentiment(score=-8 if severe else 2, positive_count=0, negative_count=0, neutral_count=len(articles),
+                             key_themes=[], headlines=[], panic_level="high" if severe else "low",
+                             severity_score=10 if severe else 1, severity_reason="raid" if severe else "")
+
+    def score_many(self, articles_by_company):
+        return {company: self.score_articles(company, articles) for company, articles in articles_by_company.items()}
+
+def article(title, minutes_ago):
+    published = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return {'title': title, 'description': None, 'url': f"https://example.com/{abs(hash(title))}",
+            'published_at': published.strftime("%Y-%m-%dT%H:%M:%SZ"), 'source': "example.com"}
+
+def verify():
+    source = FeedSource()
+    analyzer = StubAnalyzer(source)
+    watcher = NewsWatcher(["Example Co"], interval=60, window_days=7, analyzer=analyzer)
+
+    source.articles = [article("Example Co wins order", 600), article("Example Co AGM notice", 3000)]
+    new = watcher.poll("Example Co")
+    sentiment = watcher.get_sentiment("example co")
+    if new == 2 and sentiment is not None and sentiment.score == 2:
+        print("✅ First poll scored the rolling window; lookup is case-insensitive")
+    else:
+        print(f"❌ First poll: new={new}, sentiment={sentiment}")
+
+    new = watcher.poll("Example Co")
+    if new == 0 and analyzer.calls == 1 and source.windows[-1] < 0.05:
+        print(f"✅ Repeat poll asked only for the last {source.windows[-1] * 1440:.0f} minutes and did not re-score")
+    else:
+        print(f"❌ Repeat poll: new={new}, scored {analyzer.calls}x, window {source.windows[-1]:.3f} days")
+
+    source.articles.append(article("Enforcement Directorate raids Example Co offices", 1))
+    new = watcher.poll("Example Co")
+    status = watcher.status()
+    if new == 1 and status["companies"]["Example Co"]["articles"] == 3 and len(watcher.alerts) == 1:
+        print(f"✅ New article re-scored the window and raised an alert: {watcher.alerts[0]['severity_score']}")
+    else:
+        print(f"❌ Spike not detected: new={new}, alerts={list(watcher.alerts)}")
+
+    watcher.poll("Example Co")
+    if len(watcher.alerts) == 1:
+        print("✅ A sustained high severity alerts once")
+    else:
+        print("❌ Duplicate alerts")
+
+    batch = NewsWatcher(["Example Co", "Quiet Co"], interval=60, window_days=7, analyzer=StubAnalyzer(source))
+    batch.poll_all()
+    batch.poll_all()
+    if batch.analyzer.calls == 2 and batch.get_sentiment("Quiet Co") is not None:
+        print("✅ poll_all scored each company once and skipped unchanged ones on the next cycle")
+    else:
+        print(f"❌ poll_all scored {batch.analyzer.calls}x")
+
+    if watcher.get_sentiment("Other Co") is None:
+        print("✅ Unwatched companies fall through to on-demand analysis")
+    else:
+        print("❌ Unwatched company returned state")
+
+    aging = NewsWatcher(["Example Co"], interval=60, window_days=1, analyzer=StubAnalyzer(source))
+    source.articles = [article("Example Co wins order", 600)]
+    aging.poll("Example Co")
+    state = aging._states["example co"]
+    state["articles"] = [dict(a, published_at="2000-01-01T00:00:00Z") for a in state["articles"]]
+    source.articles = [article("Example Co board meeting", 1)]
+    aging.poll("Example Co")
+    state = aging._states["example co"]
+    if len(state["articles"]) == 1 and state["seen"] == {state["articles"][0]['url']}:
+        print("✅ Seen keys pruned with the articles that aged out of the window")
+    else:
+        print(f"❌ Seen keys not pruned: {len(state['seen'])} seen, {len(state['articles'])} articles")
+
+    logging.disable(logging.INFO)
+    csv_path = os.path.join("backend", "data", "stocks.csv")
+    if os.path.exists(csv_path):
+        get_ticker_db().load_data(csv_path)
+        aliased = NewsWatcher(["TCS"], interval=60, window_days=7, analyzer=StubAnalyzer(source))
+        aliased.poll("TCS")
+        if aliased.get_sentiment("Tata Consultancy Services") is not None and aliased.get_sentiment("tcs") is not None:
+            print("✅ Watched alias and listed name share one state")
+        else:
+            print("❌ 'TCS' and 'Tata Consultancy Services' resolved to different states")
+
+if __name__ == "__main__":
+    verify()
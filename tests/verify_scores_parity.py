@@ -0,0 +1,77 @@
+import sys
+import os
+import random
+import logging
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Loading stocks.csv here must not write a day into the live ticker history
+os.environ["TICKER_HISTORY"] = "0"
+
+import numpy as np
+from backend.utils.peer_comparison import calculate_normalized_scores_v2, calculate_normalized_scores_batch
+from backend.utils.ticker_db import get_ticker_db
+
+FIELDS = ['roe', 'roce', 'pe_ratio', 'industry_pe', 'dividend', 'current_price', 'returns_1y', 'returns_5y']
+
+def check(rows: list, label: str) -> bool:
+    batch = calculate_normalized_scores_batch(**{f: np.array([r[f] for r in rows]) for f in FIELDS})
+    mismatches = 0
+    for i, raw in enumerate(rows):
+        expected = calculate_normalized_scores_v2(raw)
+        got = {name: float(values[i]) for name, values in batch.items()}
+        if expected != got:
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"   {raw}\n   scalar={expected}\n   batch ={got}")
+    print(f"{'✅' if mismatches == 0 else '❌'} {label}: {len(rows) - mismatches}/{len(rows)} identical")
+    return mismatches == 0
+
+def verify():
+    # Edge cases: range bounds, loss makers, missing industry PE, zero price, .x5 rounding ties
+    edges = [
+        dict(roe=0, roce=30, pe_ratio=0, industry_pe=0, dividend=0, current_price=0, returns_1y=-50, returns_5y=100),
+        dict(roe=-5, roce=45, pe_ratio=-12, industry_pe=0, dividend=1, current_price=0, returns_1y=150, returns_5y=-40),
+        dict(roe=15, roce=15, pe_ratio=-12, industry_pe=20, dividend=2, current_price=100, returns_1y=0, returns_5y=0),
+        dict(roe=7.35, roce=0.45, pe_ratio=20, industry_pe=20, dividend=0.35, current_price=1559.2, returns_1y=12.25, returns_5y=2.75),
+        dict(roe=float('nan'), roce=10, pe_ratio=40, industry_pe=20, dividend=5, current_price=50, returns_1y=1, returns_5y=1),
+    ]
+    ok = check(edges, "Edge cases")
+
+    random.seed(7)
+    rand = [{f: round(random.uniform(-100, 200), random.choice([0, 1, 2])) for f in FIELDS} for _ in range(20000)]
+    ok &= check(rand, "Random inputs")
+
+    # Full universe exactly as PeerComparator feeds a CSV peer
+    logging.disable(logging.INFO)
+    csv_path = os.path.join("backend", "data", "stocks.csv")
+    if os.path.exists(csv_path):
+        db = get_ticker_db()
+        db.load_data(csv_path)
+        snapshot = db.snapshot()
+        mismatches = 0
+        for row in range(len(snapshot.store)):
+            data = snapshot.row_dict(row)
+            def sf(k): return float(data.get(k, 0.0) or 0.0)
+            expected = calculate_normalized_scores_v2({
+                'roe': sf('ROE'), 'roce': sf('ROCE'), 'pe_ratio': sf('PE Ratio'),
+                'industry_pe': sf('Industry PE'), 'dividend': sf('Dividend'), 'current_price': sf('LTP'),
+                'returns_1y': sf('1 Yr Returns'), 'returns_5y': sf('5 Yr Returns')
+            })
+            if expected != snapshot.scores_for(row):
+                mismatches += 1
+        ok &= mismatches == 0
+        print(f"{'✅' if mismatches == 0 else '❌'} Snapshot scores: {len(snapshot.store) - mismatches}/{len(snapshot.store)} identical")
+
+        pct = db.get_industry_percentiles("Reliance Industries")
+        if pct and all(0 <= v <= 100 for v in pct.values()):
+            print(f"✅ Industry percentiles for Reliance: {pct}")
+        else:
+            print(f"❌ Bad industry percentiles: {pct}")
+            ok = False
+
+    print("✅ Batch scores match the scalar function" if ok else "❌ Parity failures")
+
+if __name__ == "__main__":
+    verify()
@@ -0,0 +1,48 @@
+import sys
+import os
+import logging
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Loading stocks.csv here must not write a day into the live ticker history
+os.environ["TICKER_HISTORY"] = "0"
+
+from backend.utils.ticker_db import get_ticker_db
+
+def verify():
+    logging.disable(logging.INFO)
+    csv_path = os.path.join("backend", "data", "stocks.csv")
+    if not os.path.exists(csv_path):
+        print(f"❌ Stocks CSV not found at {csv_path}")
+        return
+
+    db = get_ticker_db()
+    db.load_data(csv_path)
+
+    # Reference: the same screen written as a plain pandas query
+    df = db.df
+    expected = df[(df['1M Returns'] < -10) & (df['RSI'] < 30) & (df['RSI'] != 0) & (df['ROE'] > 15)]
+
+    result = db.screen("returns_1m<-10, rsi<30, roe>15", sort="-score", limit=500)
+    names = [r['name'] for r in result['results']]
+    if result['matched'] == len(expected) and set(names) == set(expected['Name']):
+        print(f"✅ Oversold-quality screen matches pandas ({result['matched']} tickers, {result['elapsed_ms']} ms)")
+    else:
+        print(f"❌ Screen returned {result['matched']}, pandas {len(expected)}")
+
+    scores = [r['score'] for r in result['results']]
+    if scores == sorted(scores, reverse=True):
+        print("✅ Ranked by composite score, strongest first")
+    else:
+        print("❌ Results not sorted by score")
+
+    for bad in ["unknown_field<1", "rsi<<30", "roe>"]:
+        try:
+            db.screen(bad)
+            print(f"❌ Accepted invalid filter '{bad}'")
+        except ValueError:
+            print(f"✅ Rejected invalid filter '{bad}'")
+
+if __name__ == "__main__":
+    verify()
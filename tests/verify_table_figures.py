@@ -0,0 +1,87 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.table_extractor import FinancialTableExtractor
+
+# Standalone statements as pdfplumber returns them: a unit line, then a Note No. column before the two periods
+PROFIT_AND_LOSS = [
+    ["(₹ in Crore)", "", "", ""],
+    ["Particulars", "Note No.", "Year ended\n31st March, 2024", "Year ended\n31st March, 2023"],
+    ["Income", "", "", ""],
+    ["Revenue from operations", "23", "1,20,450.60", "1,00,000.00"],
+    ["Other income", "24", "2,310.15", "1,980.40"],
+    ["Total income", "", "1,22,760.75", "1,01,980.40"],
+    ["Profit before tax", "", "16,200.00", "13,400.00"],
+    ["Profit for the year", "", "12,100.00", "10,050.00"],
+]
+
+BALANCE_SHEET = [
+    ["Particulars", "Note", "As at\n31.03.2024", "As at\n31.03.2023"],
+    ["EQUITY AND LIABILITIES", "", "", ""],
+    ["Total equity", "", "50,000.00", "45,000.00"],
+    ["Non-current liabilities", "", "", ""],
+    ["Borrowings", "15", "20,000.00", "25,000.00"],
+    ["Current liabilities", "", "", ""],
+    ["Borrowings", "18", "5,000.00", "4,000.00"],
+]
+
+def verify():
+    extractor = FinancialTableExtractor()
+    identified = {
+        'income_statement': extractor.clean_dataframe(PROFIT_AND_LOSS),
+        'balance_sheet': extractor.clean_dataframe(BALANCE_SHEET),
+    }
+    figures = extractor.extract_key_figures(identified)
+
+    if figures.get('revenue_current') == 120450.6 and figures.get('revenue_prior') == 100000.0:
+        print("✅ Revenue read from the period columns, not the Note No. column")
+    else:
+        print(f"❌ Revenue: {figures.get('revenue_current')} / {figures.get('revenue_prior')}")
+
+    if figures.get('profit_current') == 12100.0 and figures.get('profit_prior') == 10050.0:
+        print("✅ Profit for the year read correctly")
+    else:
+        print(f"❌ Profit: {figures.get('profit_current')} / {figures.get('profit_prior')}")
+
+    if figures.get('debt_to_equity') == 0.5:
+        print("✅ Debt-to-equity sums non-current and current borrowings (0.5)")
+    else:
+        print(f"❌ Debt-to-equity: {figures.get('debt_to_equity')}")
+
+    # A "Total borrowings" row must be used on its own, not added to its parts
+    with_total = BALANCE_SHEET + [["Total borrowings", "", "25,000.00", "29,000.00"]]
+    figures = extractor.extract_key_figures({'balance_sheet': extractor.clean_dataframe(with_total)})
+    if figures.get('debt_to_equity') == 0.5:
+        print("✅ Total borrowings row not double counted")
+    else:
+        print(f"❌ Debt-to-equity with total row: {figures.get('debt_to_equity')}")
+
+    # Unlabelled header (merged cells lost): the leading small note number is still skipped
+    unlabelled = [["Particulars (₹ in Crore)", "", "", ""]] + PROFIT_AND_LOSS[2:]
+    figures = extractor.extract_key_figures({'income_statement': extractor.clean_dataframe(unlabelled)})
+    if figures.get('revenue_current') == 120450.6 and figures.get('revenue_prior') == 100000.0:
+        print("✅ Note number skipped without a header")
+    else:
+        print(f"❌ Unlabelled header revenue: {figures.get('revenue_current')} / {figures.get('revenue_prior')}")
+
+    # Unit stated above the table (caption) in lakhs: converted to crores
+    in_lakhs = PROFIT_AND_LOSS[1:]
+    figures = extractor.extract_key_figures(
+        {'income_statement': extractor.clean_dataframe(in_lakhs, caption="Statement of Profit and Loss (Rs. in Lakhs)")})
+    if figures.get('revenue_current') == 1204.51 and figures.get('profit_prior') == 100.5:
+        print("✅ Lakhs converted to crores")
+    else:
+        print(f"❌ Lakhs: revenue {figures.get('revenue_current')}, prior profit {figures.get('profit_prior')}")
+
+    # No unit anywhere: absolute figures are not guessed
+    figures = extractor.extract_key_figures({'income_statement': extractor.clean_dataframe(in_lakhs)})
+    if 'revenue_current' not in figures and 'profit_current' not in figures:
+        print("✅ No stated unit: revenue and profit left to the LLM")
+    else:
+        print(f"❌ Unitless figures returned: {figures}")
+
+if __name__ == "__main__":
+    verify()
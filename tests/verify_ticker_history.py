@@ -0,0 +1,81 @@
+import sys
+import os
+import tempfile
+from datetime import date, timedelta
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Keep history and ticker cache writes out of the working tree; set before backend.config is imported
+_scratch = tempfile.TemporaryDirectory()
+os.environ["TICKER_HISTORY_DIR"] = os.path.join(_scratch.name, "history")
+os.environ["CACHE_DIR"] = os.path.join(_scratch.name, "cache")
+
+import numpy as np
+from backend.utils.ticker_store import TickerStore
+from backend.utils.ticker_history import TickerHistory, get_ticker_history
+from backend.utils.ticker_db import record_history
+
+def day_store(base: TickerStore, k: int) -> TickerStore:
+    """Day k of a synthetic crash: every LTP falls 1%/day, RSI falls 2 points/day."""
+    numeric = np.array(base.numeric, copy=True)
+    ltp, rsi = base.numeric_columns.index('LTP'), base.numeric_columns.index('RSI')
+    numeric[ltp] *= (1 - 0.01 * k)
+    numeric[rsi] = np.where(numeric[rsi] > 0, np.maximum(5, numeric[rsi] - 2 * k), 0)
+    return TickerStore(base.columns, base.numeric_columns, numeric, base.names, base.text, f"day{k}")
+
+def verify():
+    csv_path = os.path.join("backend", "data", "stocks.csv")
+    if not os.path.exists(csv_path):
+        print(f"❌ Stocks CSV not found at {csv_path}")
+        return
+
+    base = TickerStore.from_csv(csv_path)
+    history = TickerHistory()
+    if not history.root.startswith(_scratch.name):
+        print(f"❌ History would be written to {history.root}")
+        return
+    start = date(2025, 1, 1)
+    for k in range(30):
+        history.append(start + timedelta(days=k), day_store(base, k))
+    print(f"✅ Recorded {len(history)} days")
+
+    try:
+        history.append(start, day_store(base, 0))
+        print("❌ Accepted an out-of-order day")
+    except ValueError:
+        print("✅ Rejects out-of-order days (append-only)")
+
+    # Reopen from disk: everything must come back through the memory map
+    history = TickerHistory()
+    dates, values = history.series("Reliance Industries", "LTP", "2025-01-01", "2025-01-03")
+    first = base.values('LTP')[base.names.index("Reliance Industries")]
+    expected = np.float32(first) * np.array([1.0, 0.99, 0.98], dtype=np.float32)
+    if dates == ["2025-01-01", "2025-01-02", "2025-01-03"] and np.allclose(values, expected, rtol=1e-5):
+        print(f"✅ Range query: {list(zip(dates, values.astype(float).round(2).tolist()))}")
+    else:
+        print(f"❌ Range query returned {dates} {values}")
+
+    feats = history.ticker_features("Reliance Industries")
+    # Over the last 21 days the price went from 0.91x to 0.71x of the start
+    expected_drawdown = round((0.71 / 0.91 - 1) * 100, 2)
+    if feats and abs(feats["drawdown_20d"] - expected_drawdown) < 0.05 and feats["oversold_days"] > 0:
+        print(f"✅ Features: {feats}")
+    else:
+        print(f"❌ Features: {feats} (expected drawdown ~{expected_drawdown})")
+
+    # Loads are dated by the ingest day, and reloading the same CSV records nothing new
+    live = get_ticker_history()
+    before = len(live)
+    record_history(base)
+    record_history(base)
+    if len(live) == before + 1 and live.dates[-1] == date.today().isoformat():
+        print(f"✅ Load recorded once, as of {live.dates[-1]}")
+    else:
+        print(f"❌ record_history: {len(live) - before} days added, last {live.dates[-1:]}")
+
+if __name__ == "__main__":
+    try:
+        verify()
+    finally:
+        _scratch.cleanup()
@@ -0,0 +1,58 @@
+import sys
+import os
+import math
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from backend.utils.ticker_store import load_ticker_store, NUMERIC_COLUMNS
+
+def legacy_frame(csv_path: str) -> pd.DataFrame:
+    """The previous load_data cleaning, kept here as the reference."""
+    df = pd.read_csv(csv_path, encoding='utf-8')
+    df.columns = df.columns.str.strip()
+    df['Name'] = df['Name'].astype(str).str.strip()
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.replace(',', '', regex=False).str.replace('%', '', regex=False).str.strip()
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0.0)
+    return df
+
+def verify():
+    csv_path = os.path.join("backend", "data", "stocks.csv")
+    if not os.path.exists(csv_path):
+        print(f"❌ Stocks CSV not found at {csv_path}")
+        return
+
+    cache_dir = tempfile.mkdtemp()
+    built = load_ticker_store(csv_path, cache_dir)
+    cached = load_ticker_store(csv_path, cache_dir)
+    if built.from_cache or not cached.from_cache:
+        print("❌ Expected a CSV build followed by a cache hit")
+        return
+    print(f"✅ Cache hit on second load ({len(cached)} tickers, {cached.nbytes()} bytes numeric)")
+
+    df = legacy_frame(csv_path)
+    mismatches = 0
+    for i, old in enumerate(df.to_dict('records')):
+        new = cached.row(i)
+        for col, a in old.items():
+            b = new.get(col)
+            if isinstance(a, float) and isinstance(b, float):
+                ok = math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-9)
+            else:
+                ok = a == b or (b is None and a != a)  # NaN text cell -> None
+            if not ok:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"   row {i} {col}: {a!r} != {b!r}")
+
+    if mismatches == 0:
+        print("✅ Every row matches the pandas cleaning (float32 within 1e-6 relative)")
+    else:
+        print(f"❌ {mismatches} mismatched cells")
+
+if __name__ == "__main__":
+    verify()
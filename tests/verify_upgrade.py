@@ -5,6 +5,9 @@ import logging
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# Loading stocks.csv here must not write a day into the live ticker history
+os.environ["TICKER_HISTORY"] = "0"
+
 from backend.utils.ticker_db import get_ticker_db
 from backend.agents.fundamental_analyzer import FundamentalAnalyzer
 from backend.agents.peer_comparator import PeerComparator
@@ -14,6 +17,7 @@ from backend.models.schemas import FundamentalMetrics
 class MockRAG:
     def add_document(self, *args): pass
     def query_context(self, *args): return "Management is optimistic. Future plans include opening 500 new stores. Key strengths are brand and network. Concerns are rising costs."
+    def retrieve_many(self, questions, *args, **kwargs): return [[self.query_context()] for _ in questions]
 
 def verify():
     print("--- 1. Testing TickerDatabase ---")
@@ -0,0 +1,57 @@
+import sys
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.utils.vector_index import FlatVectorIndex
+
+def verify():
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = FlatVectorIndex(tmp)
+        errors = []
+        stop = threading.Event()
+
+        def ingest(worker):
+            # One job repeatedly ingesting and deleting reports, like parallel BackgroundTasks
+            i = 0
+            while not stop.is_set():
+                doc_id = f"doc_{worker}_{i % 5}"
+                vectors = rng.normal(size=(20, 16))
+                index.add(doc_id, vectors, [f"chunk {j}" for j in range(20)], [{"page": j} for j in range(20)],
+                          company=f"Co{worker}")
+                if i % 3 == 0:
+                    index.delete({"company": f"Co{worker}"})
+                i += 1
+
+        def query():
+            while not stop.is_set():
+                try:
+                    for hits in index.query_many(rng.normal(size=(3, 16)), n_results=5):
+                        for hit in hits:
+                            assert hit["document"].startswith("chunk")
+                except Exception as e:
+                    errors.append(repr(e))
+                    return
+
+        threads = [threading.Thread(target=ingest, args=(w,)) for w in range(2)]
+        threads += [threading.Thread(target=query) for _ in range(3)]
+        for t in threads:
+            t.start()
+        stop.wait(3)
+        stop.set()
+        for t in threads:
+            t.join()
+
+        if not errors:
+            print("✅ Queries ran cleanly while other jobs ingested and deleted documents")
+        else:
+            print(f"❌ Concurrent query failed: {errors[0]}")
+
+if __name__ == "__main__":
+    verify()